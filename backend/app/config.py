@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional, List
+from typing import Optional, List, Dict
 from app.utils.logger import logger
 import os
 
@@ -11,6 +11,7 @@ class Settings(BaseSettings):
     # Supabase 配置
     SUPABASE_URL: str
     SUPABASE_SERVICE_ROLE_KEY: str
+    SUPABASE_EXECUTOR_WORKERS: int = 16  # 数据库调用线程池大小
     
     # Webshare 配置
     WEBSHARE_API_TOKEN: str
@@ -54,6 +55,9 @@ class Settings(BaseSettings):
     AWS_ACCESS_KEY_ID: str
     AWS_SECRET_ACCESS_KEY: str
     AWS_BEDROCK_REGION: str = "us-east-2"
+    BEDROCK_EXECUTOR_WORKERS: int = 16  # Bedrock 调用线程池大小
+    BEDROCK_STREAM_WORKERS: int = 32  # Bedrock 流式调用线程池大小，即同时进行的流上限
+    BEDROCK_STREAM_QUEUE_SIZE: int = 64  # 每个流缓冲的事件数，消费方跟不上时读取线程等待
     
     # LLM Provider 切换配置
     # 可选值: "bedrock" 或 "openrouter"
@@ -84,6 +88,84 @@ class Settings(BaseSettings):
     PROXY_TEST_TIMEOUT: int = 10
     PROXY_TEST_MAX_WORKERS: int = 5
     YOUTUBE_TEST_URL: str = "https://www.youtube.com/watch?v=IFvLorAL5-8"
+
+    # Coze 工作流调用并发配置（进程内所有文章共享，按 AIMD 自动调整）
+    COZE_CONCURRENCY_INITIAL: int = 16  # 初始并发上限
+    COZE_CONCURRENCY_MIN: int = 2  # 过载时最低降到的并发数
+    COZE_CONCURRENCY_MAX: int = 32  # 连续成功时最高增长到的并发数
+
+    # 规范化 URL 索引配置
+    URL_INDEX_DB_PATH: str = "data/url_index.db"  # SQLite 文件路径
+
+    # 流式总结配置
+    SUMMARY_STREAMING_ENABLED: bool = True  # 是否流式生成总结并逐步写入已完成的小节
+    SUMMARY_STREAM_FLUSH_INTERVAL: float = 2.0  # 两次中间写入之间的最短间隔（秒）
+
+    # 超长内容分层总结配置
+    SUMMARY_MAP_REDUCE_THRESHOLD_CHARS: int = 120000  # 分块笔记拼接后仍超过该字符数时再做一轮分块总结
+    SUMMARY_CHUNK_MAX_CHARS: int = 40000  # 每块的最大字符数
+    SUMMARY_MAP_CONCURRENCY: int = 4  # 分块总结的初始并发上限（进程内共享）
+    SUMMARY_MAP_CONCURRENCY_MAX: int = 8  # 分块总结的最高并发上限
+
+    # Token 预估与模型选择配置
+    SUMMARY_MIN_OUTPUT_TOKENS: int = 16000  # 总结至少需要预留的输出 token 数，不足时换模型或分块
+    CHAT_MIN_OUTPUT_TOKENS: int = 2048  # Chat 至少需要预留的输出 token 数，不足时换用长上下文模型
+
+    # 文章对话检索配置
+    CHAT_RETRIEVAL_ENABLED: bool = True  # 是否只注入与问题相关的段落
+    CHAT_RETRIEVAL_MIN_CHARS: int = 12000  # 文章不超过该字符数时直接使用全文
+    CHAT_RETRIEVAL_PASSAGE_CHARS: int = 1200  # 段落的最大字符数
+    CHAT_RETRIEVAL_TOP_K: int = 8  # 每轮注入的段落数
+    CHAT_RETRIEVAL_CACHE_SIZE: int = 64  # 缓存的文章索引数，超出时按 LRU 淘汰
+
+    # 文章内容缓存配置（文章对话使用）
+    ARTICLE_CONTENT_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # 缓存内容总字节数上限，超出时按 LRU 淘汰
+
+    # 提示词缓存配置
+    PROMPT_CACHE_TTL: int = 600  # 缓存有效期（秒）
+    PROMPT_CACHE_VERSION_CHECK: bool = False  # 过期后先比对 updated_at，未变化则直接续期
+
+    # LLM 结果缓存配置
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_DB_PATH: str = "data/llm_cache.db"  # SQLite 文件路径
+    LLM_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # 缓存内容总字节数上限，超出时按 LRU 淘汰
+
+    # 管理接口令牌，为空时管理接口拒绝所有请求
+    ADMIN_API_TOKEN: Optional[str] = None
+
+    # 上游服务 HTTP 客户端配置
+    HTTP2_ENABLED: bool = False  # 是否启用 HTTP/2（需要另行安装 h2：pip install "httpx[http2]"，未安装时降级为 HTTP/1.1）
+    HTTP_KEEPALIVE_EXPIRY: float = 60.0  # 空闲长连接保留时间（秒）
+
+    # 内容抓取 HTTP 客户端配置
+    FETCH_TIMEOUT: float = 30.0  # 默认超时时间（秒）
+    FETCH_MAX_CONNECTIONS_PER_HOST: int = 8  # 每个主机的连接池上限
+    FETCH_HOST_CONCURRENCY: int = 4  # 每个主机同时进行的请求数上限
+    FETCH_MAX_RETRIES: int = 3  # 连接失败、超时及 429 / 5xx 时的最大重试次数
+    FETCH_RETRY_BACKOFF: float = 1.0  # 首次重试的等待时间（秒），之后逐次翻倍
+    FETCH_MAX_HOSTS: int = 64  # 保留连接池的主机数上限，超出时关闭最久未使用的空闲连接池
+
+    # B站 cookie 缓存配置
+    BILIBILI_COOKIE_TTL: int = 1800  # 解析并验证后的 cookie 请求头复用时间（秒），配置内容变化时立即失效
+
+    # 网页磁盘缓存配置（条件请求）
+    PAGE_CACHE_ENABLED: bool = True
+    PAGE_CACHE_DB_PATH: str = "data/page_cache.db"  # SQLite 文件路径
+    PAGE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # 缓存页面总字节数上限，超出时按 LRU 淘汰
+    PAGE_CACHE_DEFAULT_TTL: int = 600  # 有效期（秒），过期后带 ETag / Last-Modified 重新验证
+    PAGE_CACHE_DOMAIN_TTLS: str = "podcasts.apple.com:3600,xiaoyuzhoufm.com:900"  # 各域名（含子域名）的有效期
+
+    # 请求日志批量写入配置
+    REQUEST_LOG_BUFFER_SIZE: int = 5000  # 内存缓冲区容量，溢出时丢弃最旧的日志
+    REQUEST_LOG_BATCH_SIZE: int = 50  # 达到该条数时触发批量写入
+    REQUEST_LOG_FLUSH_INTERVAL: float = 2.0  # 定时写入间隔（秒）
+
+    # 后台任务队列配置
+    JOB_QUEUE_DB_PATH: str = "data/job_queue.db"  # SQLite 文件路径
+    JOB_QUEUE_WORKERS: int = 4  # worker 数量，即同时执行的任务上限
+    JOB_QUEUE_TYPE_LIMITS: str = "article:3,github_agent:1,multilingual:2,private_content:2"  # 各任务类型并发上限
+    JOB_QUEUE_POLL_INTERVAL: float = 1.0  # 空闲轮询间隔（秒）
+    JOB_QUEUE_MAX_ATTEMPTS: int = 3  # 重启恢复时的最大执行次数
     
     @property
     def proxy_list(self) -> List[str]:
@@ -91,6 +173,28 @@ class Settings(BaseSettings):
         if not self.PROXY_LIST:
             return []
         return [x.strip() for x in self.PROXY_LIST.split(',') if x.strip()]
+
+    @property
+    def job_queue_type_limits(self) -> Dict[str, int]:
+        """将 "类型:并发数" 格式的字符串转换为字典"""
+        limits = {}
+        for item in self.JOB_QUEUE_TYPE_LIMITS.split(','):
+            if ':' not in item:
+                continue
+            job_type, limit = item.split(':', 1)
+            limits[job_type.strip()] = int(limit)
+        return limits
+
+    @property
+    def page_cache_domain_ttls(self) -> Dict[str, int]:
+        """将 "域名:秒数" 格式的字符串转换为字典"""
+        ttls = {}
+        for item in self.PAGE_CACHE_DOMAIN_TTLS.split(','):
+            if ':' not in item:
+                continue
+            domain, ttl = item.split(':', 1)
+            ttls[domain.strip().lower()] = int(ttl)
+        return ttls
     
     class Config:
         env_file = ".env"
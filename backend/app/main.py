@@ -7,7 +7,18 @@ from app.config import settings
 from app.routers import chat
 from app.routers import article_views
 from app.routers import proxy
+from app.routers import metrics
+from app.routers import admin
 from app.services.scheduler import SchedulerService
+from app.services.job_queue import job_queue
+from app.repositories.supabase import SupabaseService
+from app.services.request_logger import RequestLogger
+from app.utils.http_client import HttpClientRegistry
+from app.utils.fetch_client import FetchClient
+from app.services.bedrock_client import BedrockClientFactory
+from app.services.canonical_url import CanonicalUrlIndex
+from app.repositories.prompt_repository import PromptRepository
+from app.services.chat import ChatService
 
 app = FastAPI(title="Keep Up API")
 
@@ -16,13 +27,25 @@ scheduler = SchedulerService()
 
 @app.on_event("startup")
 async def startup_event():
-    """应用启动时启动调度器"""
+    """应用启动时创建 HTTP 客户端、预加载提示词，启动调度器、请求日志写入和后台任务队列"""
+    HttpClientRegistry.startup()
+    await PromptRepository.preload()
     scheduler.start()
+    RequestLogger.start()
+    await job_queue.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """应用关闭时关闭调度器"""
+    """应用关闭时关闭调度器、后台任务队列，等待对话消息保存，关闭请求日志写入、HTTP 客户端、各线程池和 URL 索引"""
+    await job_queue.stop()
     scheduler.shutdown()
+    await ChatService.wait_pending_saves()
+    await RequestLogger.shutdown()
+    await HttpClientRegistry.shutdown()
+    await FetchClient.shutdown()
+    BedrockClientFactory.shutdown()
+    SupabaseService.shutdown_executor()
+    CanonicalUrlIndex.close()
 
 # CORS 配置
 app.add_middleware(
@@ -40,6 +63,8 @@ app.include_router(workflow_router)
 app.include_router(chat.router)
 app.include_router(article_views.router)
 app.include_router(proxy.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
 
 if __name__ == "__main__":
     import uvicorn
@@ -13,6 +13,7 @@ class FetchRequest(BaseModel):
     platform: Optional[str] = None # 平台
     content: Optional[str] = None # 文本
     article_id: Optional[int] = None
+    force_refresh: bool = False  # 为 True 时忽略已处理过的相同内容，强制重新处理
 
 class ParseRequest(BaseModel):
     id: int
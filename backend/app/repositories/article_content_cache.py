@@ -0,0 +1,111 @@
+"""
+文章内容的进程内缓存
+
+文章对话每一轮都要读取文章全文，原来需要依次查询请求ID、整行请求记录（含大 JSON 字段）和文章记录。
+ArticleContentCache 按文章ID缓存全文：
+- 按占用字节数限制容量，超出时按 LRU 淘汰；单篇超过上限的内容不缓存
+- SupabaseService 更新请求内容或请求关联的文章时自动失效对应条目
+- 读取过程中发生失效时不写入缓存，避免把旧内容放回缓存
+"""
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.config import settings
+
+
+class ArticleContentCache:
+    """按字节数限制的文章内容 LRU 缓存"""
+
+    # 文章ID -> (内容, 内容来源的请求ID, 占用字节数)
+    _entries: "OrderedDict[int, Tuple[str, Optional[int], int]]" = OrderedDict()
+    _total_bytes = 0
+    # 每次失效加一，读取开始时记录，写入时不一致则放弃写入
+    _generation = 0
+    _lock = threading.Lock()
+    _counters: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    @classmethod
+    def generation(cls) -> int:
+        """当前失效代数，读取数据库前获取，写入缓存时传回"""
+        return cls._generation
+
+    @classmethod
+    def get(cls, article_id: int) -> Optional[str]:
+        """获取缓存的文章内容
+
+        Args:
+            article_id: 文章ID
+
+        Returns:
+            Optional[str]: 文章内容，未缓存时返回 None
+        """
+        with cls._lock:
+            entry = cls._entries.get(article_id)
+            if entry is None:
+                cls._counters["misses"] += 1
+                return None
+            cls._entries.move_to_end(article_id)
+            cls._counters["hits"] += 1
+            return entry[0]
+
+    @classmethod
+    def put(cls, article_id: int, content: str, request_id: Optional[int], generation: int) -> bool:
+        """写入文章内容
+
+        Args:
+            article_id: 文章ID
+            content: 文章内容
+            request_id: 内容来源的请求ID，来自文章记录时为 None
+            generation: 读取数据库前获取的失效代数
+
+        Returns:
+            bool: 是否写入
+        """
+        size = sys.getsizeof(content)
+        max_bytes = settings.ARTICLE_CONTENT_CACHE_MAX_BYTES
+        with cls._lock:
+            if generation != cls._generation or size > max_bytes:
+                return False
+            cls._remove(article_id)
+            cls._entries[article_id] = (content, request_id, size)
+            cls._total_bytes += size
+            while cls._total_bytes > max_bytes and cls._entries:
+                _, (_, _, evicted_size) = cls._entries.popitem(last=False)
+                cls._total_bytes -= evicted_size
+                cls._counters["evictions"] += 1
+            return True
+
+    @classmethod
+    def _remove(cls, article_id: int) -> None:
+        entry = cls._entries.pop(article_id, None)
+        if entry is not None:
+            cls._total_bytes -= entry[2]
+
+    @classmethod
+    def invalidate_article(cls, article_id: int) -> None:
+        """失效指定文章的缓存"""
+        with cls._lock:
+            cls._generation += 1
+            cls._counters["invalidations"] += 1
+            cls._remove(article_id)
+
+    @classmethod
+    def invalidate_request(cls, request_id: int) -> None:
+        """失效内容来自指定请求的缓存"""
+        with cls._lock:
+            cls._generation += 1
+            cls._counters["invalidations"] += 1
+            for article_id in [key for key, entry in cls._entries.items() if entry[1] == request_id]:
+                cls._remove(article_id)
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """获取缓存条目数、占用字节数及命中 / 未命中 / 淘汰 / 失效次数"""
+        with cls._lock:
+            return {
+                "entries": len(cls._entries),
+                "total_bytes": cls._total_bytes,
+                **cls._counters
+            }
@@ -16,11 +16,12 @@ class ArticleViewsRepository:
             client = SupabaseService.get_client()
             
             # 先检查记录是否已存在
-            existing = client.table("keep_article_views")\
-                .select("*")\
-                .eq("user_id", user_id)\
-                .eq("article_id", article_id)\
-                .execute()
+            existing = await SupabaseService.execute(
+                client.table("keep_article_views")
+                .select("*")
+                .eq("user_id", user_id)
+                .eq("article_id", article_id)
+            )
             
             data = {
                 "user_id": user_id,
@@ -28,16 +29,16 @@ class ArticleViewsRepository:
                 "is_author": is_author,
             }
             
-            result = client.table("keep_article_views").upsert(
+            result = await SupabaseService.execute(client.table("keep_article_views").upsert(
                 data,
                 on_conflict="user_id,article_id"  # 如果记录已存在则更新
-            ).execute()
+            ))
             
             # 如果是新记录（之前不存在），则更新文章的viewer_count
             if not existing.data:
                 try:
                     # 使用RPC函数安全更新viewer_count
-                    client.rpc('increment_article_viewer_count', {'article_id': article_id}).execute()
+                    await SupabaseService.execute(client.rpc('increment_article_viewer_count', {'article_id': article_id}))
                     logger.info(f"更新文章viewer_count成功: article_id={article_id}")
                 except Exception as e:
                     logger.warning(f"更新文章viewer_count失败，可能字段不存在: article_id={article_id}, error={str(e)}")
@@ -63,11 +64,12 @@ class ArticleViewsRepository:
             client = SupabaseService.get_client()
             
             # 先查询是否存在记录
-            existing = client.table("keep_article_views")\
-                .select("*")\
-                .eq("user_id", user_id)\
-                .eq("article_id", article_id)\
-                .execute()
+            existing = await SupabaseService.execute(
+                client.table("keep_article_views")
+                .select("*")
+                .eq("user_id", user_id)
+                .eq("article_id", article_id)
+            )
                 
             if existing.data:
                 # 如果存在记录则更新（用户重复浏览，不更新文章的viewer_count）
@@ -75,11 +77,12 @@ class ArticleViewsRepository:
                     "last_viewed_at": "now()",
                     "view_count": existing.data[0]["view_count"] + 1
                 }
-                result = client.table("keep_article_views")\
-                    .update(data)\
-                    .eq("user_id", user_id)\
-                    .eq("article_id", article_id)\
-                    .execute()
+                result = await SupabaseService.execute(
+                    client.table("keep_article_views")
+                    .update(data)
+                    .eq("user_id", user_id)
+                    .eq("article_id", article_id)
+                )
             else:
                 # 如果不存在则创建新记录（新用户首次浏览，需要更新文章的viewer_count）
                 data = {
@@ -88,14 +91,15 @@ class ArticleViewsRepository:
                     "last_viewed_at": "now()",
                     "view_count": 1
                 }
-                result = client.table("keep_article_views")\
-                    .insert(data)\
-                    .execute()
+                result = await SupabaseService.execute(
+                    client.table("keep_article_views")
+                    .insert(data)
+                )
                 
                 # 同时更新文章的viewer_count（+1）
                 try:
                     # 使用RPC函数安全更新viewer_count
-                    client.rpc('increment_article_viewer_count', {'article_id': article_id}).execute()
+                    await SupabaseService.execute(client.rpc('increment_article_viewer_count', {'article_id': article_id}))
                     logger.info(f"更新文章viewer_count成功: article_id={article_id}")
                 except Exception as e:
                     logger.warning(f"更新文章viewer_count失败，可能字段不存在: article_id={article_id}, error={str(e)}")
@@ -40,9 +40,10 @@ class LLMRecordsRepository:
                 "error_message": error_message
             }
             
-            result = client.table("keep_llm_records")\
-                .insert(data)\
-                .execute()
+            result = await SupabaseService.execute(
+                client.table("keep_llm_records")
+                .insert(data)
+            )
                 
             if result.data:
                 return result.data[0]
@@ -65,11 +66,12 @@ class LLMRecordsRepository:
         try:
             client = SupabaseService.get_client()
             
-            result = client.table("keep_llm_records")\
-                .select("*")\
-                .eq("request_id", request_id)\
-                .order("created_at", desc=True)\
-                .execute()
+            result = await SupabaseService.execute(
+                client.table("keep_llm_records")
+                .select("*")
+                .eq("request_id", request_id)
+                .order("created_at", desc=True)
+            )
                 
             return result.data or []
             
@@ -1,34 +1,101 @@
-from typing import Optional
+import time
+from typing import Optional, Dict, Tuple
+from app.config import settings
 from app.models.prompt import PromptModel
 from app.repositories.supabase import SupabaseService
 from app.utils.logger import logger
 
 class PromptRepository:
+    # 进程内提示词缓存: type -> (缓存时间, updated_at 原始值, 提示词)
+    _cache: Dict[str, Tuple[float, Optional[str], PromptModel]] = {}
+
     @staticmethod
     async def get_prompt_by_type(type: str) -> Optional[PromptModel]:
         """根据类型获取提示词
-        
+
+        优先返回缓存，缓存超过 PROMPT_CACHE_TTL 后重新查询；
+        开启 PROMPT_CACHE_VERSION_CHECK 时，先只比对 updated_at，未变化则直接续期。
+
         Args:
             type: 提示词类型，如 'summary_en', 'summary_zh'
-            
+
         Returns:
             Optional[PromptModel]: 提示词模型，如果不存在返回 None
         """
+        cached = PromptRepository._cache.get(type)
+        now = time.monotonic()
+        if cached and now - cached[0] < settings.PROMPT_CACHE_TTL:
+            return cached[2]
+
         try:
             client = SupabaseService.get_client()
-            
-            result = client.table('keep_prompt') \
-                .select('*') \
-                .eq('type', type) \
-                .single() \
-                .execute()
-                
+
+            if cached and settings.PROMPT_CACHE_VERSION_CHECK:
+                version = await SupabaseService.execute(
+                    client.table('keep_prompt')
+                    .select('updated_at')
+                    .eq('type', type)
+                    .single()
+                )
+                if version.data and version.data.get('updated_at') == cached[1]:
+                    PromptRepository._cache[type] = (now, cached[1], cached[2])
+                    return cached[2]
+
+            result = await SupabaseService.execute(
+                client.table('keep_prompt')
+                .select('*')
+                .eq('type', type)
+                .single()
+            )
+
             if result.data:
-                return PromptModel(**result.data)
-            
+                prompt = PromptModel(**result.data)
+                PromptRepository._cache[type] = (now, result.data.get('updated_at'), prompt)
+                return prompt
+
             logger.warning(f"未找到类型为 {type} 的提示词")
             return None
-            
+
         except Exception as e:
+            if cached:
+                logger.warning(f"刷新提示词失败，继续使用缓存: type={type}, error={str(e)}")
+                return cached[2]
             logger.error(f"获取提示词失败: {str(e)}")
-            return None 
\ No newline at end of file
+            return None
+
+    @staticmethod
+    async def preload() -> int:
+        """一次性加载所有提示词到缓存
+
+        Returns:
+            int: 加载的提示词数量
+        """
+        try:
+            client = SupabaseService.get_client()
+            result = await SupabaseService.execute(client.table('keep_prompt').select('*'))
+            now = time.monotonic()
+            for row in result.data or []:
+                PromptRepository._cache[row['type']] = (now, row.get('updated_at'), PromptModel(**row))
+            logger.info(f"提示词缓存预加载完成: {len(result.data or [])} 条")
+            return len(result.data or [])
+        except Exception as e:
+            logger.error(f"提示词缓存预加载失败: {str(e)}")
+            return 0
+
+    @staticmethod
+    def invalidate(type: Optional[str] = None) -> int:
+        """清除提示词缓存
+
+        Args:
+            type: 提示词类型，为空时清除全部
+
+        Returns:
+            int: 清除的缓存条数
+        """
+        if type is None:
+            count = len(PromptRepository._cache)
+            PromptRepository._cache.clear()
+        else:
+            count = 1 if PromptRepository._cache.pop(type, None) else 0
+        logger.info(f"提示词缓存已清除: type={type or '全部'}, 条数={count}")
+        return count
@@ -14,10 +14,11 @@ class ProxyRepository:
             
             # 使用 id 来随机获取，因为 id 是连续的
             # 先获取最大和最小 id
-            result = client.table("keep_proxies")\
-                .select("id")\
-                .eq("is_active", True)\
-                .execute()
+            result = await SupabaseService.execute(
+                client.table("keep_proxies")
+                .select("id")
+                .eq("is_active", True)
+            )
             
             if not result.data:
                 logger.warning("没有可用的代理")
@@ -28,11 +29,12 @@ class ProxyRepository:
             random_id = random.choice(proxy_ids)
             
             # 获取随机选择的代理
-            result = client.table("keep_proxies")\
-                .select("id", "proxy_url")\
-                .eq("id", random_id)\
-                .single()\
-                .execute()
+            result = await SupabaseService.execute(
+                client.table("keep_proxies")
+                .select("id", "proxy_url")
+                .eq("id", random_id)
+                .single()
+            )
                 
             if not result.data:
                 logger.warning("没有可用的代理")
@@ -42,10 +44,11 @@ class ProxyRepository:
             proxy_id, proxy_url = proxy['id'], proxy['proxy_url']
             
             # 更新最后使用时间
-            client.table("keep_proxies")\
-                .update({"last_used_at": "now()", "updated_at": "now()"})\
-                .eq("id", proxy_id)\
-                .execute()
+            await SupabaseService.execute(
+                client.table("keep_proxies")
+                .update({"last_used_at": "now()", "updated_at": "now()"})
+                .eq("id", proxy_id)
+            )
             
             # 返回代理配置
             return {
@@ -138,11 +141,12 @@ class ProxyRepository:
             
             if success:
                 # 先获取当前代理的成功次数
-                current = client.table("keep_proxies")\
-                    .select("success_count")\
-                    .eq("proxy_url", proxy_url)\
-                    .single()\
-                    .execute()
+                current = await SupabaseService.execute(
+                    client.table("keep_proxies")
+                    .select("success_count")
+                    .eq("proxy_url", proxy_url)
+                    .single()
+                )
                     
                 new_success_count = current.data["success_count"] + 1
                 
@@ -152,17 +156,19 @@ class ProxyRepository:
                     "response_time": response_time,
                     "updated_at": "now()"
                 }
-                client.table("keep_proxies")\
-                    .update(data)\
-                    .eq("proxy_url", proxy_url)\
-                    .execute()
+                await SupabaseService.execute(
+                    client.table("keep_proxies")
+                    .update(data)
+                    .eq("proxy_url", proxy_url)
+                )
             else:
                 # 获取当前失败次数
-                current = client.table("keep_proxies")\
-                    .select("fail_count")\
-                    .eq("proxy_url", proxy_url)\
-                    .single()\
-                    .execute()
+                current = await SupabaseService.execute(
+                    client.table("keep_proxies")
+                    .select("fail_count")
+                    .eq("proxy_url", proxy_url)
+                    .single()
+                )
                     
                 new_fail_count = current.data["fail_count"] + 1
                 
@@ -172,10 +178,11 @@ class ProxyRepository:
                     "is_active": new_fail_count < 2,  # 失败2次后禁用
                     "updated_at": "now()"
                 }
-                client.table("keep_proxies")\
-                    .update(data)\
-                    .eq("proxy_url", proxy_url)\
-                    .execute()
+                await SupabaseService.execute(
+                    client.table("keep_proxies")
+                    .update(data)
+                    .eq("proxy_url", proxy_url)
+                )
                 
         except Exception as e:
             logger.error(f"更新代理状态失败: {str(e)}", exc_info=True)
@@ -199,11 +206,12 @@ class ProxyRepository:
             page_size = 1000
             
             while True:
-                result = client.table("keep_proxies")\
-                    .select("id", "proxy_url")\
-                    .gt("id", 1000)\
-                    .range(page * page_size, (page + 1) * page_size - 1)\
-                    .execute()
+                result = await SupabaseService.execute(
+                    client.table("keep_proxies")
+                    .select("id", "proxy_url")
+                    .gt("id", 1000)
+                    .range(page * page_size, (page + 1) * page_size - 1)
+                )
                 
                 if not result.data:
                     break
@@ -233,10 +241,11 @@ class ProxyRepository:
             batch_size = 100  # 每批处理100个
             for i in range(0, len(proxies_to_inactive), batch_size):
                 batch = proxies_to_inactive[i:i + batch_size]
-                client.table("keep_proxies")\
-                    .update({"is_active": False})\
-                    .in_("id", batch)\
-                    .execute()
+                await SupabaseService.execute(
+                    client.table("keep_proxies")
+                    .update({"is_active": False})
+                    .in_("id", batch)
+                )
                 
             logger.info(f"成功更新代理状态，设置了 {len(proxies_to_inactive)} 个代理为非活跃")
             
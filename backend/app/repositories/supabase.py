@@ -2,11 +2,15 @@ from supabase import create_client, Client
 from app.config import settings
 from app.utils.logger import logger
 from app.models.coze import ArticleCreate
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import json
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Set, Tuple
+from app.repositories.article_content_cache import ArticleContentCache
 
 class SupabaseService:
     _client: Client = None
+    _executor: ThreadPoolExecutor = None
     
     @classmethod
     def get_client(cls) -> Client:
@@ -16,6 +20,41 @@ class SupabaseService:
                 settings.SUPABASE_SERVICE_ROLE_KEY
             )
         return cls._client
+
+    @classmethod
+    def get_executor(cls) -> ThreadPoolExecutor:
+        """获取数据库调用专用的有界线程池
+
+        supabase-py 的 execute() 是同步 HTTP 请求，统一放到这个线程池中执行。
+        线程数不超过客户端连接池的 keep-alive 连接数，保证连接被复用。
+        """
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(
+                max_workers=settings.SUPABASE_EXECUTOR_WORKERS,
+                thread_name_prefix="supabase"
+            )
+        return cls._executor
+
+    @classmethod
+    async def execute(cls, query):
+        """在线程池中执行查询，避免阻塞事件循环
+
+        Args:
+            query: 已构建好、尚未调用 execute() 的查询对象
+
+        Returns:
+            与 query.execute() 相同的查询结果
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(cls.get_executor(), query.execute)
+
+    @classmethod
+    def shutdown_executor(cls):
+        """关闭数据库线程池，等待已提交的查询完成"""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=True)
+            cls._executor = None
+            logger.info("数据库线程池已关闭")
     
     @classmethod
     async def update_status(cls, request_id: int, status: str, error_message: str = None):
@@ -24,16 +63,16 @@ class SupabaseService:
         if error_message:
             data["error_message"] = error_message
             
-        result = client.table("keep_article_requests").update(data).eq("id", request_id).execute()
+        result = await cls.execute(client.table("keep_article_requests").update(data).eq("id", request_id))
         logger.info(f"状态更新成功: ID={request_id}, status={status}")
         return result
 
     @classmethod
     async def update_result(cls, request_id: int, status: str):
         client = cls.get_client()
-        result = client.table("keep_article_requests").update({
+        result = await cls.execute(client.table("keep_article_requests").update({
             "status": status
-        }).eq("id", request_id).execute()
+        }).eq("id", request_id))
         logger.info(f"结果更新成功: ID={request_id}")
         return result 
     
@@ -46,7 +85,7 @@ class SupabaseService:
             raise ValueError("文章标题不能为空")
         
         client = cls.get_client()
-        result = client.table("keep_articles").insert(article_data.dict()).execute()
+        result = await cls.execute(client.table("keep_articles").insert(article_data.dict()))
         logger.info(f"文章创建成功")
         return result.data[0]
     
@@ -64,7 +103,7 @@ class SupabaseService:
             }
             for idx, section in enumerate(sections)
         ]
-        result = client.table("keep_article_sections").insert(sections_data).execute()
+        result = await cls.execute(client.table("keep_article_sections").insert(sections_data))
         logger.info(f"文章小节创建成功: {len(sections)} 个小节")
         return result.data
     
@@ -72,11 +111,47 @@ class SupabaseService:
     async def update_content(cls, request_id: int, content: str):
         """更新请求"""
         client = cls.get_client()
-        result = client.table("keep_article_requests").update({
+        result = await cls.execute(client.table("keep_article_requests").update({
             "content": content
-        }).eq("id", request_id).execute()
+        }).eq("id", request_id))
+        ArticleContentCache.invalidate_request(request_id)
         logger.info(f"内容更新成功: ID={request_id}")
         return result
+
+    @classmethod
+    async def get_article_content(cls, article_id: int) -> Optional[Tuple[str, Optional[int]]]:
+        """只查询文章全文，不读取请求记录中的其他大字段
+
+        优先取关联请求中最早一条有内容的记录，没有时取 keep_articles.content（私有文章）。
+
+        Args:
+            article_id: 文章ID
+
+        Returns:
+            Optional[Tuple[str, Optional[int]]]: (文章内容, 内容来源的请求ID)，来自文章记录时请求ID为 None；都为空时返回 None
+        """
+        client = cls.get_client()
+        result = await cls.execute(
+            client.table("keep_article_requests")
+            .select("id, content")
+            .eq("article_id", article_id)
+            .not_.is_("content", "null")
+            .neq("content", "")
+            .order("id")
+            .limit(1)
+        )
+        if result.data and result.data[0].get("content"):
+            return result.data[0]["content"], result.data[0]["id"]
+
+        result = await cls.execute(
+            client.table("keep_articles")
+            .select("content")
+            .eq("id", article_id)
+            .limit(1)
+        )
+        if result.data and result.data[0].get("content"):
+            return result.data[0]["content"], None
+        return None
     
     @classmethod
     async def update_parsed_content(cls, request_id: int, parsed_content: dict) -> None:
@@ -85,9 +160,9 @@ class SupabaseService:
             client = cls.get_client()
             parsed_content_json = json.dumps(parsed_content, ensure_ascii=False)
             
-            result = client.table('keep_article_requests').update({
+            result = await cls.execute(client.table('keep_article_requests').update({
                 'parsed_content': parsed_content_json
-            }).eq('id', request_id).execute()
+            }).eq('id', request_id))
             
             if not result.data:
                 raise Exception(f"未找到 ID 为 {request_id} 的请求记录")
@@ -103,11 +178,11 @@ class SupabaseService:
         """创建新作者"""
         try:
             client = cls.get_client()
-            result = client.table("keep_authors").insert({
+            result = await cls.execute(client.table("keep_authors").insert({
                 "name": author_data["name"],
                 # "platform": author_data.get("platform", "YouTube"),  # 添加平台信息
                 "icon": author_data.get("icon", None)  # 默认无头像
-            }).execute()
+            }))
             
             logger.info(f"作者创建成功: {author_data['name']}")
             return result.data[0]
@@ -134,7 +209,7 @@ class SupabaseService:
             "name": author_data["name"],
             "icon": author_data.get("icon")
         }
-        result = client.table("keep_authors").update(update_data).eq("id", author_id).execute()
+        result = await cls.execute(client.table("keep_authors").update(update_data).eq("id", author_id))
         logger.info(f"作者更新成功: ID={author_id}, name={update_data['name']}")
         return result.data[0]
     
@@ -143,7 +218,7 @@ class SupabaseService:
         """根据作者名称获取作者信息"""
         try:
             client = cls.get_client()
-            result = client.table("keep_authors").select("*").eq("name", name).execute()
+            result = await cls.execute(client.table("keep_authors").select("*").eq("name", name))
             
             if result.data:
                 logger.info(f"找到作者: {name}")
@@ -171,21 +246,68 @@ class SupabaseService:
             language: 语言类型
         """
         client = cls.get_client()
-        result = client.table("keep_article_sections").delete().match({
+        result = await cls.execute(client.table("keep_article_sections").delete().match({
             "article_id": article_id,
             "section_type": section_type,
             "language": language
-        }).execute()
+        }))
         
         logger.info(f"删除小节成功: article_id={article_id}, type={section_type}, language={language}")
         return result
-    
+
+    @classmethod
+    async def update_article_section(cls, section_id: int, content: str):
+        """更新指定小节的内容
+
+        Args:
+            section_id: 小节ID
+            content: 新的小节内容
+        """
+        client = cls.get_client()
+        result = await cls.execute(client.table("keep_article_sections").update({
+            "content": content
+        }).eq("id", section_id))
+        return result.data
+
+    @classmethod
+    async def delete_article_section_by_id(cls, section_id: int) -> None:
+        """按ID删除小节
+
+        Args:
+            section_id: 小节ID
+        """
+        client = cls.get_client()
+        await cls.execute(client.table("keep_article_sections").delete().eq("id", section_id))
+        logger.info(f"删除小节成功: section_id={section_id}")
+
+    @classmethod
+    async def get_section_languages(cls, article_id: int) -> Dict[str, Set[str]]:
+        """获取文章各类型小节已有的语言
+        
+        Args:
+            article_id: 文章ID
+            
+        Returns:
+            Dict[str, Set[str]]: 小节类型 -> 语言集合，如 {"总结": {"zh"}}
+        """
+        client = cls.get_client()
+        result = await cls.execute(
+            client.table("keep_article_sections")
+            .select("section_type, language")
+            .eq("article_id", article_id)
+        )
+        languages: Dict[str, Set[str]] = {}
+        for row in result.data or []:
+            languages.setdefault(row["section_type"], set()).add(row["language"])
+        return languages
+
     @classmethod
     async def get_request_id_by_article_id(cls, article_id: int) -> int:
         """通过文章ID获取对应的请求ID
         
-        直接通过 article_id 字段查询 article_requests 表,
-        如果有多条记录则返回第一条。
+        直接通过 article_id 字段查询 article_requests 表。
+        复用已有文章的请求也会关联同一 article_id，但原文、章节只保存在最初处理的请求上，
+        因此有多条记录时返回 ID 最小的一条。
         
         Args:
             article_id: 文章ID
@@ -200,15 +322,18 @@ class SupabaseService:
             logger.info(f"开始查找文章对应的请求ID: article_id={article_id}")
             
             client = cls.get_client()
-            request_result = client.table("keep_article_requests")\
-                .select("id")\
-                .eq("article_id", article_id)\
-                .execute()
+            request_result = await cls.execute(
+                client.table("keep_article_requests")
+                .select("id")
+                .eq("article_id", article_id)
+                .order("id")
+                .limit(1)
+            )
             
             if not request_result.data:
                 raise ValueError(f"未找到对应的请求记录: article_id={article_id}")
             
-            # 取第一条记录的ID
+            # 最初处理该文章的请求
             request_id = request_result.data[0].get("id")
             logger.info(f"找到对应的请求ID: article_id={article_id}, request_id={request_id}")
             
@@ -242,9 +367,9 @@ class SupabaseService:
             field_name = f"polished_content_{language}"
             
             # 更新数据
-            result = client.table('keep_article_requests').update({
+            result = await cls.execute(client.table('keep_article_requests').update({
                 field_name: polished_content_json
-            }).eq('id', request_id).execute()
+            }).eq('id', request_id))
             
             if not result.data:
                 raise Exception(f"未找到 ID 为 {request_id} 的请求记录")
@@ -279,9 +404,9 @@ class SupabaseService:
             field_name = f"detailed_content_{language}"
             
             # 更新数据
-            result = client.table('keep_article_requests').update({
+            result = await cls.execute(client.table('keep_article_requests').update({
                 field_name: detailed_content_json
-            }).eq('id', request_id).execute()
+            }).eq('id', request_id))
             
             if not result.data:
                 raise Exception(f"未找到 ID 为 {request_id} 的请求记录")
@@ -303,9 +428,9 @@ class SupabaseService:
         try:
             client = cls.get_client()
             
-            result = client.table('keep_article_requests').update({
+            result = await cls.execute(client.table('keep_article_requests').update({
                 'chapters': chapters
-            }).eq('id', request_id).execute()
+            }).eq('id', request_id))
             
             if not result.data:
                 raise Exception(f"未找到 ID 为 {request_id} 的请求记录")
@@ -335,10 +460,10 @@ class SupabaseService:
             client = cls.get_client()
             
             # 查询指定类型的所有小节，按创建时间排序
-            result = client.table("keep_article_sections").select("*").match({
+            result = await cls.execute(client.table("keep_article_sections").select("*").match({
                 "article_id": article_id,
                 "section_type": section_type
-            }).order("created_at").execute()
+            }).order("created_at"))
             
             if result.data:
                 logger.info(f"找到文章小节: article_id={article_id}, type={section_type}, count={len(result.data)}")
@@ -363,7 +488,7 @@ class SupabaseService:
         """
         try:
             client = cls.get_client()
-            response = client.table('keep_article_requests').select('*').eq('id', request_id).execute()
+            response = await cls.execute(client.table('keep_article_requests').select('*').eq('id', request_id))
             if response.data:
                 return response.data[0]
             return None
@@ -382,9 +507,9 @@ class SupabaseService:
         try:
             client = cls.get_client()
             
-            result = client.table('keep_article_requests').update({
+            result = await cls.execute(client.table('keep_article_requests').update({
                 'url': url
-            }).eq('id', request_id).execute()
+            }).eq('id', request_id))
             
             if not result.data:
                 raise Exception(f"未找到 ID 为 {request_id} 的请求记录")
@@ -414,11 +539,11 @@ class SupabaseService:
         try:
             client = cls.get_client()
             
-            result = client.table('keep_article_requests').update({
+            result = await cls.execute(client.table('keep_article_requests').update({
                 'platform': platform,
                 'url': parsed_url,
                 'original_url': original_url
-            }).eq('id', request_id).execute()
+            }).eq('id', request_id))
             
             if not result.data:
                 raise Exception(f"未找到 ID 为 {request_id} 的请求记录")
@@ -443,15 +568,15 @@ class SupabaseService:
             client = cls.get_client()
             
             # 使用 Supabase Filter 语法
-            result = client.table('keep_article_requests').select('id').filter(
+            result = await cls.execute(client.table('keep_article_requests').select('id').filter(
                 'original_url', 'eq', url
-            ).execute()
+            ))
             
             # 如果没找到原始URL，再检查解析后的URL
             if not result.data:
-                result = client.table('keep_article_requests').select('id').filter(
+                result = await cls.execute(client.table('keep_article_requests').select('id').filter(
                     'url', 'eq', url
-                ).execute()
+                ))
             
             exists = bool(result.data)
             if exists:
@@ -462,7 +587,51 @@ class SupabaseService:
         except Exception as e:
             logger.error(f"检查URL是否存在时失败: {str(e)}", exc_info=True)
             return False
-    
+
+    @classmethod
+    async def get_request_status(cls, request_id: int) -> Optional[Dict]:
+        """获取请求记录的状态和文章ID，不读取内容字段
+
+        Args:
+            request_id: 请求ID
+
+        Returns:
+            Optional[Dict]: 包含 id、status、article_id、user_id 的记录，不存在时返回 None
+        """
+        client = cls.get_client()
+        result = await cls.execute(
+            client.table('keep_article_requests')
+            .select('id,status,article_id,user_id')
+            .eq('id', request_id)
+        )
+        return result.data[0] if result.data else None
+
+    @classmethod
+    async def find_processed_request_by_urls(cls, urls: List[str]) -> Optional[Dict]:
+        """按解析后的URL查找最初处理该内容的请求记录
+
+        复用已有文章的请求同样是已处理状态并关联了 article_id，但没有保存原文，
+        因此只查找带有原文的记录，并取 ID 最小的一条。
+
+        Args:
+            urls: 同一内容的若干种URL写法
+
+        Returns:
+            Optional[Dict]: 包含 id、article_id、user_id 的记录，未找到时返回 None
+        """
+        client = cls.get_client()
+        result = await cls.execute(
+            client.table('keep_article_requests')
+            .select('id,article_id,user_id')
+            .in_('url', urls)
+            .eq('status', 'processed')
+            .not_.is_('article_id', 'null')
+            .not_.is_('content', 'null')
+            .order('id')
+            .limit(1)
+        )
+        return result.data[0] if result.data else None
+
     @classmethod
     async def create_article_request(cls, request_data: dict) -> dict:
         """创建文章请求记录
@@ -475,7 +644,7 @@ class SupabaseService:
         """
         try:
             client = cls.get_client()
-            result = client.table('keep_article_requests').insert(request_data).execute()
+            result = await cls.execute(client.table('keep_article_requests').insert(request_data))
             
             if not result.data:
                 raise Exception("创建请求记录失败")
@@ -506,11 +675,12 @@ class SupabaseService:
             
             # 2. 通过 article_id 直接查询文章
             client = cls.get_client()
-            response = client.table('keep_articles')\
-                .select('*')\
-                .eq('id', request.get('article_id'))\
-                .single()\
-                .execute()
+            response = await cls.execute(
+                client.table('keep_articles')
+                .select('*')
+                .eq('id', request.get('article_id'))
+                .single()
+            )
             
             if response.data:
                 return response.data
@@ -534,11 +704,12 @@ class SupabaseService:
         """
         try:
             client = cls.get_client()
-            response = client.table('keep_articles')\
-                .select('*')\
-                .eq('id', article_id)\
-                .single()\
-                .execute()
+            response = await cls.execute(
+                client.table('keep_articles')
+                .select('*')
+                .eq('id', article_id)
+                .single()
+            )
             
             if response.data:
                 return response.data
@@ -561,9 +732,9 @@ class SupabaseService:
         try:
             client = cls.get_client()
             
-            result = client.table('keep_articles').update({
+            result = await cls.execute(client.table('keep_articles').update({
                 'is_visible': is_visible
-            }).eq('id', article_id).execute()
+            }).eq('id', article_id))
             
             if not result.data:
                 raise Exception(f"未找到 ID 为 {article_id} 的文章")
@@ -585,9 +756,9 @@ class SupabaseService:
         try:
             client = cls.get_client()
             
-            result = client.table('keep_articles').update({
+            result = await cls.execute(client.table('keep_articles').update({
                 'user_id': user_id
-            }).eq('id', article_id).execute()
+            }).eq('id', article_id))
             
             if not result.data:
                 raise Exception(f"未找到 ID 为 {article_id} 的文章")
@@ -609,9 +780,10 @@ class SupabaseService:
         try:
             client = cls.get_client()
             
-            result = client.table('keep_article_requests').update({
+            result = await cls.execute(client.table('keep_article_requests').update({
                 'article_id': article_id
-            }).eq('id', request_id).execute()
+            }).eq('id', request_id))
+            ArticleContentCache.invalidate_article(article_id)
             
             if not result.data:
                 raise Exception(f"未找到 ID 为 {request_id} 的请求记录")
@@ -634,11 +806,12 @@ class SupabaseService:
         """
         try:
             client = cls.get_client()
-            response = client.table('keep_articles')\
-                .select('*')\
-                .eq('private_slug', private_slug)\
-                .single()\
-                .execute()
+            response = await cls.execute(
+                client.table('keep_articles')
+                .select('*')
+                .eq('private_slug', private_slug)
+                .single()
+            )
             
             if response.data:
                 return response.data
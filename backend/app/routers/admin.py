@@ -0,0 +1,33 @@
+import hmac
+
+from fastapi import APIRouter, HTTPException, Header
+from pydantic import BaseModel
+from typing import Optional
+from app.config import settings
+from app.repositories.prompt_repository import PromptRepository
+
+router = APIRouter()
+
+class PromptInvalidateRequest(BaseModel):
+    type: Optional[str] = None  # 为空时清除全部
+    reload: bool = True  # 清除后是否立即重新加载全部提示词
+
+@router.post("/admin/prompts/invalidate")
+async def invalidate_prompt_cache(
+    request: PromptInvalidateRequest,
+    x_admin_token: Optional[str] = Header(default=None)
+):
+    """修改 keep_prompt 后清除提示词缓存"""
+    # 未配置令牌时拒绝所有请求
+    if not settings.ADMIN_API_TOKEN or not x_admin_token or not hmac.compare_digest(
+        x_admin_token.encode(), settings.ADMIN_API_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=403, detail="无权限")
+
+    cleared = PromptRepository.invalidate(request.type)
+    loaded = await PromptRepository.preload() if request.reload else 0
+    return {
+        "success": True,
+        "cleared": cleared,
+        "loaded": loaded
+    }
@@ -0,0 +1,148 @@
+import asyncio
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.utils.http_client import HttpClientRegistry
+from app.utils.fetch_client import FetchClient
+from app.utils.page_cache import page_cache
+from app.utils.adaptive_limiter import AdaptiveLimiter
+from app.utils.metrics import STAGE_DURATION, TIME_TO_FIRST_LLM, render_gauge
+from app.utils.token_estimator import TokenEstimator
+from app.services.llm_cache import llm_cache
+from app.services.job_queue import job_queue
+from app.services.request_logger import RequestLogger
+from app.repositories.article_content_cache import ArticleContentCache
+
+router = APIRouter()
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """以 Prometheus 文本格式导出各处理步骤耗时及各组件运行状态"""
+    lines = STAGE_DURATION.render() + TIME_TO_FIRST_LLM.render()
+
+    http_stats = HttpClientRegistry.stats()
+    lines += render_gauge(
+        "keepup_http_client_requests_total", "上游服务 HTTP 请求数",
+        [({"client": name}, stats["requests"]) for name, stats in http_stats.items()], "counter"
+    )
+    lines += render_gauge(
+        "keepup_http_client_connections_opened_total", "上游服务新建连接数",
+        [({"client": name}, stats["connections_opened"]) for name, stats in http_stats.items()], "counter"
+    )
+
+    fetch_stats = FetchClient.stats()
+    lines += render_gauge(
+        "keepup_fetch_requests_total", "内容抓取各主机请求 / 重试 / 失败次数",
+        [
+            ({"host": host, "event": event}, stats[event])
+            for host, stats in fetch_stats.items()
+            for event in ("requests", "retries", "errors")
+        ],
+        "counter"
+    )
+    lines += render_gauge(
+        "keepup_fetch_in_flight", "内容抓取各主机进行中的请求数",
+        [({"host": host}, stats["in_flight"]) for host, stats in fetch_stats.items()]
+    )
+
+    page_cache_stats = page_cache.stats()
+    lines += render_gauge("keepup_page_cache_bytes", "网页磁盘缓存占用字节数", [({}, page_cache_stats["total_bytes"])])
+    lines += render_gauge(
+        "keepup_page_cache_events_total", "网页磁盘缓存命中 / 304 续期 / 未命中 / 使用过期缓存 / 写入 / 淘汰次数",
+        [
+            ({"event": event}, page_cache_stats[event])
+            for event in ("hits", "revalidated", "misses", "stale", "stores", "evictions")
+        ],
+        "counter"
+    )
+
+    limiter_stats = AdaptiveLimiter.all_stats()
+    for field, help_text in (
+        ("limit", "上游并发限制器当前并发上限"),
+        ("in_flight", "上游并发限制器执行中的调用数"),
+        ("queue_depth", "上游并发限制器排队中的调用数"),
+    ):
+        lines += render_gauge(
+            f"keepup_limiter_{field}", help_text,
+            [({"limiter": name}, stats[field]) for name, stats in limiter_stats.items()]
+        )
+    lines += render_gauge(
+        "keepup_limiter_calls_total", "上游并发限制器成功 / 过载 / 失败调用数",
+        [
+            ({"limiter": name, "result": result}, stats[result])
+            for name, stats in limiter_stats.items()
+            for result in ("success", "overload", "error")
+        ],
+        "counter"
+    )
+
+    queue_stats = await asyncio.to_thread(job_queue.stats)
+    lines += render_gauge(
+        "keepup_job_queue_jobs", "后台任务队列各状态任务数",
+        [({"status": status}, count) for status, count in queue_stats["counts"].items()]
+    )
+    lines += render_gauge(
+        "keepup_job_queue_running", "后台任务队列各类型执行中的任务数",
+        [({"job_type": job_type}, count) for job_type, count in queue_stats["running"].items()]
+    )
+
+    cache_stats = llm_cache.stats()
+    lines += render_gauge("keepup_llm_cache_bytes", "LLM 结果缓存占用字节数", [({}, cache_stats["total_bytes"])])
+    lines += render_gauge(
+        "keepup_llm_cache_events_total", "LLM 结果缓存命中 / 未命中 / 写入 / 淘汰次数",
+        [
+            ({"namespace": namespace, "event": event}, count)
+            for namespace, stats in cache_stats["namespaces"].items()
+            for event, count in stats.items()
+        ],
+        "counter"
+    )
+
+    content_cache_stats = ArticleContentCache.stats()
+    lines += render_gauge("keepup_article_content_cache_bytes", "文章内容缓存占用字节数", [({}, content_cache_stats["total_bytes"])])
+    lines += render_gauge(
+        "keepup_article_content_cache_events_total", "文章内容缓存命中 / 未命中 / 淘汰 / 失效次数",
+        [({"event": event}, content_cache_stats[event]) for event in ("hits", "misses", "evictions", "invalidations")],
+        "counter"
+    )
+
+    lines += render_gauge(
+        "keepup_token_estimate_calibration", "各模型实际输入 token 数与估算值之比",
+        [({"model": model}, ratio) for model, ratio in TokenEstimator.calibration().items()]
+    )
+
+    lines += render_gauge(
+        "keepup_request_log_dropped_total", "未能写入数据库而丢弃的请求日志条数",
+        [({}, RequestLogger.dropped_count())], "counter"
+    )
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+@router.get("/metrics/http-clients")
+async def http_client_metrics():
+    """获取上游服务 HTTP 客户端的请求数、新建连接数和连接复用率"""
+    return HttpClientRegistry.stats()
+
+@router.get("/metrics/fetch-client")
+async def fetch_client_metrics():
+    """获取内容抓取客户端各主机的请求数、重试次数、失败次数和进行中的请求数"""
+    return FetchClient.stats()
+
+@router.get("/metrics/page-cache")
+async def page_cache_metrics():
+    """获取网页磁盘缓存的容量及命中 / 304 续期 / 未命中次数"""
+    return page_cache.stats()
+
+@router.get("/metrics/llm-cache")
+async def llm_cache_metrics():
+    """获取 LLM 结果缓存的容量及各命名空间的命中 / 未命中次数"""
+    return llm_cache.stats()
+
+@router.get("/metrics/limiters")
+async def limiter_metrics():
+    """获取各上游并发限制器的并发上限、执行中调用数和排队数"""
+    return AdaptiveLimiter.all_stats()
+
+@router.get("/metrics/article-content-cache")
+async def article_content_cache_metrics():
+    """获取文章内容缓存的条目数、占用字节数及命中 / 未命中次数"""
+    return ArticleContentCache.stats()
@@ -170,7 +170,7 @@ async def debug_save_polished(request: PolishRequest):
         if not request.content:
             # 1. 获取文章URL
             client = SupabaseService.get_client()
-            article_result = client.table("keep_articles").select("original_link").eq("id", request.article_id).single().execute()
+            article_result = await SupabaseService.execute(client.table("keep_articles").select("original_link").eq("id", request.article_id).single())
             
             if not article_result.data:
                 raise HTTPException(status_code=404, detail=f"未找到文章: {request.article_id}")
@@ -180,7 +180,7 @@ async def debug_save_polished(request: PolishRequest):
                 raise HTTPException(status_code=400, detail="文章缺少原始链接")
             
             # 2. 通过URL获取请求记录
-            request_result = client.table("keep_article_requests").select("content").eq("url", url).single().execute()
+            request_result = await SupabaseService.execute(client.table("keep_article_requests").select("content").eq("url", url).single())
             
             if not request_result.data:
                 raise HTTPException(status_code=404, detail=f"未找到对应的请求记录: {url}")
@@ -230,7 +230,7 @@ async def debug_save_detail(request: DetailRequest):
         if not request.content:
             # 1. 获取文章URL
             client = SupabaseService.get_client()
-            article_result = client.table("keep_articles").select("original_link").eq("id", request.article_id).single().execute()
+            article_result = await SupabaseService.execute(client.table("keep_articles").select("original_link").eq("id", request.article_id).single())
             
             if not article_result.data:
                 raise HTTPException(status_code=404, detail=f"未找到文章: {request.article_id}")
@@ -240,7 +240,7 @@ async def debug_save_detail(request: DetailRequest):
                 raise HTTPException(status_code=400, detail="文章缺少原始链接")
             
             # 2. 通过URL获取请求记录
-            request_result = client.table("keep_article_requests").select("chapters").eq("url", url).single().execute()
+            request_result = await SupabaseService.execute(client.table("keep_article_requests").select("chapters").eq("url", url).single())
             
             if not request_result.data:
                 raise HTTPException(status_code=404, detail=f"未找到对应的请求记录: {url}")
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks, UploadFile, Form
+from fastapi import APIRouter, HTTPException, UploadFile, Form
 from app.models.request import FetchRequest, ParseRequest, AppendRequest
 from app.services.content_fetcher.service import ContentFetcherService
 from app.repositories.supabase import SupabaseService
@@ -17,329 +17,313 @@ from app.services.openrouter_service import OpenRouterService
 from app.services.private_content_service import PrivateContentService
 from app.services.deep_research_service import DeepResearchService
 from app.services.platform_parser.github import GitHubParser
+from app.services.job_queue import job_queue, JobTypes
+from app.services.canonical_url import CanonicalUrlIndex
+from app.utils.metrics import stage_timer, TIME_TO_FIRST_LLM
+from app.utils.task_graph import TaskGraph
 
 import asyncio
 import json
-from typing import List, Optional
+import time
+from typing import List, Optional, Tuple
 
 router = APIRouter()
 
-async def process_summary_content(request_id: int, languages: list[str]) -> list[str]:
-    """处理总结内容解析
-    
+async def load_processing_inputs(request_id: int, step: str) -> Optional[Tuple[dict, dict]]:
+    """获取多语言处理所需的请求记录和文章记录
+
     Args:
         request_id: 请求ID
-        languages: 需要处理的语言列表
-        
+        step: 当前处理步骤，用于错误日志
+
     Returns:
-        list[str]: 处理结果信息列表
+        Optional[Tuple[dict, dict]]: (请求记录, 文章记录)，任一不存在时返回 None
     """
-    results = []
-    await RequestLogger.info(
-        request_id,
-        Steps.SUMMARY_PROCESS,
-        f"开始总结内容处理，语言列表: {languages}"
-    )
-    
     # 获取请求信息
     request = await SupabaseService.get_article_request(request_id)
     if not request:
         error_msg = "Request record not found"
-        await RequestLogger.error(request_id, Steps.SUMMARY_PROCESS, error_msg, Exception(error_msg))
-        return [error_msg]
+        await RequestLogger.error(request_id, step, error_msg, Exception(error_msg))
+        return None
         
     # 获取文章信息
     article = await SupabaseService.get_article_by_request_id(request_id)
     if not article:
         error_msg = "Article record not found"
-        await RequestLogger.error(request_id, Steps.SUMMARY_PROCESS, error_msg, Exception(error_msg))
-        return [error_msg]
-    
-    # 判断内容类型
+        await RequestLogger.error(request_id, step, error_msg, Exception(error_msg))
+        return None
+
+    return request, article
+
+
+async def process_summary_language(request_id: int, request: dict, article: dict, lang: str) -> Tuple[bool, str]:
+    """处理单个语言的总结内容
+
+    Args:
+        request_id: 请求ID
+        request: 请求记录
+        article: 文章记录
+        lang: 语言
+
+    Returns:
+        Tuple[bool, str]: (是否成功, 处理结果信息)
+    """
+    # 根据内容类型和语言选择工作流ID
     channel = article.get('channel')
+    if channel == 'webpage':
+        workflow_id = (
+            settings.COZE_WEB_SUMMARY_ID_ZH if lang == 'zh'
+            else settings.COZE_WEB_SUMMARY_ID_EN
+        )
+    elif channel == 'file':
+        workflow_id = (
+            settings.COZE_FILE_SUMMARY_ID_ZH if lang == 'zh'
+            else settings.COZE_FILE_SUMMARY_ID_EN
+        )
+    else:  # 视频类型
+        workflow_id = (
+            settings.COZE_WORKFLOW_ID_ZH if lang == 'zh'
+            else settings.COZE_WORKFLOW_ID_EN
+        )
+        
+    await RequestLogger.info(
+        request_id,
+        Steps.SUMMARY_PROCESS,
+        f"使用工作流 {workflow_id} 处理 {lang} 语言"
+    )
     
-    for lang in languages:
-        # 根据内容类型和语言选择工作流ID
-        if channel == 'webpage':
-            workflow_id = (
-                settings.COZE_WEB_SUMMARY_ID_ZH if lang == 'zh'
-                else settings.COZE_WEB_SUMMARY_ID_EN
-            )
-        elif channel == 'file':
-            workflow_id = (
-                settings.COZE_FILE_SUMMARY_ID_ZH if lang == 'zh'
-                else settings.COZE_FILE_SUMMARY_ID_EN
-            )
-        else:  # 视频类型
-            workflow_id = (
-                settings.COZE_WORKFLOW_ID_ZH if lang == 'zh'
-                else settings.COZE_WORKFLOW_ID_EN
-            )
-            
+    try:
+        # 调用 OpenRouter 获取摘要
         await RequestLogger.info(
             request_id,
             Steps.SUMMARY_PROCESS,
-            f"使用工作流 {workflow_id} 处理 {lang} 语言"
+            f"开始调用 OpenRouter 处理 {lang} 语言摘要"
         )
         
         try:
-            # 调用 OpenRouter 获取摘要
-            await RequestLogger.info(
-                request_id,
-                Steps.SUMMARY_PROCESS,
-                f"开始调用 OpenRouter 处理 {lang} 语言摘要"
-            )
-            
-            try:
+            with stage_timer(Steps.SUMMARY_PROCESS, request.get('platform'), lang):
                 openrouter_summary = await OpenRouterService.get_summary(
                     content=request.get('content'),
                     request_id=request_id,
                     article_id=article['id'],
-                    lang=lang
-                )
-                
-                await RequestLogger.info(
-                    request_id,
-                    Steps.SUMMARY_PROCESS,
-                    f"OpenRouter {lang} 语言摘要处理完成"
+                    lang=lang,
+                    chapters=request.get('chapters')
                 )
-                
-            except Exception as e:
-                await RequestLogger.error(
-                    request_id,
-                    Steps.SUMMARY_PROCESS,
-                    f"OpenRouter {lang} 语言摘要处理失败: {str(e)}",
-                    e
-                )
-                logger.error(f"OpenRouter处理失败: {str(e)}")
-                raise e
             
-            # 继续原有的 Coze 处理流程
-            parse_request = ParseRequest(
-                id=request_id, 
-                url=request.get('url'),
-                content=request.get('content'),
-                chapters=request.get('chapters')
+            await RequestLogger.info(
+                request_id,
+                Steps.SUMMARY_PROCESS,
+                f"OpenRouter {lang} 语言摘要处理完成"
             )
             
-            # coze_response = await call_coze_and_parse(
-            #     parse_request.url, 
-            #     parse_request.content, 
-            #     parse_request.chapters,
-            #     workflow_id,
-            #     request_id
-            # )
-            
-            # await process_coze_result(
-            #     coze_response, 
-            #     request_id, 
-            #     request.get('parsed_url'),
-            #     article,
-            #     lang
-            # )
-            
-            msg = f"{lang} 内容处理完成"
-            await RequestLogger.info(request_id, Steps.SUMMARY_PROCESS, msg)
-            results.append(msg)
-            
         except Exception as e:
-            error_msg = f"{lang} language processing failed"
-            await RequestLogger.error(request_id, Steps.SUMMARY_PROCESS, error_msg, e)
-            results.append(error_msg)
-            logger.error(f"Processing failed: {error_msg}, {e}")
-            continue
-    
-    return results
-
-
-async def process_subtitle_content(request_id: int, languages: list[str]) -> list[str]:
-    """处理多语言字幕内容解析"""
-    results = []
-    
-    # 如果只有 'na'，直接返回空结果
-    if languages == ['na']:
-        await RequestLogger.info(
-            request_id,
-            Steps.SUBTITLE_PROCESS,
-            "Subtitle processing skipped"
+            await RequestLogger.error(
+                request_id,
+                Steps.SUMMARY_PROCESS,
+                f"OpenRouter {lang} 语言摘要处理失败: {str(e)}",
+                e
+            )
+            logger.error(f"OpenRouter处理失败: {str(e)}")
+            raise e
+        
+        # 继续原有的 Coze 处理流程
+        parse_request = ParseRequest(
+            id=request_id, 
+            url=request.get('url'),
+            content=request.get('content'),
+            chapters=request.get('chapters')
         )
-        return ["Subtitle processing skipped"]
-    
-    # 获取请求信息
-    request = await SupabaseService.get_article_request(request_id)
-    if not request:
-        error_msg = "Request record not found"
-        await RequestLogger.error(request_id, Steps.SUBTITLE_PROCESS, error_msg, Exception(error_msg))
-        return [error_msg]
         
-    # 获取文章信息
-    article = await SupabaseService.get_article_by_request_id(request_id)
-    if not article:
-        error_msg = "Article record not found"
-        await RequestLogger.error(request_id, Steps.SUBTITLE_PROCESS, error_msg, Exception(error_msg))
-        return [error_msg]
-    
+        # coze_response = await call_coze_and_parse(
+        #     parse_request.url, 
+        #     parse_request.content, 
+        #     parse_request.chapters,
+        #     workflow_id,
+        #     request_id
+        # )
+        
+        # await process_coze_result(
+        #     coze_response, 
+        #     request_id, 
+        #     request.get('parsed_url'),
+        #     article,
+        #     lang
+        # )
+        
+        msg = f"{lang} 内容处理完成"
+        await RequestLogger.info(request_id, Steps.SUMMARY_PROCESS, msg)
+        return True, msg
+        
+    except Exception as e:
+        error_msg = f"{lang} language processing failed"
+        await RequestLogger.error(request_id, Steps.SUMMARY_PROCESS, error_msg, e)
+        logger.error(f"Processing failed: {error_msg}, {e}")
+        return False, error_msg
+
+
+async def process_subtitle_language(request_id: int, request: dict, article: dict, lang: str) -> Tuple[bool, str]:
+    """处理单个语言的字幕润色
+
+    Args:
+        request_id: 请求ID
+        request: 请求记录
+        article: 文章记录
+        lang: 语言
+
+    Returns:
+        Tuple[bool, str]: (是否成功, 处理结果信息)
+    """
+    polish_workflow_id = (
+        settings.COZE_POLISH_WORKFLOW_ID_ZH if lang == 'zh'
+        else settings.COZE_POLISH_WORKFLOW_ID_EN
+    )
+
     await RequestLogger.info(
         request_id,
         Steps.SUBTITLE_PROCESS,
-        f"开始字幕内容处理，语言列表: {languages}"
+        f"使用工作流 {polish_workflow_id} 处理 {lang} 语言"
     )
     
-    for lang in languages:
-        if lang == 'na':
-            continue
-            
-        polish_workflow_id = (
-            settings.COZE_POLISH_WORKFLOW_ID_ZH if lang == 'zh'
-            else settings.COZE_POLISH_WORKFLOW_ID_EN
-        )
-
-        await RequestLogger.info(
-            request_id,
-            Steps.SUBTITLE_PROCESS,
-            f"使用工作流 {polish_workflow_id} 处理 {lang} 语言"
-        )
-        
-        try:
-            # 添加内容润色处理
+    try:
+        # 添加内容润色处理
+        with stage_timer(Steps.SUBTITLE_PROCESS, request.get('platform'), lang):
             await ContentPolisherService.process_article_content(
                 article_id=article['id'],
                 original_content=request.get('content'),
                 language=lang,
                 workflow_id=polish_workflow_id
             )
-            
-            msg = f"{lang} 字幕内容处理完成"
-            await RequestLogger.info(request_id, Steps.SUBTITLE_PROCESS, msg)
-            results.append(msg)
-            
-        except Exception as e:
-            error_msg = f"{lang} subtitle processing failed"
-            await RequestLogger.error(request_id, Steps.SUBTITLE_PROCESS, error_msg, e)
-            results.append(error_msg)
-            continue
-    
-    return results
-
-async def process_detailed_content(request_id: int, languages: list[str]) -> list[str]:
-    """处理分段详述内容解析"""
-    results = []
-    
-    # 如果只有 'na'，直接返回空结果
-    if languages == ['na']:
-        await RequestLogger.info(
-            request_id,
-            Steps.DETAILED_PROCESS,
-            "Detailed processing skipped"
-        )
-        return ["Detailed processing skipped"]
-    
-    # 获取请求信息
-    request = await SupabaseService.get_article_request(request_id)
-    if not request:
-        error_msg = "Request record not found"
-        await RequestLogger.error(request_id, Steps.DETAILED_PROCESS, error_msg, Exception(error_msg))
-        return [error_msg]
         
-    # 获取文章信息
-    article = await SupabaseService.get_article_by_request_id(request_id)
-    if not article:
-        error_msg = "Article record not found"
-        await RequestLogger.error(request_id, Steps.DETAILED_PROCESS, error_msg, Exception(error_msg))
-        return [error_msg]
-    
+        msg = f"{lang} 字幕内容处理完成"
+        await RequestLogger.info(request_id, Steps.SUBTITLE_PROCESS, msg)
+        return True, msg
+        
+    except Exception as e:
+        error_msg = f"{lang} subtitle processing failed"
+        await RequestLogger.error(request_id, Steps.SUBTITLE_PROCESS, error_msg, e)
+        return False, error_msg
+
+
+async def process_detailed_language(request_id: int, request: dict, article: dict, lang: str) -> Tuple[bool, str]:
+    """处理单个语言的分段详述
+
+    Args:
+        request_id: 请求ID
+        request: 请求记录
+        article: 文章记录
+        lang: 语言
+
+    Returns:
+        Tuple[bool, str]: (是否成功, 处理结果信息)
+    """
+    workflow_id = (
+        settings.COZE_DETAILED_WORKFLOW_ID_ZH if lang == 'zh'
+        else settings.COZE_DETAILED_WORKFLOW_ID_EN
+    )
+
     await RequestLogger.info(
         request_id,
         Steps.DETAILED_PROCESS,
-        f"开始分段详述处理，语言列表: {languages}"
+        f"使用工作流 {workflow_id} 处理 {lang} 语言"
     )
     
-    for lang in languages:
-        if lang == 'na':
-            continue
-            
-        workflow_id = (
-            settings.COZE_DETAILED_WORKFLOW_ID_ZH if lang == 'zh'
-            else settings.COZE_DETAILED_WORKFLOW_ID_EN
-        )
-
-        await RequestLogger.info(
-            request_id,
-            Steps.DETAILED_PROCESS,
-            f"使用工作流 {workflow_id} 处理 {lang} 语言"
-        )
-        
-        try:
-            # 添加分段详述处理
+    try:
+        # 添加分段详述处理
+        with stage_timer(Steps.DETAILED_PROCESS, request.get('platform'), lang):
             await ContentDetailerService.process_article_content(
                 article_id=article['id'],
                 chapters=request.get('chapters'),
                 language=lang,
                 workflow_id=workflow_id
             )
-            
-            msg = f"{lang} 分段详述处理完成"
-            await RequestLogger.info(request_id, Steps.DETAILED_PROCESS, msg)
-            results.append(msg)
-            
-        except Exception as e:
-            error_msg = f"{lang} detailed content processing failed"
-            await RequestLogger.error(request_id, Steps.DETAILED_PROCESS, error_msg, e)
-            results.append(error_msg)
-            continue
-    
-    return results
+        
+        msg = f"{lang} 分段详述处理完成"
+        await RequestLogger.info(request_id, Steps.DETAILED_PROCESS, msg)
+        return True, msg
+        
+    except Exception as e:
+        error_msg = f"{lang} detailed content processing failed"
+        await RequestLogger.error(request_id, Steps.DETAILED_PROCESS, error_msg, e)
+        return False, error_msg
+
 
 async def process_multilingual_tasks(request_id: int, summary_languages: List[str], subtitle_languages: List[str], detailed_languages: List[str]) -> None:
     """处理多语言任务
     
+    按语言拆分为任务图，每个节点在自己的输入就绪后立即开始：
+    - summary:<语言> 和 subtitle:<语言> 只依赖原文，立即并发开始
+    - detail:<语言> 只等待同语言的 summary 完成，不再等待所有语言的总结
+    - 第一个语言的总结完成后立即将文章设为可见，其余语言的内容完成后陆续写入
+    
     Args:
         request_id: 请求ID
         summary_languages: 需要处理的摘要语言列表
         subtitle_languages: 需要处理的字幕语言列表
         detailed_languages: 需要处理的详述语言列表
     """
-    # 创建异步任务
-    async with RequestLogger.step_context(request_id, Steps.SUMMARY_PROCESS):
-        summary_task = asyncio.create_task(
-            process_summary_content(
-                request_id,
-                summary_languages
-            )
-        )
+    inputs = await load_processing_inputs(request_id, Steps.PROCESS_ERROR)
+    if not inputs:
+        await SupabaseService.update_status(request_id, "failed", "Request or article record not found")
+        return
+    request, article = inputs
 
-    async with RequestLogger.step_context(request_id, Steps.SUBTITLE_PROCESS):
-        subtitle_task = asyncio.create_task(
-            process_subtitle_content(
-                request_id,
-                subtitle_languages
-            )
-        )
+    summary_languages = list(dict.fromkeys(summary_languages))
+    subtitle_languages = [lang for lang in dict.fromkeys(subtitle_languages) if lang != 'na']
+    detailed_languages = [lang for lang in dict.fromkeys(detailed_languages) if lang != 'na']
+    await RequestLogger.info(
+        request_id,
+        Steps.SUMMARY_PROCESS,
+        f"开始多语言处理: 总结={summary_languages}, 字幕={subtitle_languages}, 详述={detailed_languages}"
+    )
 
-    # 等待summary_task完成
-    summary_result = await summary_task
+    published = False
 
-    async with RequestLogger.step_context(request_id, Steps.DETAILED_PROCESS):
-        detailed_task = asyncio.create_task(
-            process_detailed_content(
-                request_id,
-                detailed_languages
-            )
-        )
+    async def publish(lang: str):
+        # 第一个可读语言完成即发布文章；发布失败只记录日志，不能让异常取消其他语言的节点，
+        # published 保持 False，由后续语言或全部完成后的兜底再次发布
+        nonlocal published
+        if published:
+            return
+        try:
+            await SupabaseService.update_article_visibility(article['id'], True)
+        except Exception as e:
+            await RequestLogger.error(request_id, Steps.SUMMARY_PROCESS, f"{lang} 总结已完成，但发布文章失败", e)
+            return
+        published = True
+        await RequestLogger.info(request_id, Steps.SUMMARY_PROCESS, f"{lang} 总结已完成，文章已发布")
 
-    # 等待所有任务完成
-    results = await asyncio.gather(
-        summary_task,
-        subtitle_task,
-        detailed_task,
-        return_exceptions=True
-    )
+    def summary_node(lang: str):
+        async def run():
+            ok, msg = await process_summary_language(request_id, request, article, lang)
+            if ok:
+                await publish(lang)
+            return msg
+        return run
+
+    def stage_node(handler, lang: str):
+        async def run(**_):
+            _, msg = await handler(request_id, request, article, lang)
+            return msg
+        return run
+
+    graph = TaskGraph(f"multilingual-{request_id}")
+    for lang in summary_languages:
+        graph.add(f"summary:{lang}", summary_node(lang))
+    for lang in subtitle_languages:
+        graph.add(f"subtitle:{lang}", stage_node(process_subtitle_language, lang))
+    for lang in detailed_languages:
+        deps = [f"summary:{lang}"] if lang in summary_languages else []
+        graph.add(f"detail:{lang}", stage_node(process_detailed_language, lang), deps=deps)
+
+    results = await graph.run()
+    logger.info(f"多语言处理各节点耗时: request_id={request_id}, {graph.describe_timings()}")
     
-    # 获取文章信息
-    article = await SupabaseService.get_article_by_request_id(request_id)
-    if article:
-        # 更新文章为可见状态
-        await SupabaseService.update_article_visibility(article['id'], True)
+    # 没有任何总结成功（或发布失败）时，仍在全部完成后发布文章
+    if not published:
+        try:
+            await SupabaseService.update_article_visibility(article['id'], True)
+        except Exception as e:
+            await RequestLogger.error(request_id, Steps.PROCESS_ERROR, "多语言处理完成，但发布文章失败", e)
     
     # 更新请求状态
     await SupabaseService.update_status(request_id, "processed")
@@ -351,97 +335,119 @@ async def process_multilingual_tasks(request_id: int, summary_languages: List[st
         metadata={"results": results}
     )
 
+class ArticleTaskAbort(Exception):
+    """文章处理流程中的预期失败，如无法获取视频信息或字幕"""
+
+    def __init__(self, step: str, message: str):
+        super().__init__(message)
+        self.step = step
+
+
 async def process_article_task(request: FetchRequest):
+    """
+    文章处理后台任务
+
+    按依赖关系组织为任务图，互不依赖的网络请求并发执行：
+    - 视频信息 -> 作者 -> 文章记录
+    - 章节信息 -> 保存章节
+    - 字幕内容 -> 保存字幕
+    三条链全部完成（数据已写入）后立即开始多语言处理。
+
+    Args:
+        request: 已解析URL的请求对象
+    """
+    task_start = time.perf_counter()
     try:
         await RequestLogger.info(
             request_id=request.id,
             step=Steps.PROCESS_START,
             message=f"开始后台处理: URL={request.parsed_url}, Languages={request.summary_languages}"
         )
-        
+        service = ContentFetcherService(request)
+
         # 2. 获取视频基础信息
-        async with RequestLogger.step_context(request.id, Steps.VIDEO_INFO_FETCH):
-            service = ContentFetcherService(request)
-            video_info = await service.get_video_info(request.parsed_url)
-            
-            if not video_info:
-                error_msg = "Unable to get video information"
-                await RequestLogger.error(
+        async def fetch_video_info():
+            async with RequestLogger.step_context(request.id, Steps.VIDEO_INFO_FETCH):
+                with stage_timer(Steps.VIDEO_INFO_FETCH, request.platform) as timer:
+                    video_info = await service.get_video_info(request.parsed_url)
+                    if not video_info:
+                        timer["status"] = "error"
+                if not video_info:
+                    raise ArticleTaskAbort(Steps.VIDEO_INFO_FETCH, "Unable to get video information")
+                return video_info
+
+        # 3. 获取视频章节信息并保存
+        async def fetch_chapters():
+            async with RequestLogger.step_context(request.id, Steps.CONTENT_FETCH):
+                chapters = await service.get_chapters(request.parsed_url)
+                await RequestLogger.info(
                     request.id,
-                    Steps.VIDEO_INFO_FETCH,
-                    error_msg,
-                    Exception(error_msg)
+                    Steps.CONTENT_FETCH,
+                    f"获取到章节信息: {len(chapters) if chapters else 0} 个章节"
                 )
-                await SupabaseService.update_status(request.id, "failed", error_msg)
-                return
-        
-        # 3. 获取视频章节信息
-        async with RequestLogger.step_context(request.id, Steps.CONTENT_FETCH):
-            chapters = await service.get_chapters(request.parsed_url)
-            await RequestLogger.info(
-                request.id,
-                Steps.CONTENT_FETCH,
-                f"获取到章节信息: {len(chapters) if chapters else 0} 个章节"
-            )
-            
-            # 保存章信息到数据库
-            await SupabaseService.update_chapters(request.id, chapters)
-        
+                await SupabaseService.update_chapters(request.id, chapters)
+
         # 4. 处理作者信息
-        author = await SupabaseService.get_author_by_name(video_info.author["name"])
-        if not author:
-            # 创建新作者
-            author = await SupabaseService.create_author(video_info.author)
-        else:
+        async def save_author(video_info):
+            author = await SupabaseService.get_author_by_name(video_info.author["name"])
+            if not author:
+                # 创建新作者
+                return await SupabaseService.create_author(video_info.author)
             # 更新作者信息
             await SupabaseService.update_author(author["id"], video_info.author)
-            
+            return author
+
         # 5. 创建文章基础信息
-        try:
-            article_data = video_info.article
-            article_data.author_id = author["id"]
-            # 添加 platform 和 original_url 到文章数据
-            article_data.channel = request.platform  # 使用解析得到的 platform
-            article_data.original_link = request.original_url  # 使用原始 URL
-            article = await SupabaseService.create_article(article_data)
-            
+        async def create_article(video_info, author):
+            try:
+                article_data = video_info.article
+                article_data.author_id = author["id"]
+                # 添加 platform 和 original_url 到文章数据
+                article_data.channel = request.platform  # 使用解析得到的 platform
+                article_data.original_link = request.original_url  # 使用原始 URL
+                article = await SupabaseService.create_article(article_data)
+            except ValueError as e:
+                raise ArticleTaskAbort(Steps.PROCESS_ERROR, str(e)) from e
+
             # 更新文章的用户ID（用于删除按钮显示判断）
             if request.user_id:
                 await SupabaseService.update_article_user_id(article['id'], request.user_id)
-            
+
             # 更新请求记录的文章ID
             await SupabaseService.update_article_id(request.id, article['id'])
-            
-        except ValueError as e:
-            error_msg = str(e)
-            await RequestLogger.error(
-                request.id,
-                Steps.PROCESS_ERROR,
-                error_msg,
-                e
-            )
-            await SupabaseService.update_status(request.id, "failed", error_msg)
+            return article
+
+        # 6. 获取视频字幕并保存
+        async def fetch_content():
+            async with RequestLogger.step_context(request.id, Steps.CONTENT_FETCH):
+                with stage_timer(Steps.CONTENT_FETCH, request.platform) as timer:
+                    content = await service.fetch_content(request.parsed_url)
+                    if not content:
+                        timer["status"] = "error"
+                if not content:
+                    raise ArticleTaskAbort(Steps.CONTENT_FETCH, "Unable to get subtitle content")
+                await SupabaseService.update_content(request.id, content)
+
+        graph = (
+            TaskGraph(f"article-{request.id}")
+            .add("video_info", fetch_video_info)
+            .add("chapters", fetch_chapters)
+            .add("content", fetch_content)
+            .add("author", save_author, deps=["video_info"])
+            .add("article", create_article, deps=["video_info", "author"])
+        )
+        try:
+            results = await graph.run()
+        except ArticleTaskAbort as e:
+            await RequestLogger.error(request.id, e.step, str(e), e)
+            await SupabaseService.update_status(request.id, "failed", str(e))
             return
-        
-        # 6. 获取视频字幕
-        async with RequestLogger.step_context(request.id, Steps.CONTENT_FETCH):
-            content = await service.fetch_content(request.parsed_url)
-            if not content:
-                error_msg = "Unable to get subtitle content"
-                await RequestLogger.error(
-                    request.id,
-                    Steps.CONTENT_FETCH,
-                    error_msg,
-                    Exception(error_msg)
-                )
-                await SupabaseService.update_status(request.id, "failed", error_msg)
-                return
-            
-            # 保存字幕内容
-            await SupabaseService.update_content(request.id, content)
-        
-        # 等待确保数据已保存
-        await asyncio.sleep(1)
+        finally:
+            logger.info(f"文章准备阶段耗时: request_id={request.id}, {graph.describe_timings()}")
+
+        article = results["article"]
+        # 文章记录、章节和字幕均已写入，可以开始 LLM 处理
+        TIME_TO_FIRST_LLM.observe(time.perf_counter() - task_start, platform=request.platform)
 
         # 处理多语言任务
         await process_multilingual_tasks(
@@ -489,6 +495,109 @@ async def create_article_view_record(user_id: str, article_id: int):
         logger.error(f"创建文章浏览记录失败: {str(e)}", exc_info=True)
 
 
+# 请求中的语言字段对应的小节类型
+LANGUAGE_SECTION_TYPES = {
+    "summary_languages": "总结",
+    "subtitle_languages": "原文字幕",
+    "detailed_languages": "分段详述",
+}
+
+
+async def find_missing_languages(request: FetchRequest, article_id: int) -> Optional[dict]:
+    """计算已有文章缺少的请求语言
+
+    Args:
+        request: 当前请求
+        article_id: 已有文章ID
+
+    Returns:
+        Optional[dict]: 与 LANGUAGE_SECTION_TYPES 同键的缺少语言列表，查询失败时返回 None
+    """
+    try:
+        existing_languages = await SupabaseService.get_section_languages(article_id)
+    except Exception as e:
+        logger.error(f"查询已有文章的语言失败: article_id={article_id}, error={str(e)}")
+        return None
+
+    missing = {}
+    for field, section_type in LANGUAGE_SECTION_TYPES.items():
+        covered = existing_languages.get(section_type, set())
+        missing[field] = [
+            lang for lang in dict.fromkeys(getattr(request, field))
+            if lang != 'na' and lang not in covered
+        ]
+    return missing
+
+
+async def reuse_existing_article(
+    request: FetchRequest,
+    existing: dict,
+    canonical_key: str,
+    platform: str,
+    parsed_url: str,
+    missing_languages: dict
+) -> dict:
+    """
+    复用同一内容已处理完成的文章
+
+    将新请求直接关联到已有文章并标记为已处理，为用户添加浏览记录，不再重新处理。
+    已有文章缺少请求的语言时，与 /workflow/append 一样在原请求上补充处理缺少的语言。
+
+    Args:
+        request: 当前请求
+        existing: 已处理完成的请求记录，包含 request_id、article_id、user_id
+        canonical_key: 规范键
+        platform: 平台
+        parsed_url: 解析后的URL
+        missing_languages: find_missing_languages 的结果
+
+    Returns:
+        dict: 接口响应
+    """
+    article_id = existing["article_id"]
+    await SupabaseService.update_article_id(request.id, article_id)
+    await SupabaseService.update_status(request.id, "processed")
+
+    if any(missing_languages.values()):
+        # 原文、章节等保存在原请求上，补充处理使用原请求
+        await job_queue.enqueue(JobTypes.MULTILINGUAL, {
+            "request_id": existing["request_id"],
+            **missing_languages
+        })
+
+    try:
+        await ArticleViewsRepository.create_article_view(
+            user_id=request.user_id,
+            article_id=article_id,
+            # 浏览记录按 (user_id, article_id) upsert，同一用户重复提交时保留作者身份
+            is_author=existing.get("user_id") == request.user_id
+        )
+    except Exception as e:
+        logger.error(f"创建文章浏览记录失败: {str(e)}", exc_info=True)
+
+    await RequestLogger.info(
+        request.id,
+        Steps.URL_CHECK,
+        "内容已处理过，关联已有文章",
+        metadata={
+            "canonical_key": canonical_key,
+            "article_id": article_id,
+            "source_request_id": existing["request_id"],
+            "missing_languages": missing_languages
+        }
+    )
+
+    return {
+        "success": True,
+        "message": "内容已处理过，已关联到已有文章",
+        "request_id": request.id,
+        "platform": platform,
+        "parsed_url": parsed_url,
+        "article_id": article_id,
+        "reused": True
+    }
+
+
 async def process_github_agent_task(request: FetchRequest):
     """
     GitHub Agent 项目分析后台任务
@@ -539,7 +648,7 @@ async def process_github_agent_task(request: FetchRequest):
         
         try:
             # 直接使用 Supabase client 插入文章
-            result = client.table("keep_articles").insert(article_insert_data).execute()
+            result = await SupabaseService.execute(client.table("keep_articles").insert(article_insert_data))
             if not result.data:
                 raise ValueError("创建文章失败")
             article = result.data[0]
@@ -569,10 +678,13 @@ async def process_github_agent_task(request: FetchRequest):
                     f"Deep Research 第 {attempt + 1} 次尝试..."
                 )
                 
-                research_result = await DeepResearchService.run_deep_research(
-                    github_url=request.original_url,
-                    request_id=request.id
-                )
+                with stage_timer(Steps.SUMMARY_PROCESS, "github", "zh") as timer:
+                    research_result = await DeepResearchService.run_deep_research(
+                        github_url=request.original_url,
+                        request_id=request.id
+                    )
+                    if not research_result["success"]:
+                        timer["status"] = "error"
                 
                 if research_result["success"]:
                     await RequestLogger.info(
@@ -669,8 +781,44 @@ async def process_github_agent_task(request: FetchRequest):
             error_message=str(e)
         )
 
+async def can_resume_request(request_id: Optional[int]) -> bool:
+    """进程中断后的恢复检查：处理函数不是幂等的，只有尚未创建文章的请求才重新执行
+
+    已创建文章但未处理完成的请求标记为失败，避免重复创建文章。
+
+    Args:
+        request_id: 请求ID
+
+    Returns:
+        bool: 是否重新执行
+    """
+    if not request_id:
+        return False
+    request = await SupabaseService.get_article_request(request_id)
+    if not request or request.get('status') in ("processed", "failed"):
+        return False
+    if request.get('article_id'):
+        await SupabaseService.update_status(request_id, "failed", "处理中断，文章已部分生成，请重新提交")
+        return False
+    return True
+
+
+# 注册后台任务处理函数，payload 与入队时的字典一一对应
+job_queue.register(
+    JobTypes.ARTICLE,
+    lambda payload: process_article_task(FetchRequest(**payload)),
+    can_resume=lambda payload: can_resume_request(payload.get("id"))
+)
+job_queue.register(
+    JobTypes.GITHUB_AGENT,
+    lambda payload: process_github_agent_task(FetchRequest(**payload)),
+    can_resume=lambda payload: can_resume_request(payload.get("id"))
+)
+# 多语言补充会重复写入分段，中断后不自动重新执行
+job_queue.register(JobTypes.MULTILINGUAL, lambda payload: process_multilingual_tasks(**payload))
+
 @router.post("/workflow/process")
-async def process_workflow(request: FetchRequest, background_tasks: BackgroundTasks):
+async def process_workflow(request: FetchRequest):
     """接收请求并立即返回"""
     try:
         
@@ -706,8 +854,13 @@ async def process_workflow(request: FetchRequest, background_tasks: BackgroundTa
         
         # 3. 使用 ContentResolver 解析 URL
         async with RequestLogger.step_context(request.id, Steps.URL_RESOLVE):
-            resolver = ContentResolver()
-            result = await resolver.resolve(request.original_url)
+            with stage_timer(Steps.URL_RESOLVE) as timer:
+                resolver = ContentResolver()
+                result = await resolver.resolve(request.original_url)
+                if result:
+                    timer["platform"] = result[0]
+                else:
+                    timer["status"] = "error"
             
             if not result:
                 error_msg = "Unable to parse URL"
@@ -734,20 +887,34 @@ async def process_workflow(request: FetchRequest, background_tasks: BackgroundTa
             original_url=original_url
         )
         
-        # 5. 更新状态为处理中
+        # 5. 同一内容已处理过时直接关联已有文章，force_refresh 时强制重新处理
+        canonical = await CanonicalUrlIndex.canonical_key(parsed_url, original_url)
+        if canonical:
+            canonical_key, candidate_urls = canonical
+            existing = None if request.force_refresh else await CanonicalUrlIndex.find_processed(
+                canonical_key, candidate_urls
+            )
+            missing_languages = await find_missing_languages(request, existing["article_id"]) if existing else None
+            if missing_languages is not None:
+                return await reuse_existing_article(
+                    request, existing, canonical_key, platform, parsed_url, missing_languages
+                )
+            await CanonicalUrlIndex.record(canonical_key, request.id)
+        
+        # 6. 更新状态为处理中
         await SupabaseService.update_status(request.id, "processing")
         
-        # 6. 使用解析后的URL更新请求对象
+        # 7. 使用解析后的URL更新请求对象
         request.parsed_url = parsed_url
         request.platform = platform
         request.original_url = original_url
         
-        # 7. 异步启动处理任务
+        # 8. 提交到后台任务队列
         # GitHub 平台使用专用的 Deep Research 处理流程
         if platform == "github":
-            background_tasks.add_task(process_github_agent_task, request)
+            await job_queue.enqueue(JobTypes.GITHUB_AGENT, request.model_dump())
         else:
-            background_tasks.add_task(process_article_task, request)
+            await job_queue.enqueue(JobTypes.ARTICLE, request.model_dump())
         
         await RequestLogger.info(
             request.id,
@@ -782,8 +949,7 @@ async def process_workflow(request: FetchRequest, background_tasks: BackgroundTa
 async def upload_workflow(
     file: UploadFile,
     summary_languages: str = Form(...),
-    user_id: str = Form(...),
-    background_tasks: BackgroundTasks = BackgroundTasks()
+    user_id: str = Form(...)
 ):
     """处理文件上传请求"""
     try:
@@ -839,8 +1005,8 @@ async def upload_workflow(
             user_id=user_id
         )
         
-        # 6. 异步启动处理任务
-        background_tasks.add_task(process_article_task, file_request)
+        # 6. 提交到后台任务队列
+        await job_queue.enqueue(JobTypes.ARTICLE, file_request.model_dump())
         
         return {
             "success": True,
@@ -856,10 +1022,7 @@ async def upload_workflow(
         } 
 
 @router.post("/workflow/append")
-async def append_workflow(
-    request: AppendRequest,
-    background_tasks: BackgroundTasks
-):
+async def append_workflow(request: AppendRequest):
     """处理内容补充请求"""
     try:
         # 1. 获取原始请求信息
@@ -867,14 +1030,13 @@ async def append_workflow(
         if not request_id:
             raise HTTPException(status_code=404, detail="找不到原始文章请求")
 
-        # 2. 启动后台处理任务
-        background_tasks.add_task(
-            process_multilingual_tasks,
-            request_id,
-            request.summary_languages,
-            request.subtitle_languages,
-            request.detailed_languages
-        )
+        # 2. 提交到后台任务队列
+        await job_queue.enqueue(JobTypes.MULTILINGUAL, {
+            "request_id": request_id,
+            "summary_languages": request.summary_languages,
+            "subtitle_languages": request.subtitle_languages,
+            "detailed_languages": request.detailed_languages
+        })
         
         return {
             "success": True,
@@ -918,9 +1080,15 @@ async def process_private_content_task(
         await SupabaseService.update_status(request_id, "failed", str(e))
 
 
+job_queue.register(
+    JobTypes.PRIVATE_CONTENT,
+    lambda payload: process_private_content_task(**payload),
+    can_resume=lambda payload: can_resume_request(payload.get("request_id"))
+)
+
+
 @router.post("/workflow/private-upload")
 async def private_upload_workflow(
-    background_tasks: BackgroundTasks,
     file: Optional[UploadFile] = None,
     text_content: str = Form(None),
     input_type: str = Form(...),  # 'audio' 或 'text'
@@ -1023,18 +1191,17 @@ async def private_upload_workflow(
         
         request_id = request_data['id']
         
-        # 启动后台处理任务
+        # 提交到后台任务队列
         # 注意：title 保持原始值（可能为空），让 process_private_content 根据 AI 生成标题
-        background_tasks.add_task(
-            process_private_content_task,
-            request_id=request_id,
-            user_id=user_id,
-            input_type=input_type,
-            prompt_type=prompt_type,
-            title=title,  # 保持原始值，空则由 AI 生成
-            content=content,
-            audio_url=audio_url
-        )
+        await job_queue.enqueue(JobTypes.PRIVATE_CONTENT, {
+            "request_id": request_id,
+            "user_id": user_id,
+            "input_type": input_type,
+            "prompt_type": prompt_type,
+            "title": title,  # 保持原始值，空则由 AI 生成
+            "content": content,
+            "audio_url": audio_url
+        })
         
         return {
             "success": True,
@@ -0,0 +1,259 @@
+"""
+AWS Bedrock 运行时客户端工厂
+
+- 按 (区域, 超时配置) 缓存 boto3 bedrock-runtime 客户端，避免每次调用重复创建
+- boto3 的调用是同步阻塞的，统一放到专用的有界线程池中执行，不占用事件循环
+- 流式调用由专用线程读取事件流，经有界队列交给事件循环，支持取消
+"""
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, AsyncGenerator, Dict, Optional, Set, Tuple
+
+import boto3
+from botocore.config import Config
+
+from app.config import settings
+from app.utils.logger import logger
+
+# 读取线程放入队列的消息类型
+_CHUNK = "chunk"
+_DONE = "done"
+_ERROR = "error"
+# 读取线程结束（含关闭线程池时被取消、未启动）后由事件循环放入，保证消费方总能收到结束消息
+_STOPPED = "stopped"
+
+
+class BedrockClientFactory:
+    """Bedrock 客户端工厂及异步调用封装"""
+
+    _clients: Dict[Tuple[str, int, int], Any] = {}
+    _lock = threading.Lock()
+    _executor: Optional[ThreadPoolExecutor] = None
+    _stream_executor: Optional[ThreadPoolExecutor] = None
+    # 进行中的流的取消标记，关闭时统一通知
+    _active_streams: Set[threading.Event] = set()
+
+    @classmethod
+    def get_client(cls, region: str, read_timeout: int = 300, connect_timeout: int = 60):
+        """获取缓存的 bedrock-runtime 客户端
+
+        boto3 客户端是线程安全的，可以在线程池中共享。
+
+        Args:
+            region: AWS 区域
+            read_timeout: 读取超时（秒）
+            connect_timeout: 连接超时（秒）
+
+        Returns:
+            bedrock-runtime 客户端
+        """
+        key = (region, read_timeout, connect_timeout)
+        client = cls._clients.get(key)
+        if client is not None:
+            return client
+
+        with cls._lock:
+            if key not in cls._clients:
+                config = Config(
+                    read_timeout=read_timeout,
+                    connect_timeout=connect_timeout,
+                    retries={'max_attempts': 3},
+                    # 连接池不小于线程数，避免线程等待连接
+                    max_pool_connections=settings.BEDROCK_EXECUTOR_WORKERS
+                )
+                cls._clients[key] = boto3.client(
+                    'bedrock-runtime',
+                    region_name=region,
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                    config=config
+                )
+                logger.info(f"创建Bedrock客户端: region={region}, read_timeout={read_timeout}")
+            return cls._clients[key]
+
+    @classmethod
+    def get_executor(cls) -> ThreadPoolExecutor:
+        """获取 Bedrock 调用专用的有界线程池"""
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(
+                max_workers=settings.BEDROCK_EXECUTOR_WORKERS,
+                thread_name_prefix="bedrock"
+            )
+        return cls._executor
+
+    @classmethod
+    async def invoke_model(
+        cls,
+        model_id: str,
+        body: Dict[str, Any],
+        region: str,
+        read_timeout: int = 300,
+        connect_timeout: int = 60
+    ) -> Dict[str, Any]:
+        """异步调用 invoke_model 并返回解析后的响应体
+
+        Args:
+            model_id: 模型ID
+            body: 请求体（Messages API 格式）
+            region: AWS 区域
+            read_timeout: 读取超时（秒）
+            connect_timeout: 连接超时（秒）
+
+        Returns:
+            Dict[str, Any]: 解析后的响应 JSON
+        """
+        client = cls.get_client(region, read_timeout, connect_timeout)
+
+        def _invoke() -> Dict[str, Any]:
+            response = client.invoke_model(
+                modelId=model_id,
+                body=json.dumps(body),
+                contentType="application/json"
+            )
+            return json.loads(response['body'].read())
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(cls.get_executor(), _invoke)
+
+    @classmethod
+    def get_stream_executor(cls) -> ThreadPoolExecutor:
+        """获取流式调用专用的线程池
+
+        每个流在整个生成期间占用一个线程，与 invoke_model 分开，避免长时间的流占满普通调用的线程。
+        """
+        if cls._stream_executor is None:
+            cls._stream_executor = ThreadPoolExecutor(
+                max_workers=settings.BEDROCK_STREAM_WORKERS,
+                thread_name_prefix="bedrock-stream"
+            )
+        return cls._stream_executor
+
+    @classmethod
+    async def invoke_model_stream(
+        cls,
+        model_id: str,
+        body: Dict[str, Any],
+        region: str,
+        read_timeout: int = 120,
+        connect_timeout: int = 30
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """异步流式调用 invoke_model_with_response_stream
+
+        boto3 的事件流在专用线程中读取和解析，通过有界 asyncio.Queue 交给事件循环：
+        - 队列满时读取线程阻塞等待（背压），消费慢的流不会无限占用内存
+        - 调用方停止迭代、被取消（如客户端断开）时通知读取线程停止并关闭事件流
+        - 读取线程未正常结束（如关闭线程池）时抛出 RuntimeError，调用方不会一直等待
+        建议配合 contextlib.aclosing 使用，提前退出时立即释放线程。
+
+        Args:
+            model_id: 模型ID
+            body: 请求体（Messages API 格式）
+            region: AWS 区域
+            read_timeout: 读取超时（秒）
+            connect_timeout: 连接超时（秒）
+
+        Yields:
+            Dict[str, Any]: 解析后的 chunk 事件，如 content_block_delta、message_stop
+        """
+        client = cls.get_client(region, read_timeout, connect_timeout)
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.BEDROCK_STREAM_QUEUE_SIZE)
+        cancelled = threading.Event()
+        # 读取线程打开的事件流，取消时由事件循环一侧关闭以打断阻塞中的读取
+        holder: Dict[str, Any] = {}
+
+        def offer(item: Tuple[str, Any]) -> bool:
+            """在读取线程中放入队列，队列满时阻塞，取消或事件循环关闭时返回 False"""
+            while not cancelled.is_set():
+                try:
+                    future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+                except RuntimeError:
+                    return False
+                try:
+                    future.result(timeout=1)
+                    return True
+                except FutureTimeoutError:
+                    if not future.cancel():
+                        # 取消前已经放入队列
+                        return True
+            return False
+
+        def pump() -> None:
+            event_stream = None
+            try:
+                response = client.invoke_model_with_response_stream(
+                    modelId=model_id,
+                    body=json.dumps(body),
+                    contentType="application/json"
+                )
+                event_stream = response['body']
+                holder['stream'] = event_stream
+                for event in event_stream:
+                    if cancelled.is_set():
+                        return
+                    if 'chunk' in event:
+                        if not offer((_CHUNK, json.loads(event['chunk']['bytes'].decode('utf-8')))):
+                            return
+                offer((_DONE, None))
+            except Exception as e:
+                if not cancelled.is_set():
+                    offer((_ERROR, e))
+            finally:
+                if event_stream is not None:
+                    try:
+                        event_stream.close()
+                    except Exception:
+                        pass
+
+        cls._active_streams.add(cancelled)
+        worker = loop.run_in_executor(cls.get_stream_executor(), pump)
+
+        def on_worker_done(_) -> None:
+            # 正常结束时 _DONE / _ERROR 已在队列中，_STOPPED 排在其后不会被读取
+            holder['stopped'] = loop.create_task(queue.put((_STOPPED, None)))
+
+        worker.add_done_callback(on_worker_done)
+        finished = False
+        try:
+            while True:
+                kind, payload = await queue.get()
+                if kind != _CHUNK:
+                    finished = True
+                    if kind == _ERROR:
+                        raise payload
+                    if kind == _STOPPED:
+                        raise RuntimeError("Bedrock流式调用被中断（服务正在关闭）")
+                    break
+                if payload.get('type') == 'message_stop':
+                    # 调用方通常收到 message_stop 后就停止迭代，此时流已正常结束，不必按提前结束处理
+                    finished = True
+                yield payload
+        finally:
+            cls._active_streams.discard(cancelled)
+            if not finished and not worker.done():
+                cancelled.set()
+                # 腾出队列空间，让阻塞在 put 上的读取线程尽快退出
+                while not queue.empty():
+                    queue.get_nowait()
+                event_stream = holder.get('stream')
+                if event_stream is not None:
+                    try:
+                        event_stream.close()
+                    except Exception:
+                        pass
+                logger.info(f"Bedrock流式调用提前结束，已通知读取线程停止: model={model_id}")
+
+    @classmethod
+    def shutdown(cls):
+        """关闭线程池，通知进行中的流停止并等待普通调用结束"""
+        for cancelled in list(cls._active_streams):
+            cancelled.set()
+        if cls._stream_executor is not None:
+            cls._stream_executor.shutdown(wait=False, cancel_futures=True)
+            cls._stream_executor = None
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=True)
+            cls._executor = None
+            logger.info("Bedrock线程池已关闭")
@@ -1,16 +1,19 @@
-import boto3
-import json
 from typing import Optional, Dict, Any
-from app.config import settings
 from app.utils.logger import logger
 from app.repositories.prompt_repository import PromptRepository
 from app.repositories.supabase import SupabaseService
 from app.repositories.llm_records_repository import LLMRecordsRepository
 from app.utils.decorators import retry_decorator
+from app.services.bedrock_client import BedrockClientFactory
+from app.services.long_summary import MapReduceSummarizer
+from app.utils.token_estimator import TokenEstimator
 
 class BedrockService:
     MODEL = "anthropic.claude-3-5-sonnet-20241022-v2:0"
     REGION = "us-west-2"
+    MAX_TOKENS = 4000
+    # 至少需要预留的输出 token 数，不足时分块总结
+    MIN_OUTPUT_TOKENS = 1000
     
     @staticmethod
     async def get_prompt_data(lang: str) -> Optional[str]:
@@ -51,38 +54,35 @@ class BedrockService:
         error_msg = None
         
         try:
-            # 创建 Bedrock 客户端
-            bedrock_client = boto3.client(
-                'bedrock-runtime',
-                region_name=BedrockService.REGION,
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
-            )
-            
-            # 构建请求数据
+            # 构建请求数据，输入加输出不能超出上下文窗口
+            text = f"{prompt}\n\n{content}"
+            input_tokens = TokenEstimator.estimate_messages([text], BedrockService.MODEL)
+            max_tokens = TokenEstimator.max_output_tokens(BedrockService.MODEL, input_tokens, BedrockService.MAX_TOKENS)
             request_data = {
                 "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 4000,
+                "max_tokens": max(max_tokens, BedrockService.MIN_OUTPUT_TOKENS),
                 "temperature": 0.1,
                 "messages": [
                     {
                         "role": "user",
-                        "content": f"{prompt}\n\n{content}"
+                        "content": text
                     }
                 ]
             }
             
             # 调用 Bedrock API
-            response = bedrock_client.invoke_model(
-                modelId=BedrockService.MODEL,
-                body=json.dumps(request_data)
+            response_data = await BedrockClientFactory.invoke_model(
+                model_id=BedrockService.MODEL,
+                body=request_data,
+                region=BedrockService.REGION
             )
             
-            # 解析响应
-            response_body = response['body'].read()
-            response_data = json.loads(response_body)
-            
             logger.info(f"Bedrock API调用成功: {response_data}")
+            TokenEstimator.calibrate(
+                BedrockService.MODEL,
+                TokenEstimator.estimate_messages([text]),
+                response_data.get('usage', {}).get('input_tokens', 0)
+            )
             return response_data
             
         except Exception as e:
@@ -338,14 +338,6 @@ class BedrockService:
 
 请将以下内容翻译成中文："""
 
-            # 创建 Bedrock 客户端
-            bedrock_client = boto3.client(
-                'bedrock-runtime',
-                region_name=BedrockService.REGION,
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
-            )
-            
             request_data = {
                 "anthropic_version": "bedrock-2023-05-31",
                 "max_tokens": 3000,
@@ -362,14 +354,12 @@ class BedrockService:
             logger.info(f"翻译内容长度: {len(summary_content)} 字符")
             
             try:
-                response = bedrock_client.invoke_model(
-                    modelId=BedrockService.MODEL,
-                    body=json.dumps(request_data)
+                response_data = await BedrockClientFactory.invoke_model(
+                    model_id=BedrockService.MODEL,
+                    body=request_data,
+                    region=BedrockService.REGION
                 )
                 
-                response_body = response['body'].read()
-                response_data = json.loads(response_body)
-                
                 logger.info(f"翻译API响应数据: {response_data}")
                 
                 if 'content' in response_data and response_data['content']:
@@ -404,6 +394,21 @@ class BedrockService:
         if not prompt:
             raise Exception("获取提示词失败")
             
+        # 预估输入放不下时先分块总结，再对拼接的笔记做最终总结
+        route = TokenEstimator.choose_model(
+            [BedrockService.MODEL], [prompt, content],
+            desired_output=BedrockService.MAX_TOKENS,
+            min_output=BedrockService.MIN_OUTPUT_TOKENS
+        )
+        if route is None:
+            logger.info(f"预估输入超出模型上下文窗口，使用分层总结: request_id={request_id}")
+            
+            async def call(chunk_prompt: str, chunk: str, request_id: int, lang: str) -> Dict[str, Any]:
+                response = await BedrockService.call_bedrock_api(chunk_prompt, chunk, request_id, lang)
+                return {'choices': [{'message': {'content': response['content'][0]['text']}}]}
+            
+            content = await MapReduceSummarizer.condense(content, call, request_id, lang, fair_key=str(article_id))
+            
         # 2. 调用API
         api_response = await BedrockService.call_bedrock_api(prompt, content, request_id, lang)
         
@@ -3,10 +3,13 @@ B站短链接转换服务
 参考 https://api.suyanw.cn/api/bilibili_short_url.php 的实现
 """
 
-import requests
 import re
 from typing import Optional
 from urllib.parse import urlencode, quote
+
+import httpx
+
+from app.utils.fetch_client import FetchClient
 from app.utils.logger import logger
 
 class BilibiliShortUrlService:
@@ -81,7 +84,7 @@ class BilibiliShortUrlService:
             
             # 调用短链接API
             params = {"url": normalized_url}
-            response = requests.get(
+            response = await FetchClient.get(
                 self.short_url_api,
                 params=params,
                 timeout=self.timeout
@@ -101,7 +104,7 @@ class BilibiliShortUrlService:
                 logger.error(f"短链接API请求失败: {response.status_code}")
                 return None
                 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"短链接API请求异常: {str(e)}")
             return None
         except Exception as e:
@@ -141,7 +144,7 @@ class BilibiliShortUrlService:
         
         try:
             # 使用HEAD请求获取重定向
-            response = requests.head(short_url, allow_redirects=False, timeout=self.timeout)
+            response = await FetchClient.head(short_url, follow_redirects=False, timeout=self.timeout)
             
             if response.status_code in [301, 302]:
                 redirect_url = response.headers.get('Location', '')
@@ -150,10 +153,11 @@ class BilibiliShortUrlService:
                     return redirect_url
             
             # 如果HEAD请求失败，尝试GET请求
-            response = requests.get(short_url, allow_redirects=True, timeout=self.timeout)
-            if 'bilibili.com/video/' in response.url:
-                logger.info(f"短链接解析成功: {short_url} -> {response.url}")
-                return response.url
+            response = await FetchClient.get(short_url, follow_redirects=True, timeout=self.timeout)
+            final_url = str(response.url)
+            if 'bilibili.com/video/' in final_url:
+                logger.info(f"短链接解析成功: {short_url} -> {final_url}")
+                return final_url
                 
         except Exception as e:
             logger.warning(f"短链接解析失败: {short_url}, 错误: {str(e)}")
@@ -0,0 +1,160 @@
+"""
+规范化 URL 索引
+
+同一内容的不同链接写法（YouTube 短链/嵌入/直播链接、B站 b23.tv 短链/手机端链接、
+小宇宙带参数的单集链接等）映射到同一个规范键，重复提交时直接复用已处理完成的文章：
+- 规范键基于 ContentResolver 的解析结果计算，如 youtube:<视频ID>、bilibili:<BV号>、xiaoyuzhou:<单集ID>
+- 本地 SQLite 保存 规范键 -> 最近一次请求ID，命中后再到数据库确认该请求已处理完成
+- 本地索引未命中时，按规范URL写法到数据库查找历史请求，兼容索引建立之前的数据
+"""
+import asyncio
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.repositories.supabase import SupabaseService
+from app.services.bilibili_short_url_service import BilibiliShortUrlService
+from app.utils.logger import logger
+from app.utils.sqlite_store import connect_sqlite
+
+
+class CanonicalUrlIndex:
+    """规范化 URL 索引"""
+
+    YOUTUBE_ID_PATTERN = re.compile(
+        r'(?:youtube\.com/(?:watch\?(?:.*&)?v=|embed/|live/|shorts/|v/)|youtu\.be/)([\w-]{11})'
+    )
+    XIAOYUZHOU_ID_PATTERN = re.compile(r'xiaoyuzhoufm\.com/episode/([0-9a-zA-Z]+)')
+
+    _lock = threading.Lock()
+    _conn: Optional[sqlite3.Connection] = None
+
+    @classmethod
+    def _get_conn(cls) -> sqlite3.Connection:
+        """获取 SQLite 连接，首次调用时建表"""
+        if cls._conn is None:
+            cls._conn = connect_sqlite(settings.URL_INDEX_DB_PATH, ["""
+                CREATE TABLE IF NOT EXISTS url_index (
+                    canonical_key TEXT PRIMARY KEY,
+                    request_id INTEGER NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """])
+        return cls._conn
+
+    @classmethod
+    def _get(cls, canonical_key: str) -> Optional[int]:
+        with cls._lock:
+            row = cls._get_conn().execute(
+                "SELECT request_id FROM url_index WHERE canonical_key = ?", (canonical_key,)
+            ).fetchone()
+            return row[0] if row else None
+
+    @classmethod
+    def _put(cls, canonical_key: str, request_id: int) -> None:
+        with cls._lock:
+            cls._get_conn().execute(
+                "INSERT OR REPLACE INTO url_index (canonical_key, request_id, updated_at) VALUES (?, ?, ?)",
+                (canonical_key, request_id, time.time())
+            )
+
+    @classmethod
+    async def canonical_key(cls, parsed_url: str, original_url: str) -> Optional[Tuple[str, List[str]]]:
+        """计算规范键
+
+        Args:
+            parsed_url: ContentResolver 解析后的URL
+            original_url: ContentResolver 返回的原始URL
+
+        Returns:
+            Optional[Tuple[str, List[str]]]: (规范键, 该内容在数据库中可能的URL写法)，
+                不支持的平台返回 None
+        """
+        urls = [url for url in (parsed_url, original_url) if url]
+
+        for url in urls:
+            match = cls.YOUTUBE_ID_PATTERN.search(url)
+            if match:
+                video_id = match.group(1)
+                return f"youtube:{video_id}", [parsed_url, f"https://www.youtube.com/watch?v={video_id}"]
+
+        for url in urls:
+            match = cls.XIAOYUZHOU_ID_PATTERN.search(url)
+            if match:
+                episode_id = match.group(1)
+                return f"xiaoyuzhou:{episode_id}", [parsed_url, f"https://www.xiaoyuzhoufm.com/episode/{episode_id}"]
+
+        if any('bilibili.com' in url or 'b23.tv' in url for url in urls):
+            service = BilibiliShortUrlService()
+            video_id = None
+            for url in urls:
+                if 'b23.tv' not in url:
+                    video_id = service.extract_video_id(url)
+                    if video_id:
+                        break
+            if not video_id:
+                # 只有短链接时需要解析一次重定向才能拿到 BV 号
+                short_url = next((url for url in urls if 'b23.tv' in url), None)
+                resolved = await service.resolve_short_url(short_url) if short_url else None
+                video_id = service.extract_video_id(resolved) if resolved else None
+            if video_id:
+                return f"bilibili:{video_id}", [parsed_url, f"https://www.bilibili.com/video/{video_id}"]
+
+        return None
+
+    @staticmethod
+    def _to_result(record: Dict) -> Dict:
+        return {"request_id": record['id'], "article_id": record['article_id'], "user_id": record.get('user_id')}
+
+    @classmethod
+    async def find_processed(cls, canonical_key: str, candidate_urls: List[str]) -> Optional[Dict]:
+        """查找同一内容已处理完成的请求
+
+        Args:
+            canonical_key: 规范键
+            candidate_urls: 该内容在数据库中可能的URL写法
+
+        Returns:
+            Optional[Dict]: 包含 request_id、article_id、user_id 的记录，未找到时返回 None
+        """
+        try:
+            request_id = await asyncio.to_thread(cls._get, canonical_key)
+            if request_id:
+                record = await SupabaseService.get_request_status(request_id)
+                if record and record.get('status') == 'processed' and record.get('article_id'):
+                    return cls._to_result(record)
+
+            record = await SupabaseService.find_processed_request_by_urls(list(dict.fromkeys(candidate_urls)))
+            if record:
+                # 回填本地索引，下次直接命中
+                await asyncio.to_thread(cls._put, canonical_key, record['id'])
+                return cls._to_result(record)
+            return None
+
+        except Exception as e:
+            logger.error(f"查询规范化URL索引失败: key={canonical_key}, error={str(e)}")
+            return None
+
+    @classmethod
+    async def record(cls, canonical_key: str, request_id: int) -> None:
+        """记录规范键对应的最新请求，写入失败只记录日志
+
+        Args:
+            canonical_key: 规范键
+            request_id: 请求ID
+        """
+        try:
+            await asyncio.to_thread(cls._put, canonical_key, request_id)
+        except Exception as e:
+            logger.error(f"写入规范化URL索引失败: key={canonical_key}, error={str(e)}")
+
+    @classmethod
+    def close(cls) -> None:
+        """关闭 SQLite 连接"""
+        with cls._lock:
+            if cls._conn is not None:
+                cls._conn.close()
+                cls._conn = None
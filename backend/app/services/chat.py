@@ -1,44 +1,52 @@
-from typing import List, AsyncGenerator
-import json
+import asyncio
+from typing import List, AsyncGenerator, Set
 from uuid import UUID
 from app.services.deepseek import DeepseekService
 from app.repositories.chat import ChatRepository
 from app.repositories.supabase import SupabaseService
+from app.repositories.article_content_cache import ArticleContentCache
 from app.utils.logger import logger
+from app.utils.sse import SSEContentAssembler
 from app.models.chat import ChatMessage, ChatSession, PromptType
 from app.templates.prompts import BASE_CHAT_PROMPT, PROMPT_MAPPING
+from app.services.chat_retrieval import ChatContextRetriever
+
+# 注入检索段落时附加的说明
+EXCERPT_NOTICE = (
+    "(The article is long; the following are the excerpts most relevant to the question, "
+    "in original order, separated by \"...\".)\n\n"
+)
 
 class ChatService:
     def __init__(self):
         self.chat_repository = ChatRepository()
         self.deepseek_service = DeepseekService()
         
-    @staticmethod
-    def _extract_content_from_sse_response(response_chunks: List[str]) -> str:
-        """从 SSE 响应中提取完整的 content"""
-        try:
-            
-            content_parts = []
-            for i, chunk in enumerate(response_chunks):
-                try:
-                    if chunk.startswith('data: '):
-                        data_str = chunk[6:]
-                        if data_str == '[DONE]':
-                            continue
-                        data = json.loads(data_str)
-                        if content := data.get('content'):
-                            content_parts.append(content)
-                except Exception as e:
-                    logger.warning(f"处理响应块失败: {str(e)}, chunk: {chunk}")
-                    continue
-                    
-            final_content = ''.join(content_parts)
-            logger.info(f"最终拼接的内容: {final_content}")  # 打印最终结果
-            return final_content
-            
-        except Exception as e:
-            logger.error(f"提取 content 失败: {str(e)}")
-            return ''
+    # 后台保存消息的任务，持有引用避免被垃圾回收，关闭时等待完成
+    _pending_saves: Set[asyncio.Task] = set()
+
+    def _save_message_in_background(self, session_id: UUID, content: str) -> None:
+        """在后台保存助手消息，不阻塞流式响应的结束"""
+        async def save():
+            try:
+                await self.chat_repository.save_message(
+                    session_id=session_id,
+                    role="assistant",
+                    content=content
+                )
+            except Exception as e:
+                logger.error(f"保存助手消息失败: session_id={session_id}, 错误: {str(e)}", exc_info=True)
+
+        task = asyncio.create_task(save())
+        self._pending_saves.add(task)
+        task.add_done_callback(self._pending_saves.discard)
+
+    @classmethod
+    async def wait_pending_saves(cls) -> None:
+        """等待后台保存消息的任务完成，应用关闭时调用"""
+        if cls._pending_saves:
+            logger.info(f"等待 {len(cls._pending_saves)} 条助手消息保存完成")
+            await asyncio.gather(*cls._pending_saves, return_exceptions=True)
             
     async def process_chat_stream(self, session_id: UUID, prompt_type: PromptType) -> AsyncGenerator[str, None]:
         """处理流式聊天请求"""
@@ -56,28 +64,35 @@ class ChatService:
             if not article_content:
                 raise ValueError(f"Article content not found: article_id={session.article_id}")
             
-            # 4. 构建上下文，传入 prompt_type
+            # 4. 长文章只选取与本轮问题相关的段落，文章较短或检索不到时使用全文
+            question = next((msg.content for msg in reversed(messages) if msg.role == "user"), "")
+            relevant_content = await ChatContextRetriever.select(
+                article_id=session.article_id,
+                content=article_content,
+                query=question,
+                mark_content=session.mark_content
+            )
+            
+            # 5. 构建上下文，传入 prompt_type
             context = self._build_context(
                 session=session,
                 messages=messages,
-                article_content=article_content,
-                prompt_type=prompt_type
+                article_content=relevant_content or article_content,
+                prompt_type=prompt_type,
+                is_excerpt=relevant_content is not None
             )
             
-            # 5. 流式调用 Deepseek API
-            response_chunks = []
+            # 6. 流式调用 Deepseek API，转发的同时增量拼接响应内容
+            assembler = SSEContentAssembler()
             async for chunk in self.deepseek_service.chat_stream(context):
-                response_chunks.append(chunk)
+                assembler.feed(chunk)
                 yield chunk
             
-            # 6. 提取并保存完整响应
-            complete_content = self._extract_content_from_sse_response(response_chunks)
+            # 7. 在后台保存完整响应
+            complete_content = assembler.content
             if complete_content:  # 只在有内容时保存
-                await self.chat_repository.save_message(
-                    session_id=session_id,
-                    role="assistant",
-                    content=complete_content
-                )
+                logger.info(f"助手回复完成: session_id={session_id}, 长度={len(complete_content)}")
+                self._save_message_in_background(session_id, complete_content)
             
         except Exception as e:
             logger.error(f"处理聊天请求失败: {str(e)}", exc_info=True)
@@ -86,6 +101,7 @@ class ChatService:
     async def _get_article_content(self, article_id: int) -> str:
         """获取文章内容
         
+        优先使用进程内缓存；未缓存时只查询内容字段，
         优先从 keep_article_requests.content 获取，
         如果为空则从 keep_articles.content 获取（支持私有文章）。
         
@@ -99,43 +115,50 @@ class ChatService:
             ValueError: 当找不到文章内容时
         """
         try:
-            content = None
-            
-            # 1. 先尝试从 keep_article_requests 获取内容
-            try:
-                request_id = await SupabaseService.get_request_id_by_article_id(article_id)
-                if request_id:
-                    article_request = await SupabaseService.get_article_request(request_id)
-                    if article_request:
-                        content = article_request.get("content")
-                        if content:
-                            logger.info(f"从 article_requests 获取到内容: article_id={article_id}")
-            except Exception as e:
-                logger.warning(f"从 article_requests 获取内容失败，尝试从 articles 获取: {str(e)}")
+            content = ArticleContentCache.get(article_id)
+            if content:
+                return content
             
-            # 2. 如果 article_requests 中没有内容，从 keep_articles 获取（支持私有文章）
-            if not content:
-                article = await SupabaseService.get_article_by_id(article_id)
-                if article:
-                    content = article.get("content")
-                    if content:
-                        logger.info(f"从 articles 获取到内容: article_id={article_id}")
-            
-            # 3. 检查是否获取到内容
-            if not content:
+            generation = ArticleContentCache.generation()
+            result = await SupabaseService.get_article_content(article_id)
+            if not result:
                 raise ValueError(f"文章内容为空: article_id={article_id}")
-                
+            
+            content, request_id = result
+            ArticleContentCache.put(article_id, content, request_id, generation)
+            logger.info(f"获取到文章内容: article_id={article_id}, request_id={request_id}, 长度={len(content)}")
             return content
             
         except Exception as e:
             logger.error(f"获取文章内容失败: {str(e)}", exc_info=True)
             raise
             
-    def _build_context(self, session: ChatSession, messages: List[ChatMessage], article_content: str, prompt_type: PromptType) -> dict:
-        """构建发送给 Deepseek 的上下文"""
+    def _build_context(
+        self,
+        session: ChatSession,
+        messages: List[ChatMessage],
+        article_content: str,
+        prompt_type: PromptType,
+        is_excerpt: bool = False
+    ) -> dict:
+        """构建发送给 Deepseek 的上下文
+        
+        Args:
+            session: 会话信息
+            messages: 历史消息
+            article_content: 文章全文，或检索出的相关段落
+            prompt_type: 提示词类型
+            is_excerpt: article_content 是否为检索出的段落
+        """
         # 根据 prompt_type 获取对应的系统提示
         system_prompt = PROMPT_MAPPING[prompt_type]
         
+        if is_excerpt:
+            article_content = EXCERPT_NOTICE + article_content
+            # 基础对话模板中没有选中内容，一并放入文章内容
+            if session.mark_content and "{mark_content}" not in system_prompt:
+                article_content = f"Currently Selected Content:\n{session.mark_content}\n\n{article_content}"
+        
         # 构建提示信息
         base_prompt = system_prompt.format(
             article_content=article_content,
@@ -0,0 +1,191 @@
+"""
+文章对话的检索式上下文选择
+
+原来每轮对话都把整篇文章内容放进系统提示词，两小时的字幕每个问题就要几十万 token。
+ChatContextRetriever 为每篇文章建立一次段落索引（BM25），每轮只注入与问题最相关的若干段落：
+- 分词：英文和数字按单词，中日韩文字按相邻两字（bigram），不依赖分词库
+- 段落按章节、时间戳和换行边界切分，与分层总结使用同一套切分逻辑
+- 索引按 (文章ID, 内容指纹) 缓存，内容更新后自动重建，按 LRU 淘汰
+- 用户选中的内容（mark_content）所在段落总是保留
+- 文章较短、检索失败或没有命中时仍使用全文
+"""
+import asyncio
+import math
+import re
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.long_summary import split_content
+from app.utils.logger import logger
+
+# 英文单词 / 数字，或连续的中日韩文字
+TOKEN_RE = re.compile(r'[a-z0-9]+|[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]+')
+CJK_RUN_RE = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]')
+
+
+def tokenize(text: str) -> List[str]:
+    """分词：英文和数字按单词，中日韩文字按 bigram
+
+    Args:
+        text: 文本
+
+    Returns:
+        List[str]: 词项列表
+    """
+    tokens: List[str] = []
+    for match in TOKEN_RE.finditer(text.lower()):
+        word = match.group()
+        if not CJK_RUN_RE.match(word):
+            tokens.append(word)
+        elif len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class BM25Index:
+    """段落级 BM25 索引"""
+
+    K1 = 1.5
+    B = 0.75
+
+    def __init__(self, passages: List[str]):
+        """建立索引
+
+        Args:
+            passages: 段落列表
+        """
+        self.passages = passages
+        self._term_freqs: List[Counter] = [Counter(tokenize(passage)) for passage in passages]
+        self._lengths = [sum(freqs.values()) for freqs in self._term_freqs]
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+
+        doc_freqs: Counter = Counter()
+        for freqs in self._term_freqs:
+            doc_freqs.update(freqs.keys())
+        total = len(passages)
+        self._idf: Dict[str, float] = {
+            term: math.log(1 + (total - df + 0.5) / (df + 0.5)) for term, df in doc_freqs.items()
+        }
+
+    def search(self, query: str, top_k: int) -> List[Tuple[int, float]]:
+        """检索与查询最相关的段落
+
+        Args:
+            query: 查询文本
+            top_k: 返回的段落数
+
+        Returns:
+            List[Tuple[int, float]]: (段落序号, 得分)，按得分降序，只包含得分大于 0 的段落
+        """
+        terms = [term for term in set(tokenize(query)) if term in self._idf]
+        if not terms or not self.passages:
+            return []
+
+        scores = []
+        for index, freqs in enumerate(self._term_freqs):
+            norm = self.K1 * (1 - self.B + self.B * self._lengths[index] / (self._avg_length or 1))
+            score = 0.0
+            for term in terms:
+                tf = freqs.get(term)
+                if tf:
+                    score += self._idf[term] * tf * (self.K1 + 1) / (tf + norm)
+            if score > 0:
+                scores.append((index, score))
+        scores.sort(key=lambda item: item[1], reverse=True)
+        return scores[:top_k]
+
+
+class ChatContextRetriever:
+    """按文章缓存段落索引，为每轮对话选择相关段落"""
+
+    # (文章ID, 内容指纹) -> 索引
+    _indexes: "OrderedDict[Tuple[int, int, int], BM25Index]" = OrderedDict()
+    # 正在建立的索引，避免同一篇文章并发重复建立
+    _building: Dict[Tuple[int, int, int], asyncio.Future] = {}
+
+    @classmethod
+    async def get_index(cls, article_id: int, content: str) -> BM25Index:
+        """获取文章的段落索引，不存在时建立并缓存
+
+        Args:
+            article_id: 文章ID
+            content: 文章内容
+
+        Returns:
+            BM25Index: 段落索引
+        """
+        key = (article_id, len(content), hash(content))
+        index = cls._indexes.get(key)
+        if index is not None:
+            cls._indexes.move_to_end(key)
+            return index
+
+        pending = cls._building.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        cls._building[key] = future
+        try:
+            # 长文章切分和分词耗时较长，放到线程中执行
+            index = await asyncio.to_thread(
+                lambda: BM25Index(split_content(content, settings.CHAT_RETRIEVAL_PASSAGE_CHARS))
+            )
+            cls._indexes[key] = index
+            while len(cls._indexes) > settings.CHAT_RETRIEVAL_CACHE_SIZE:
+                cls._indexes.popitem(last=False)
+            logger.info(f"文章段落索引已建立: article_id={article_id}, 段落数={len(index.passages)}")
+            future.set_result(index)
+            return index
+        except BaseException as e:
+            future.set_exception(e)
+            # 没有其他等待者时避免 "Future exception was never retrieved" 警告
+            future.exception()
+            raise
+        finally:
+            cls._building.pop(key, None)
+
+    @classmethod
+    async def select(cls, article_id: int, content: str, query: str, mark_content: Optional[str] = None) -> Optional[str]:
+        """选择与本轮问题最相关的段落
+
+        Args:
+            article_id: 文章ID
+            content: 文章全文
+            query: 检索用的问题文本，通常为最近一条用户消息
+            mark_content: 用户选中的内容，其所在段落总是保留
+
+        Returns:
+            Optional[str]: 按原文顺序拼接的段落；文章较短、未启用或没有命中时返回 None，由调用方使用全文
+        """
+        if not settings.CHAT_RETRIEVAL_ENABLED or len(content) <= settings.CHAT_RETRIEVAL_MIN_CHARS:
+            return None
+        try:
+            index = await cls.get_index(article_id, content)
+            top_k = settings.CHAT_RETRIEVAL_TOP_K
+            selected = {i for i, _ in index.search(query, top_k)} if query else set()
+
+            # 保留选中内容所在的段落（按开头一段文字匹配，避免跨段落时匹配不上）；
+            # 选中内容不在原文中（如来自总结）时，按选中内容另行检索
+            mark_probe = (mark_content or "").strip()[:50]
+            if mark_probe:
+                pinned = {i for i, passage in enumerate(index.passages) if mark_probe in passage}
+                if not pinned:
+                    pinned = {i for i, _ in index.search(mark_content, top_k if not query else max(1, top_k // 2))}
+                selected |= pinned
+
+            if not selected:
+                logger.info(f"未检索到相关段落，使用全文: article_id={article_id}")
+                return None
+
+            logger.info(
+                f"检索到相关段落: article_id={article_id}, "
+                f"{len(selected)}/{len(index.passages)} 段"
+            )
+            return "\n\n...\n\n".join(index.passages[i] for i in sorted(selected))
+        except Exception as e:
+            logger.error(f"检索相关段落失败，使用全文: article_id={article_id}, 错误: {str(e)}")
+            return None
@@ -4,6 +4,7 @@ import re
 from app.utils.logger import logger
 from app.services.coze import CozeService
 from app.repositories.supabase import SupabaseService
+from app.services.llm_cache import llm_cache
 from app.config import settings
 import asyncio
 
@@ -44,12 +45,22 @@ class ContentDetailerService:
             )
             logger.info(f"内容已拆分为 {len(batches)} 个批次")
             
-            # 4. 调用 Coze 接口处理所有批次
-            coze_result = await cls.process_content(
-                batches,
-                language,
-                workflow_id
+            # 4. 调用 Coze 接口处理所有批次，相同工作流、内容和语言的结果直接复用缓存
+            cache_key = llm_cache.make_key(
+                workflow_id, "", json.dumps(batches, ensure_ascii=False), language
             )
+            coze_result = await llm_cache.get("detail", cache_key)
+            if coze_result is not None:
+                logger.info(f"命中分段详述缓存: article_id={article_id}, language={language}")
+            else:
+                coze_result = await cls.process_content(
+                    batches,
+                    language,
+                    workflow_id,
+                    fair_key=str(article_id)
+                )
+                if all(result.get('code') == 0 for result in coze_result):
+                    await llm_cache.set("detail", cache_key, coze_result)
             
             # 6. 保存 Coze 返回结果到请求表
             await SupabaseService.update_detailed_content(
@@ -78,13 +89,14 @@ class ContentDetailerService:
             raise
             
     @staticmethod
-    async def process_content(content: List[str], language: str, workflow_id: str) -> dict:
+    async def process_content(content: List[str], language: str, workflow_id: str, fair_key: str = "default") -> dict:
         """调用 Coze API 处理内容
         
         Args:
             content: 待处理的内容列表
             language: 语言类型
             workflow_id: Coze 工作流 ID
+            fair_key: 公平排队分组，通常为文章ID
             
         Returns:
             dict: Coze API 的响应结果
@@ -92,9 +104,6 @@ class ContentDetailerService:
         try:
             logger.info(f"开始并发调用 Coze API 处理分段详述: language={language}, 段落数={len(content)}")
             
-            # 创建信号量控制并发数
-            semaphore = asyncio.Semaphore(15)
-            
             async def process_single_content(index: int, text: str) -> tuple[int, dict]:
                 """处理单个内容
                 
@@ -105,7 +114,8 @@ class ContentDetailerService:
                 Returns:
                     tuple: (索引, API响应结果)
                 """
-                async with semaphore:
+                # 并发数由所有文章共享的 Coze 限制器控制
+                async with CozeService.limiter.slot(fair_key):
                     try:
                         logger.info(f"开始处理第 {index + 1} 个段落")
                         result = await CozeService.process_detailed_content(text, workflow_id)
@@ -3,14 +3,16 @@ from .base import ContentFetcher, VideoInfo, AuthorInfo
 from app.models.article import ArticleCreate
 from app.config import settings
 import assemblyai as aai
-import requests
 from bs4 import BeautifulSoup
 import json
 import re
 import urllib.parse
+from app.utils.fetch_client import FetchClient
+from app.utils.page_cache import page_cache
 from app.utils.logger import logger
 from datetime import datetime, timedelta
 from app.utils.decorators import retry_decorator
+from .context import memoized
 
 class ApplePodcastFetcher(ContentFetcher):
     """Apple Podcast 内容获取器"""
@@ -118,14 +120,14 @@ class ApplePodcastFetcher(ContentFetcher):
             logger.error(f"获取 Apple Podcast 内容失败: {str(e)}", exc_info=True)
             raise e
             
+    async def _get_page_html(self, url: str) -> str:
+        """下载播客页面 HTML，同一次处理内只下载一次，跨请求的重复下载由网页磁盘缓存处理"""
+        return await memoized("apple.html", url, lambda: page_cache.get_html(url, verify=False, timeout=30))
+
     async def _get_audio_url(self, page_url: str) -> Optional[str]:
         """获取音频文件URL"""
         try:
-            session = requests.Session()
-            response = session.get(page_url, verify=False, timeout=30)
-            response.encoding = 'utf-8'
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(await self._get_page_html(page_url), 'html.parser')
             meta_element = soup.find('script', {'id': 'serialized-server-data'})
             
             if meta_element:
@@ -226,11 +228,7 @@ class ApplePodcastFetcher(ContentFetcher):
         try:
             logger.info(f"开始获取 Apple Podcast 信息: {url}")
             
-            session = requests.Session()
-            response = session.get(url, verify=False, timeout=30)
-            response.encoding = 'utf-8'
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(await self._get_page_html(url), 'html.parser')
             
             # 取标题
             title = ""
@@ -288,7 +286,7 @@ class ApplePodcastFetcher(ContentFetcher):
             thumbnail_url = self._get_thumbnail_url(soup)
             
             # 获取作者头像
-            author_avatar_url = self._get_author_avatar_url(soup)
+            author_avatar_url = await self._get_author_avatar_url(soup)
             
             # 创建 ArticleCreate 对象
             article = ArticleCreate(
@@ -371,7 +369,7 @@ class ApplePodcastFetcher(ContentFetcher):
             logger.error(f"获取缩略图URL失败: {str(e)}")
             return None
 
-    def _get_author_avatar_url(self, soup: BeautifulSoup) -> Optional[str]:
+    async def _get_author_avatar_url(self, soup: BeautifulSoup) -> Optional[str]:
         try:
             logger.info("开始获取作者头像URL")
             
@@ -387,7 +385,7 @@ class ApplePodcastFetcher(ContentFetcher):
                     logger.info(f"获取到作者页面URL: {author_page_url}")
 
                     # 获取作者页面内容
-                    author_response = requests.get(author_page_url, verify=False, timeout=30)
+                    author_response = await FetchClient.get(author_page_url, verify=False, timeout=30)
                     author_response.encoding = 'utf-8'
                     author_soup = BeautifulSoup(author_response.text, 'html.parser')
                     
@@ -4,19 +4,22 @@ B站视频内容获取器
 """
 
 import json
-import requests
 import logging
 import asyncio
-from typing import Optional, Dict, Any, List
+import time
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 from urllib.parse import unquote
 
 from .base import ContentFetcher, VideoInfo
+from .context import memoized
 from app.repositories.prompt_repository import PromptRepository
 from app.utils.decorators import retry_decorator
 from app.models.request import FetchRequest
 from app.models.author import AuthorInfo
 from app.models.article import ArticleCreate
+from app.config import settings
+from app.utils.fetch_client import FetchClient
 from app.utils.logger import logger
 from app.services.bilibili_short_url_service import BilibiliShortUrlService
 from app.services.request_logger import RequestLogger, Steps
@@ -24,6 +27,15 @@ from app.services.request_logger import RequestLogger, Steps
 class BilibilitFetcher(ContentFetcher):
     """B站视频内容获取器"""
     
+    VIEW_API = "https://api.bilibili.com/x/web-interface/view"
+    PAGELIST_API = "https://api.bilibili.com/x/player/pagelist"
+    PLAYER_API = "https://api.bilibili.com/x/player/v2"
+    NAV_API = "https://api.bilibili.com/x/web-interface/nav"
+    
+    # 进程内共享的cookie缓存: (配置内容, 请求头, 验证时间)
+    _cookie_cache: Optional[Tuple[str, Dict[str, str], float]] = None
+    _cookie_lock: Optional[asyncio.Lock] = None
+    
     def __init__(self):
         super().__init__()
         self.platform = "bilibili"
@@ -35,9 +47,13 @@ class BilibilitFetcher(ContentFetcher):
         return self.short_url_service.is_bilibili_url(url)
     
     async def load_cookies(self, request_id: int = 0) -> Optional[Dict[str, str]]:
-        """从数据库加载B站cookie配置，返回headers而不是设置实例变量"""
+        """从数据库加载B站cookie配置，返回headers而不是设置实例变量
+
+        解析并验证后的请求头在进程内缓存：cookie 配置内容未变化且未超过 BILIBILI_COOKIE_TTL 时直接复用，
+        配置更新（提示词缓存刷新）、过期或接口返回未登录时重新解析和验证。
+        """
         try:
-            # 从keep_prompt表获取cookie配置
+            # 从keep_prompt表获取cookie配置（PromptRepository 自带缓存）
             cookie_prompt = await PromptRepository.get_prompt_by_type('cookie-bilbli')
             
             if not cookie_prompt:
@@ -47,48 +63,43 @@ class BilibilitFetcher(ContentFetcher):
                     await RequestLogger.error(request_id, Steps.BILIBILI_COOKIE_LOAD, error_msg, Exception(error_msg))
                 return None
             
-            # 解析cookie数据
-            try:
-                cookies_data = json.loads(cookie_prompt.content)
-            except json.JSONDecodeError:
-                error_msg = "B站cookie配置格式错误，无法解析JSON"
-                logger.error(error_msg)
-                if request_id:
-                    await RequestLogger.error(request_id, Steps.BILIBILI_COOKIE_LOAD, error_msg, Exception(error_msg))
-                return None
-            
-            # 提取关键cookie信息
-            sessdata = None
-            bili_jct = None
-            buvid3 = None
-            dedeuserid = None
-            
-            for cookie in cookies_data:
-                if cookie.get('name') == 'SESSDATA':
-                    sessdata = unquote(cookie.get('value', ''))
-                elif cookie.get('name') == 'bili_jct':
-                    bili_jct = cookie.get('value', '')
-                elif cookie.get('name') == 'buvid3':
-                    buvid3 = cookie.get('value', '')
-                elif cookie.get('name') == 'DedeUserID':
-                    dedeuserid = cookie.get('value', '')
-            
-            # 构建请求头
-            if sessdata and bili_jct:
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                    'Referer': 'https://www.bilibili.com/',
-                    'Cookie': f'SESSDATA={sessdata}; bili_jct={bili_jct}; buvid3={buvid3}; DedeUserID={dedeuserid}'
-                }
+            cached = BilibilitFetcher._cookie_cache
+            if (
+                cached
+                and cached[0] == cookie_prompt.content
+                and time.monotonic() - cached[2] < settings.BILIBILI_COOKIE_TTL
+            ):
+                return dict(cached[1])
+            
+            async with self._get_cookie_lock():
+                # 等待锁期间可能已被其他请求刷新
+                cached = BilibilitFetcher._cookie_cache
+                if (
+                    cached
+                    and cached[0] == cookie_prompt.content
+                    and time.monotonic() - cached[2] < settings.BILIBILI_COOKIE_TTL
+                ):
+                    return dict(cached[1])
                 
-                logger.info("✅ 成功加载B站cookie配置")
-                return headers
-            else:
-                error_msg = "B站cookie配置不完整，缺少关键字段SESSDATA或bili_jct"
-                logger.error(error_msg)
-                if request_id:
-                    await RequestLogger.error(request_id, Steps.BILIBILI_COOKIE_LOAD, error_msg, Exception(error_msg))
-                return None
+                headers, error_msg = self._parse_cookie_headers(cookie_prompt.content)
+                if not headers:
+                    logger.error(error_msg)
+                    if request_id:
+                        await RequestLogger.error(request_id, Steps.BILIBILI_COOKIE_LOAD, error_msg, Exception(error_msg))
+                    return None
+                
+                is_login = await self._validate_cookies(headers)
+                if is_login is False:
+                    # 未登录时不缓存，下次调用重新读取配置；仍然返回请求头，视频信息接口不需要登录
+                    error_msg = "B站cookie已失效（未登录），字幕可能无法获取，请更新 cookie-bilbli 配置"
+                    logger.error(error_msg)
+                    if request_id:
+                        await RequestLogger.error(request_id, Steps.BILIBILI_COOKIE_LOAD, error_msg, Exception(error_msg))
+                    return headers
+                
+                BilibilitFetcher._cookie_cache = (cookie_prompt.content, headers, time.monotonic())
+                logger.info(f"✅ 成功加载B站cookie配置{'' if is_login else '（验证请求失败，暂按有效处理）'}")
+                return dict(headers)
                 
         except Exception as e:
             error_msg = f"加载B站cookie配置失败: {str(e)}"
@@ -97,6 +108,78 @@ class BilibilitFetcher(ContentFetcher):
                 await RequestLogger.error(request_id, Steps.BILIBILI_COOKIE_LOAD, error_msg, e)
             return None
     
+    @classmethod
+    def _get_cookie_lock(cls) -> asyncio.Lock:
+        """获取刷新cookie缓存的锁，并发请求只有一个去解析和验证"""
+        if cls._cookie_lock is None:
+            cls._cookie_lock = asyncio.Lock()
+        return cls._cookie_lock
+    
+    @classmethod
+    def invalidate_cookies(cls):
+        """清除缓存的cookie，下次调用 load_cookies 时重新解析和验证"""
+        cls._cookie_cache = None
+    
+    @staticmethod
+    def _parse_cookie_headers(content: str) -> Tuple[Optional[Dict[str, str]], str]:
+        """解析cookie配置（浏览器导出的 JSON 数组）并构建请求头
+        
+        Args:
+            content: cookie-bilbli 配置内容
+            
+        Returns:
+            Tuple[Optional[Dict[str, str]], str]: (请求头, 错误信息)，解析失败时请求头为 None
+        """
+        try:
+            cookies_data = json.loads(content)
+        except json.JSONDecodeError:
+            return None, "B站cookie配置格式错误，无法解析JSON"
+        
+        # 提取关键cookie信息
+        sessdata = None
+        bili_jct = None
+        buvid3 = None
+        dedeuserid = None
+        
+        for cookie in cookies_data:
+            if cookie.get('name') == 'SESSDATA':
+                sessdata = unquote(cookie.get('value', ''))
+            elif cookie.get('name') == 'bili_jct':
+                bili_jct = cookie.get('value', '')
+            elif cookie.get('name') == 'buvid3':
+                buvid3 = cookie.get('value', '')
+            elif cookie.get('name') == 'DedeUserID':
+                dedeuserid = cookie.get('value', '')
+        
+        if not (sessdata and bili_jct):
+            return None, "B站cookie配置不完整，缺少关键字段SESSDATA或bili_jct"
+        
+        # 构建请求头
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Referer': 'https://www.bilibili.com/',
+            'Cookie': f'SESSDATA={sessdata}; bili_jct={bili_jct}; buvid3={buvid3}; DedeUserID={dedeuserid}'
+        }
+        return headers, ""
+    
+    async def _validate_cookies(self, headers: Dict[str, str]) -> Optional[bool]:
+        """通过导航接口验证cookie是否处于登录状态
+        
+        Returns:
+            Optional[bool]: 已登录返回 True，未登录返回 False，验证请求失败时返回 None
+        """
+        try:
+            response = await FetchClient.get(self.NAV_API, headers=headers, timeout=10)
+            data = response.json()
+            if data.get("code") == 0 and (data.get("data") or {}).get("isLogin"):
+                return True
+            if data.get("code") == -101 or (data.get("data") or {}).get("isLogin") is False:
+                return False
+            logger.warning(f"B站cookie验证返回异常: code={data.get('code')}, message={data.get('message')}")
+        except Exception as e:
+            logger.warning(f"B站cookie验证请求失败: {str(e)}")
+        return None
+    
     async def extract_bv_id(self, video_url: str, request_id: int = 0) -> str:
         """从URL中提取BV号，支持短链接"""
         # 如果是短链接，先解析为长链接
@@ -221,10 +304,20 @@ class BilibilitFetcher(ContentFetcher):
             return None
     
     async def get_video_info(self, url: str, request_id: int = 0) -> Optional[VideoInfo]:
-        """获取B站视频基本信息和字幕"""
+        """获取B站视频基本信息和字幕，同一次处理内只请求一次"""
+        return await memoized("bilibili.video_info", url, lambda: self._request_video_info(url, request_id))
+
+    async def _request_video_info(self, url: str, request_id: int = 0) -> Optional[VideoInfo]:
+        """获取B站视频基本信息和字幕
+        
+        cookie 加载与 BV 号提取并发执行；之后视频信息接口与 分页 -> 播放器 -> 字幕 链路并发执行，
+        视频信息获取失败时取消字幕链路。
+        """
         try:
-            # 使用新的cookie加载逻辑
-            headers = await self.load_cookies(request_id)
+            headers, bv_id = await asyncio.gather(
+                self.load_cookies(request_id),
+                self.extract_bv_id(url, request_id)
+            )
             if not headers:
                 error_msg = "无法加载B站cookie配置"
                 logger.error(error_msg)
@@ -232,7 +325,6 @@ class BilibilitFetcher(ContentFetcher):
                     await RequestLogger.error(request_id, Steps.BILIBILI_COOKIE_LOAD, error_msg, Exception(error_msg))
                 return None
             
-            bv_id = await self.extract_bv_id(url, request_id)
             if not bv_id:
                 error_msg = f"无法提取BV号: {url}"
                 logger.error(error_msg)
@@ -242,33 +334,30 @@ class BilibilitFetcher(ContentFetcher):
             
             logger.info(f"📋 开始处理视频: BV={bv_id}, 原始URL={url}")
             
-            # Step 1: 获取视频基本信息
-            video_info_url = f"https://api.bilibili.com/x/web-interface/view?bvid={bv_id}"
-            logger.info(f"📡 请求视频信息API: {video_info_url}")
-            
-            response = requests.get(video_info_url, headers=headers)
-            
-            if response.status_code != 200:
-                error_msg = f"获取B站视频信息失败: HTTP {response.status_code}, URL={video_info_url}"
-                logger.error(error_msg)
-                if request_id:
-                    await RequestLogger.error(request_id, Steps.BILIBILI_VIDEO_API, error_msg, Exception(error_msg))
-                return None
-            
-            video_data = response.json()
-            if video_data.get("code") != 0:
-                error_msg = f"B站视频API返回错误: {video_data.get('message')}, BV={bv_id}"
-                logger.error(error_msg)
-                if request_id:
-                    await RequestLogger.error(request_id, Steps.BILIBILI_VIDEO_API, error_msg, Exception(error_msg))
-                return None
-            
-            video_info = video_data["data"]
+            # Step 2: 字幕链路不依赖视频信息接口，提前开始
+            subtitle_task = asyncio.create_task(self._fetch_subtitle_content(bv_id, headers, request_id))
+            try:
+                # Step 1: 获取视频基本信息
+                video_info = await self._fetch_view(bv_id, headers, request_id)
+                if video_info is None:
+                    return None
+                
+                # 严格验证BV号匹配，确保获取的是正确视频的信息
+                returned_bv_id = video_info.get('bvid', '')
+                logger.info(f"🔢 BV号验证: 请求={bv_id}, API返回={returned_bv_id or 'N/A'}")
+                if returned_bv_id and returned_bv_id != bv_id:
+                    logger.error(f"❌ BV号不匹配! 请求: {bv_id}, 返回: {returned_bv_id}")
+                    raise Exception(f"BV号验证失败: 请求{bv_id}但返回{returned_bv_id}")
+                
+                subtitle_content = await subtitle_task
+            finally:
+                # 视频信息获取失败时取消字幕链路（已完成时无影响）
+                subtitle_task.cancel()
+                await asyncio.gather(subtitle_task, return_exceptions=True)
             
             # 提取基本信息
             title = video_info.get('title', '未知标题')
             desc = video_info.get('desc', '')
-            duration = video_info.get('duration', 0)
             pic = video_info.get('pic', '')
             pubdate = video_info.get('pubdate', 0)
             publish_date = datetime.fromtimestamp(pubdate) if pubdate else None
@@ -281,134 +370,6 @@ class BilibilitFetcher(ContentFetcher):
             
             logger.info(f"🎬 视频标题: {title}")
             logger.info(f"👤 作者: {author_name}")
-            logger.info(f"🔢 BV号验证: 请求={bv_id}, API返回={video_info.get('bvid', 'N/A')}")
-            
-            # 严格验证BV号匹配，确保获取的是正确视频的信息
-            returned_bv_id = video_info.get('bvid', '')
-            if returned_bv_id and returned_bv_id != bv_id:
-                logger.error(f"❌ BV号不匹配! 请求: {bv_id}, 返回: {returned_bv_id}")
-                raise Exception(f"BV号验证失败: 请求{bv_id}但返回{returned_bv_id}")
-            
-            # Step 2: 获取字幕内容 - 参考test_bilibili_chinese_subtitles.py的逻辑
-            subtitle_content = ""
-            pages = video_info.get("pages", [])
-            
-            if pages:
-                logger.info(f"📄 视频共有 {len(pages)} 个分页")
-                
-                # 只处理第一个分页
-                first_page = pages[0]
-                cid = first_page['cid']
-                part_title = first_page.get('part', '默认分页')
-                
-                logger.info(f"🎯 处理分页1: {part_title} (CID: {cid})")
-                
-                # 获取播放器信息（包含字幕信息）- 与参考代码保持一致
-                logger.info(f"📝 获取播放器信息和字幕列表...")
-                player_url = f"https://api.bilibili.com/x/player/v2"
-                player_params = {"bvid": bv_id, "cid": cid}
-                
-                player_response = requests.get(player_url, headers=headers, params=player_params)
-                if player_response.status_code != 200:
-                    error_msg = f"获取B站播放器信息失败: HTTP {player_response.status_code}, BV={bv_id}, CID={cid}"
-                    logger.error(error_msg)
-                    if request_id:
-                        await RequestLogger.error(request_id, Steps.BILIBILI_PLAYER_API, error_msg, Exception(error_msg))
-                    raise Exception(error_msg)
-                
-                player_data = player_response.json()
-                if player_data.get("code") != 0:
-                    error_msg = f"B站播放器API返回错误: {player_data.get('message')}, BV={bv_id}, CID={cid}"
-                    logger.error(error_msg)
-                    if request_id:
-                        await RequestLogger.error(request_id, Steps.BILIBILI_PLAYER_API, error_msg, Exception(error_msg))
-                    raise Exception(error_msg)
-                
-                # 检查字幕信息 - 完全按照参考代码的逻辑
-                subtitle_info = player_data.get("data", {}).get("subtitle", {})
-                subtitles = subtitle_info.get("subtitles", [])
-                
-                logger.info(f"🌐 找到 {len(subtitles)} 个字幕")
-                
-                if subtitles:
-                    # 查找并下载中文字幕 - 按照参考代码的逻辑
-                    chinese_subtitles = []
-                    for subtitle in subtitles:
-                        lan = subtitle.get('lan', 'unknown')
-                        lan_doc = subtitle.get('lan_doc', '未知语言')
-                        
-                        if self.is_chinese_subtitle(lan, lan_doc):
-                            chinese_subtitles.append(subtitle)
-                            logger.info(f"  ✅ 找到中文字幕: {lan_doc} ({lan})")
-                        else:
-                            logger.info(f"  ⏭️ 跳过非中文字幕: {lan_doc} ({lan})")
-                    
-                    if chinese_subtitles:
-                        # 使用第一个中文字幕
-                        subtitle = chinese_subtitles[0]
-                        lan = subtitle.get('lan', 'unknown')
-                        lan_doc = subtitle.get('lan_doc', '未知语言')
-                        subtitle_url = subtitle.get('subtitle_url', '')
-                        
-                        logger.info(f"📄 使用中文字幕: {lan_doc} ({lan})")
-                        logger.info(f"🔗 字幕URL: {subtitle_url}")
-                        
-                        if subtitle_url:
-                            try:
-                                # 确保URL是完整的 - 与参考代码一致
-                                if subtitle_url.startswith("//"):
-                                    subtitle_url = "https:" + subtitle_url
-                                elif not subtitle_url.startswith("http"):
-                                    subtitle_url = "https://" + subtitle_url
-                                
-                                logger.info(f"📥 下载字幕内容...")
-                                subtitle_response = requests.get(subtitle_url, headers=headers, timeout=10)
-                                
-                                if subtitle_response.status_code == 200:
-                                    subtitle_data = json.loads(subtitle_response.text)
-                                    logger.info(f"📄 字幕数据解析成功，keys: {list(subtitle_data.keys())}")
-                                    
-                                    if "body" in subtitle_data and subtitle_data["body"]:
-                                        # 提取所有字幕文本 - 与参考代码逻辑一致
-                                        subtitle_texts = []
-                                        for item in subtitle_data["body"]:
-                                            content = item.get("content", "").strip()
-                                            if content:
-                                                subtitle_texts.append(content)
-                                        
-                                        subtitle_content = " ".join(subtitle_texts)
-                                        
-                                        # 简单的质量检查 - 调整为更宽松的标准
-                                        if len(subtitle_content) > 20:  # 降低基本长度要求
-                                            logger.info(f"✅ 成功获取中文字幕: 共 {len(subtitle_data['body'])} 行，总字符数: {len(subtitle_content)}")
-                                        else:
-                                            logger.warning(f"⚠️ 字幕内容过短: {len(subtitle_content)} 字符，但仍然使用")
-                                            # 即使内容较短也使用，因为可能是API返回的简化版本
-                                    else:
-                                        logger.warning(f"⚠️ 字幕数据格式异常: 缺少body字段或body为空")
-                                else:
-                                    error_msg = f"B站字幕下载失败: HTTP {subtitle_response.status_code}, URL={subtitle_url}, BV={bv_id}"
-                                    logger.error(f"❌ {error_msg}")
-                                    if request_id:
-                                        await RequestLogger.error(request_id, Steps.BILIBILI_SUBTITLE_DOWNLOAD, error_msg, Exception(error_msg))
-                            except Exception as e:
-                                error_msg = f"处理B站字幕异常: {str(e)}, BV={bv_id}, URL={subtitle_url}"
-                                logger.error(f"❌ {error_msg}")
-                                if request_id:
-                                    await RequestLogger.error(request_id, Steps.BILIBILI_SUBTITLE_DOWNLOAD, error_msg, e)
-                        else:
-                            logger.warning(f"⚠️ 字幕URL为空")
-                    else:
-                        logger.warning(f"⚠️ 未找到中文字幕")
-                else:
-                    logger.warning(f"⚠️ 该视频没有字幕")
-                    
-                # 如果没有获取到字幕内容，记录警告但不抛出异常
-                if not subtitle_content:
-                    logger.warning(f"⚠️ 未能获取到字幕内容 (BV={bv_id})，但不影响其他内容获取")
-            else:
-                logger.error(f"❌ 视频没有分页信息 (BV={bv_id})")
-                raise Exception(f"视频没有可用的分页信息: {bv_id}")
             
             # 构建作者信息 - 确保头像URL有效
             author = {
@@ -448,6 +409,219 @@ class BilibilitFetcher(ContentFetcher):
                 await RequestLogger.error(request_id, Steps.VIDEO_INFO_FETCH, error_msg, e)
             return None
     
+    async def _fetch_view(self, bv_id: str, headers: Dict[str, str], request_id: int = 0) -> Optional[Dict[str, Any]]:
+        """请求视频信息接口
+        
+        Returns:
+            Optional[Dict[str, Any]]: 接口返回的 data，失败时返回 None
+        """
+        video_info_url = f"{self.VIEW_API}?bvid={bv_id}"
+        logger.info(f"📡 请求视频信息API: {video_info_url}")
+        
+        response = await FetchClient.get(video_info_url, headers=headers)
+        
+        if response.status_code != 200:
+            error_msg = f"获取B站视频信息失败: HTTP {response.status_code}, URL={video_info_url}"
+            logger.error(error_msg)
+            if request_id:
+                await RequestLogger.error(request_id, Steps.BILIBILI_VIDEO_API, error_msg, Exception(error_msg))
+            return None
+        
+        video_data = response.json()
+        if video_data.get("code") != 0:
+            if video_data.get("code") == -101:
+                self.invalidate_cookies()
+            error_msg = f"B站视频API返回错误: {video_data.get('message')}, BV={bv_id}"
+            logger.error(error_msg)
+            if request_id:
+                await RequestLogger.error(request_id, Steps.BILIBILI_VIDEO_API, error_msg, Exception(error_msg))
+            return None
+        
+        return video_data["data"]
+    
+    async def _fetch_subtitle_content(self, bv_id: str, headers: Dict[str, str], request_id: int = 0) -> str:
+        """获取第一个分页的字幕文本：分页列表 -> 播放器信息 -> 字幕下载
+        
+        Returns:
+            str: 字幕文本，没有可用字幕时返回空字符串
+            
+        Raises:
+            Exception: 没有分页信息或播放器接口失败
+        """
+        pagelist_response = await FetchClient.get(self.PAGELIST_API, headers=headers, params={"bvid": bv_id})
+        pages = []
+        if pagelist_response.status_code == 200:
+            pagelist_data = pagelist_response.json()
+            if pagelist_data.get("code") == 0:
+                pages = pagelist_data.get("data") or []
+        
+        if not pages:
+            logger.error(f"❌ 视频没有分页信息 (BV={bv_id})")
+            raise Exception(f"视频没有可用的分页信息: {bv_id}")
+        
+        logger.info(f"📄 视频共有 {len(pages)} 个分页")
+        
+        # 只处理第一个分页
+        first_page = pages[0]
+        cid = first_page['cid']
+        part_title = first_page.get('part', '默认分页')
+        
+        logger.info(f"🎯 处理分页1: {part_title} (CID: {cid})")
+        
+        # 获取播放器信息（包含字幕信息）
+        logger.info(f"📝 获取播放器信息和字幕列表...")
+        player_params = {"bvid": bv_id, "cid": cid}
+        
+        player_response = await FetchClient.get(self.PLAYER_API, headers=headers, params=player_params)
+        if player_response.status_code != 200:
+            error_msg = f"获取B站播放器信息失败: HTTP {player_response.status_code}, BV={bv_id}, CID={cid}"
+            logger.error(error_msg)
+            if request_id:
+                await RequestLogger.error(request_id, Steps.BILIBILI_PLAYER_API, error_msg, Exception(error_msg))
+            raise Exception(error_msg)
+        
+        player_data = player_response.json()
+        if player_data.get("code") != 0:
+            if player_data.get("code") == -101:
+                self.invalidate_cookies()
+            error_msg = f"B站播放器API返回错误: {player_data.get('message')}, BV={bv_id}, CID={cid}"
+            logger.error(error_msg)
+            if request_id:
+                await RequestLogger.error(request_id, Steps.BILIBILI_PLAYER_API, error_msg, Exception(error_msg))
+            raise Exception(error_msg)
+        
+        subtitle_info = player_data.get("data", {}).get("subtitle", {})
+        subtitles = subtitle_info.get("subtitles", [])
+        
+        logger.info(f"🌐 找到 {len(subtitles)} 个字幕")
+        
+        if not subtitles:
+            logger.warning(f"⚠️ 该视频没有字幕")
+            subtitle_content = ""
+        else:
+            subtitle_content = await self._download_best_subtitle(subtitles, headers, bv_id, request_id)
+        
+        # 如果没有获取到字幕内容，记录警告但不抛出异常
+        if not subtitle_content:
+            logger.warning(f"⚠️ 未能获取到字幕内容 (BV={bv_id})，但不影响其他内容获取")
+        return subtitle_content
+    
+    def _rank_subtitles(self, subtitles: List[Dict]) -> List[Dict]:
+        """字幕排序：中文字幕优先，同类按接口返回的顺序"""
+        ranked = []
+        for subtitle in subtitles:
+            lan = subtitle.get('lan', 'unknown')
+            lan_doc = subtitle.get('lan_doc', '未知语言')
+            is_chinese = self.is_chinese_subtitle(lan, lan_doc)
+            logger.info(f"  {'✅ 中文字幕' if is_chinese else '⏬ 非中文字幕（备选）'}: {lan_doc} ({lan})")
+            ranked.append((not is_chinese, subtitle))
+        ranked.sort(key=lambda item: item[0])
+        return [subtitle for _, subtitle in ranked]
+    
+    async def _download_subtitle(self, subtitle: Dict, headers: Dict[str, str]) -> str:
+        """下载单个字幕并拼接为文本
+        
+        Raises:
+            Exception: 下载失败
+        """
+        lan_doc = subtitle.get('lan_doc', '未知语言')
+        subtitle_url = subtitle.get('subtitle_url', '')
+        if not subtitle_url:
+            logger.warning(f"⚠️ 字幕URL为空: {lan_doc}")
+            return ""
+        
+        # 确保URL是完整的
+        if subtitle_url.startswith("//"):
+            subtitle_url = "https:" + subtitle_url
+        elif not subtitle_url.startswith("http"):
+            subtitle_url = "https://" + subtitle_url
+        
+        logger.info(f"📥 下载字幕内容: {lan_doc}, URL={subtitle_url}")
+        subtitle_response = await FetchClient.get(subtitle_url, headers=headers, timeout=10)
+        if subtitle_response.status_code != 200:
+            raise Exception(f"HTTP {subtitle_response.status_code}, URL={subtitle_url}")
+        
+        subtitle_data = json.loads(subtitle_response.text)
+        if not subtitle_data.get("body"):
+            logger.warning(f"⚠️ 字幕数据格式异常: 缺少body字段或body为空 ({lan_doc})")
+            return ""
+        
+        # 提取所有字幕文本
+        subtitle_texts = []
+        for item in subtitle_data["body"]:
+            content = item.get("content", "").strip()
+            if content:
+                subtitle_texts.append(content)
+        
+        logger.info(f"📄 字幕下载完成: {lan_doc}, 共 {len(subtitle_data['body'])} 行")
+        return " ".join(subtitle_texts)
+    
+    async def _download_best_subtitle(
+        self,
+        subtitles: List[Dict],
+        headers: Dict[str, str],
+        bv_id: str,
+        request_id: int = 0
+    ) -> str:
+        """并发下载所有字幕，按排序选出第一个合格的字幕，并取消其余下载
+        
+        排在前面的字幕都已下载完成且不合格（失败或 is_high_quality_subtitle 为 False）时，
+        第一个合格的字幕胜出；都不合格时使用排名最靠前的非空字幕（内容较短也使用）。
+        
+        Returns:
+            str: 字幕文本，全部失败时返回空字符串
+        """
+        ranked = self._rank_subtitles(subtitles)
+        tasks = [asyncio.create_task(self._download_subtitle(subtitle, headers)) for subtitle in ranked]
+        # 各字幕的下载结果，None 表示尚未完成，失败时为空字符串
+        contents: List[Optional[str]] = [None] * len(tasks)
+        errors: List[str] = []
+        
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index = tasks.index(task)
+                    if task.exception() is not None:
+                        contents[index] = ""
+                        errors.append(f"{ranked[index].get('lan_doc', '未知语言')}: {str(task.exception())}")
+                        logger.warning(f"⚠️ 字幕下载失败: {errors[-1]}")
+                    else:
+                        contents[index] = task.result()
+                
+                for index, content in enumerate(contents):
+                    if content is None:
+                        # 排在前面的字幕还没下载完成
+                        break
+                    if self.is_high_quality_subtitle(content):
+                        subtitle = ranked[index]
+                        logger.info(
+                            f"✅ 使用字幕: {subtitle.get('lan_doc', '未知语言')} ({subtitle.get('lan', 'unknown')})，"
+                            f"总字符数: {len(content)}，取消其余 {len(pending)} 个下载"
+                        )
+                        return content
+            
+            for index, content in enumerate(contents):
+                if content:
+                    subtitle = ranked[index]
+                    logger.warning(
+                        f"⚠️ 没有高质量字幕，使用: {subtitle.get('lan_doc', '未知语言')} "
+                        f"({subtitle.get('lan', 'unknown')})，总字符数: {len(content)}"
+                    )
+                    return content
+            
+            if errors:
+                error_msg = f"B站字幕下载失败: {'; '.join(errors)}, BV={bv_id}"
+                logger.error(f"❌ {error_msg}")
+                if request_id:
+                    await RequestLogger.error(request_id, Steps.BILIBILI_SUBTITLE_DOWNLOAD, error_msg, Exception(error_msg))
+            return ""
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
     async def get_chapters(self, url: str) -> Optional[str]:
         """获取视频章节信息 - B站暂不支持"""
         return None
@@ -0,0 +1,108 @@
+"""
+单次处理内的上游请求记忆化
+
+同一篇文章的处理过程中，get_video_info、get_chapters、get_author_info、fetch
+会多次访问同一个上游资源（SerpAPI 视频信息、网页 HTML、字幕等）。
+FetchContext 记录本次处理内已经获取到的结果：
+- 通过 contextvar 传递，ContentFetcherService 的每个方法执行期间生效，不需要修改各获取器的方法签名
+- 并发的相同请求只发出一次，其余调用等待同一个结果
+- 只缓存非空结果；失败或返回 None 时不缓存，后续调用（含重试）会重新请求
+- 不在任何 FetchContext 内调用时直接请求，行为与原来一致
+"""
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+from app.utils.logger import logger
+
+# 请求失败时通知等待者自行重新请求
+_FAILED = object()
+
+_current_context: ContextVar[Optional["FetchContext"]] = ContextVar("fetch_context", default=None)
+
+
+class FetchContext:
+    """单次文章处理的上游请求结果缓存"""
+
+    def __init__(self):
+        self._values: Dict[Tuple[str, str], Any] = {}
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def memoize(self, namespace: str, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """获取资源，本次处理内已获取过时直接返回
+
+        Args:
+            namespace: 资源类型，如 'youtube.serpapi'、'webpage.html'
+            key: 资源标识，如视频ID、URL
+            factory: 实际发起请求的无参异步函数
+
+        Returns:
+            Any: factory 的返回值
+        """
+        cache_key = (namespace, key)
+        if cache_key in self._values:
+            self.hits += 1
+            logger.info(f"复用本次处理已获取的资源: {namespace} {key}")
+            return self._values[cache_key]
+
+        pending = self._inflight.get(cache_key)
+        if pending is not None:
+            value = await asyncio.shield(pending)
+            if value is not _FAILED:
+                self.hits += 1
+                return value
+            # 首个请求失败，由当前调用自行重试
+            return await factory()
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            value = await factory()
+        except BaseException:
+            future.set_result(_FAILED)
+            raise
+        else:
+            if value is not None:
+                self._values[cache_key] = value
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(cache_key, None)
+
+
+@contextmanager
+def use_fetch_context(context: FetchContext) -> Iterator[FetchContext]:
+    """在当前协程内启用指定的 FetchContext
+
+    Args:
+        context: 要启用的上下文
+
+    Yields:
+        FetchContext: 传入的上下文
+    """
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
+
+
+async def memoized(namespace: str, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+    """在当前 FetchContext 内记忆化一次上游请求，没有上下文时直接请求
+
+    Args:
+        namespace: 资源类型
+        key: 资源标识
+        factory: 实际发起请求的无参异步函数
+
+    Returns:
+        Any: factory 的返回值
+    """
+    context = _current_context.get()
+    if context is None:
+        return await factory()
+    return await context.memoize(namespace, key, factory)
@@ -1,39 +1,44 @@
 from typing import Optional, List, Dict
-from .youtube import YouTubeFetcher
-from .xiaoyuzhou import XiaoYuZhouFetcher
-from .base import VideoInfo
-from .apple import ApplePodcastFetcher
-from .webpage import WebPageFetcher
+from .base import ContentFetcher, VideoInfo
 from .file import FileFetcher
-from .wechat import WeChatFetcher
-from .bilibili import BilibilitFetcher
+from .context import FetchContext, use_fetch_context
+from app.services.platform_registry import PlatformRegistry
 from app.utils.logger import logger
 from app.models.request import FetchRequest
 from app.models.author import AuthorInfo
 
 class ContentFetcherService:
-    """内容获取服务"""
+    """内容获取服务
+
+    同一个服务实例的各方法共享一个 FetchContext，
+    同一篇文章处理过程中每个上游资源只请求一次。
+    获取器从共享的路由表中查找，每个 URL 在服务实例内只查找一次。
+    """
     def __init__(self, request: Optional[FetchRequest] = None):
         self.request = request
-        self.fetchers = [
-            FileFetcher(),
-            WeChatFetcher(),
-            BilibilitFetcher(),
-            YouTubeFetcher(),
-            XiaoYuZhouFetcher(),
-            ApplePodcastFetcher(),
-            WebPageFetcher()
-        ]
+        self.context = FetchContext()
+        self.registry = PlatformRegistry.default()
+        self._bound: Dict[str, Optional[ContentFetcher]] = {}
+
+    def _fetcher_for(self, url: str) -> Optional[ContentFetcher]:
+        """获取负责该 URL 的获取器，结果绑定到当前服务实例"""
+        if url not in self._bound:
+            route = self.registry.fetcher_route(url)
+            self._bound[url] = route.fetcher if route else None
+            if route:
+                logger.info(f"URL 由 {route.name} 获取器处理: {url}")
+        return self._bound[url]
     
     async def fetch_content(self, url: str) -> Optional[str]:
         """获取内容"""
         try:
-            for fetcher in self.fetchers:
-                if fetcher.can_handle(url):
-                    if isinstance(fetcher, FileFetcher) and self.request and self.request.content:
-                        return await fetcher.fetch(url, self.request)
-                    return await fetcher.fetch(url)
-            return None
+            with use_fetch_context(self.context):
+                fetcher = self._fetcher_for(url)
+                if fetcher is None:
+                    return None
+                if isinstance(fetcher, FileFetcher) and self.request and self.request.content:
+                    return await fetcher.fetch(url, self.request)
+                return await fetcher.fetch(url)
         except Exception as e:
             logger.error(f"获取内容失败: {str(e)}", exc_info=True)
             return None
@@ -41,10 +46,9 @@ class ContentFetcherService:
     async def get_video_info(self, url: str) -> Optional[VideoInfo]:
         """获取视频信息"""
         try:
-            for fetcher in self.fetchers:
-                if fetcher.can_handle(url):
-                    return await fetcher.get_video_info(url)
-            return None
+            with use_fetch_context(self.context):
+                fetcher = self._fetcher_for(url)
+                return await fetcher.get_video_info(url) if fetcher else None
         except Exception as e:
             logger.error(f"获取视频信息失败: {str(e)}", exc_info=True)
             return None
@@ -52,10 +56,9 @@ class ContentFetcherService:
     async def get_chapters(self, url: str) -> Optional[str]:
         """获取视频章节信息"""
         try:
-            for fetcher in self.fetchers:
-                if fetcher.can_handle(url):
-                    return await fetcher.get_chapters(url)
-            return None
+            with use_fetch_context(self.context):
+                fetcher = self._fetcher_for(url)
+                return await fetcher.get_chapters(url) if fetcher else None
         except Exception as e:
             logger.error(f"获取视频章节信息失败: {str(e)}", exc_info=True)
             return None
@@ -63,10 +66,9 @@ class ContentFetcherService:
     async def get_author_info(self, url: str) -> Optional[AuthorInfo]:
         """获取作者信息"""
         try:
-            for fetcher in self.fetchers:
-                if fetcher.can_handle(url):
-                    return await fetcher.get_author_info(url)
-            return None
+            with use_fetch_context(self.context):
+                fetcher = self._fetcher_for(url)
+                return await fetcher.get_author_info(url) if fetcher else None
         except Exception as e:
             logger.error(f"获取作者信息失败: {str(e)}", exc_info=True)
             return None 
\ No newline at end of file
@@ -0,0 +1,250 @@
+"""
+基于文本密度的网页正文提取
+
+原来的提取方式对每个 div / article / section / main 调用 get_text() 和 str(element)，
+嵌套的容器会被重复遍历和序列化，大页面上耗时随嵌套深度成倍增长。
+TextDensityExtractor 在 lxml 解析树上自底向上遍历一次，为每个节点累加：
+- 文本长度：与 get_text(strip=True) 的长度相同
+- 标记长度：与 BeautifulSoup 序列化结果 str(element) 的长度相同
+据此计算文本密度并选出正文容器，选择规则和输出与原来的提取方式一致。
+"""
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+import lxml.html
+from lxml import etree
+
+from app.utils.logger import logger
+
+# 参与正文容器评分的标签
+CONTAINER_TAGS = frozenset({'div', 'article', 'section', 'main'})
+# 正文容器中提取的段落和标题
+BLOCK_TAGS = ('p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+# class / id 中包含这些词的容器不是正文
+INVALID_PATTERNS = (
+    'nav', 'footer', 'header', 'menu', 'sidebar', 'ad',
+    'comment', 'social', 'related', 'share', 'cookie',
+    'popup', 'banner', 'copyright', 'tracking', 'search',
+    'newsletter', 'subscribe'
+)
+# 提取时忽略的标签（其后的文本仍然保留）
+REMOVED_TAGS = frozenset({'script', 'style'})
+# BeautifulSoup 保留空白的标签，其他位置只含空白的文本序列化为单个换行或空格
+PRESERVE_WHITESPACE_TAGS = frozenset({'pre', 'textarea'})
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+# BeautifulSoup 不计入 get_text() 的文本所在的标签
+TEXT_EXCLUDED_TAGS = frozenset({'rt', 'rp', 'template'})
+# BeautifulSoup 序列化为 <tag/> 的空元素
+VOID_TAGS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'menuitem',
+    'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound', 'command', 'frame',
+    'image', 'isindex', 'nextid', 'spacer'
+})
+# BeautifulSoup 按空白拆分后以单个空格重新拼接的属性
+LIST_ATTRIBUTES = {
+    '*': frozenset({'class', 'accesskey', 'dropzone'}),
+    'a': frozenset({'rel', 'rev'}),
+    'link': frozenset({'rel', 'rev'}),
+    'td': frozenset({'headers'}),
+    'th': frozenset({'headers'}),
+    'form': frozenset({'accept-charset'}),
+    'object': frozenset({'archive'}),
+    'area': frozenset({'rel'}),
+    'icon': frozenset({'sizes'}),
+    'iframe': frozenset({'sandbox'}),
+    'output': frozenset({'for'}),
+}
+ESCAPED_CHARS_RE = re.compile(r'[&<>]')
+NON_WHITESPACE_RE = re.compile(r'\S+')
+
+
+def _escaped_length(text: Optional[str]) -> int:
+    """文本按 minimal 规则转义（& < > 转为实体）后的长度"""
+    if not text:
+        return 0
+    length = len(text)
+    for char in ESCAPED_CHARS_RE.findall(text):
+        length += 4 if char == '&' else 3
+    return length
+
+
+def _markup_text_length(text: Optional[str], preserve_whitespace: bool) -> int:
+    """文本在 BeautifulSoup 序列化结果中的长度：只含 ASCII 空白的文本被折叠为一个字符"""
+    if not text:
+        return 0
+    if not preserve_whitespace and not text.strip(ASCII_SPACES):
+        return 1
+    return _escaped_length(text)
+
+
+def _stripped_length(text: Optional[str]) -> int:
+    return len(text.strip()) if text else 0
+
+
+def _attribute_length(tag: str, name: str, value: str) -> int:
+    """属性序列化为 ' name="value"' 后的长度"""
+    if name in LIST_ATTRIBUTES['*'] or name in LIST_ATTRIBUTES.get(tag, ()):
+        value = ' '.join(NON_WHITESPACE_RE.findall(value))
+    length = _escaped_length(value)
+    if '"' in value and "'" in value:
+        # 两种引号都有时双引号转为 &quot;
+        length += 5 * value.count('"')
+    return len(name) + length + 4
+
+
+class TextDensityExtractor:
+    """单次遍历的正文提取器"""
+
+    def __init__(self, clean_text: Callable[[str], str]):
+        """
+        Args:
+            clean_text: 段落文本的清理函数
+        """
+        self.clean_text = clean_text
+
+    @staticmethod
+    def parse(html: str) -> etree._Element:
+        """用 lxml 解析 HTML
+
+        script / style 不从树中删除（删除会把前后的文本合并，改变空白折叠的结果），遍历时跳过。
+        """
+        parser = lxml.html.HTMLParser(encoding='utf-8')
+        return lxml.html.document_fromstring(html.encode('utf-8', errors='replace'), parser=parser)
+
+    @staticmethod
+    def _is_valid_container(element: etree._Element, text_length: int) -> bool:
+        """容器可见、class / id 不像导航或广告，且有足够的文本"""
+        style = (element.get('style') or '').lower()
+        if 'display: none' in style or 'visibility: hidden' in style:
+            return False
+        for attr in ('class', 'id'):
+            value = element.get(attr)
+            if value:
+                value = ' '.join(NON_WHITESPACE_RE.findall(value)).lower() if attr == 'class' else value.lower()
+                if any(pattern in value for pattern in INVALID_PATTERNS):
+                    return False
+        return text_length >= 20
+
+    def _score(self, root: etree._Element) -> List[Tuple[etree._Element, float, int]]:
+        """自底向上遍历一次，返回候选容器 (元素, 文本密度, 文本长度)，按文档顺序排列"""
+        # 元素 -> (计入父节点的文本长度, 标记长度)，父节点处理完子节点后即删除
+        sizes: Dict[etree._Element, Tuple[int, int]] = {}
+        # 元素 -> 开始标签的顺序，同分时与原来一样取靠前的容器
+        order: Dict[etree._Element, int] = {}
+        candidates: List[Tuple[etree._Element, float, int]] = []
+        # 当前所在的 script / style 及 pre / textarea 层数
+        removed_depth = 0
+        preserve_depth = 0
+
+        for event, element in etree.iterwalk(root, events=('start', 'end')):
+            tag = element.tag
+            if not isinstance(tag, str):
+                continue
+            if event == 'start':
+                removed_depth += tag in REMOVED_TAGS
+                preserve_depth += tag in PRESERVE_WHITESPACE_TAGS
+                if tag in CONTAINER_TAGS:
+                    order[element] = len(order)
+                continue
+            if removed_depth:
+                removed_depth -= tag in REMOVED_TAGS
+                continue
+
+            preserve = preserve_depth > 0
+            text_length = _stripped_length(element.text)
+            markup_length = _markup_text_length(element.text, preserve)
+            has_children = bool(element.text)
+            for child in element:
+                if isinstance(child.tag, str):
+                    if child.tag not in REMOVED_TAGS:
+                        has_children = True
+                        child_text, child_markup = sizes.pop(child)
+                        text_length += child_text
+                        markup_length += child_markup
+                elif child.tag is etree.Comment:
+                    has_children = True
+                    markup_length += len(child.text or '') + 7
+                elif child.tag is etree.ProcessingInstruction:
+                    has_children = True
+                    markup_length += len(child.text or '') + len(child.target) + 4
+                if child.tail:
+                    has_children = True
+                    text_length += _stripped_length(child.tail)
+                    markup_length += _markup_text_length(child.tail, preserve)
+            preserve_depth -= tag in PRESERVE_WHITESPACE_TAGS
+
+            open_length = len(tag) + 2 + sum(
+                _attribute_length(tag, name, value) for name, value in element.attrib.items()
+            )
+            if tag in VOID_TAGS and not has_children:
+                markup_length += open_length + 1
+            else:
+                markup_length += open_length + len(tag) + 3
+
+            if tag in CONTAINER_TAGS and text_length > 100 and self._is_valid_container(element, text_length):
+                candidates.append((element, text_length / markup_length, text_length))
+
+            sizes[element] = (0 if tag in TEXT_EXCLUDED_TAGS else text_length, markup_length)
+
+        candidates.sort(key=lambda item: order[item[0]])
+        return candidates
+
+    @staticmethod
+    def _text(element: etree._Element) -> str:
+        """与 get_text() 相同的文本：不含注释及 script / style / rt / rp / template 中的文本"""
+        parts: List[str] = []
+
+        def collect(node: etree._Element):
+            if node.text:
+                parts.append(node.text)
+            for child in node:
+                if isinstance(child.tag, str) and child.tag not in TEXT_EXCLUDED_TAGS and child.tag not in REMOVED_TAGS:
+                    collect(child)
+                if child.tail:
+                    parts.append(child.tail)
+
+        collect(element)
+        return ''.join(parts)
+
+    def extract(self, html: str) -> str:
+        """提取网页正文
+
+        Args:
+            html: 网页 HTML
+
+        Returns:
+            str: 以空行分隔的段落，标题格式为 "### 标题"
+        """
+        root = self.parse(html)
+        main_content: List[str] = []
+
+        # 1. 选出文本密度最高的容器，同密度时取文本更长的，再同分时取靠前的
+        candidates = self._score(root)
+        if candidates:
+            main_element = max(candidates, key=lambda item: (item[1], item[2]))[0]
+
+            # 提取段落和标题
+            for element in main_element.iterdescendants(*BLOCK_TAGS):
+                text = self.clean_text(self._text(element))
+                if text and len(text) > 20:
+                    if element.tag.startswith('h'):
+                        main_content.append(f"\n### {text}\n")
+                    else:
+                        main_content.append(text)
+
+        # 2. 提取到的内容不足时，取全文最长的 10 个段落
+        if len(main_content) < 3:
+            logger.info("Using alternative method to extract content...")
+            valid_paragraphs = []
+            for p in root.iter('p'):
+                text = self.clean_text(self._text(p))
+                if len(text) > 50:
+                    valid_paragraphs.append((text, len(text)))
+
+            valid_paragraphs.sort(key=lambda x: x[1], reverse=True)
+
+            for text, _ in valid_paragraphs[:10]:
+                if text not in main_content:
+                    main_content.append(text)
+
+        return "\n\n".join(main_content)
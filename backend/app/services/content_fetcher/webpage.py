@@ -1,39 +1,21 @@
+import asyncio
 from typing import Optional, Dict
 from .base import ContentFetcher, VideoInfo, AuthorInfo
 from app.utils.logger import logger
 from app.models.article import ArticleCreate
 from bs4 import BeautifulSoup
-import requests
 import re
 from datetime import datetime
 from urllib.parse import urlparse, urljoin
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-import urllib3
 from app.utils.decorators import retry_decorator
-
-# 禁用不安全请求警告
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from app.utils.page_cache import page_cache
+from app.utils.url_host import host_matches
+from .context import memoized
+from .text_density import TextDensityExtractor
 
 class WebPageFetcher(ContentFetcher):
     """通用网页内容获取器"""
     
-    def __init__(self):
-        self.session = self.create_session()
-        
-    def create_session(self):
-        """创建一个带有重试机制的会话"""
-        session = requests.Session()
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[500, 502, 503, 504]
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        return session
-    
     def can_handle(self, url: str) -> bool:
         """检查是否是普通网页URL"""
         known_platforms = [
@@ -42,7 +24,8 @@ class WebPageFetcher(ContentFetcher):
             'open.spotify.com',
             'xiaoyuzhoufm.com'
         ]
-        return not any(platform in url for platform in known_platforms)
+        # 只比较主机名，查询参数或路径中带有平台域名的普通网页仍然按网页处理
+        return not host_matches(url, known_platforms)
     
     def clean_text(self, text):
         """改进的文本清理方法"""
@@ -66,117 +49,27 @@ class WebPageFetcher(ContentFetcher):
         
         return text
     
-    def is_valid_content(self, element):
-        """改进的内容验证方法"""
-        if not element:
-            return False
-        
-        # 检查元素的可见性
-        style = element.get('style', '').lower()
-        if 'display: none' in style or 'visibility: hidden' in style:
-            return False
-        
-        # 排除无效内容
-        invalid_patterns = [
-            'nav', 'footer', 'header', 'menu', 'sidebar', 'ad', 
-            'comment', 'social', 'related', 'share', 'cookie',
-            'popup', 'banner', 'copyright', 'tracking', 'search',
-            'newsletter', 'subscribe'
-        ]
-        
-        # 检查元素的class和id
-        for attr in ['class', 'id']:
-            if element.get(attr):
-                attr_value = ' '.join(element[attr] if isinstance(element[attr], list) else [element[attr]])
-                attr_value = attr_value.lower()
-                if any(pattern in attr_value for pattern in invalid_patterns):
-                    return False
-        
-        # 检查是否包含有效的文本内容
-        text = element.get_text(strip=True)
-        if not text or len(text) < 20:
-            return False
-        
-        return True
+    def extract_main_content(self, html: str) -> str:
+        """提取主要内容（单次遍历的文本密度评分，见 TextDensityExtractor）"""
+        return TextDensityExtractor(self.clean_text).extract(html)
     
-    def calculate_text_density(self, element):
-        """计算元素的文本密度"""
-        text_length = len(element.get_text(strip=True))
-        html_length = len(str(element))
-        if html_length == 0:
-            return 0
-        return text_length / html_length
-    
-    def extract_main_content(self, soup):
-        """提取主要内容"""
-        main_content = []
-        
-        # 1. 首先尝试找到最密集的文本区域
-        text_blocks = []
-        for element in soup.find_all(['div', 'article', 'section', 'main']):
-            if not self.is_valid_content(element):
-                continue
-            
-            density = self.calculate_text_density(element)
-            text_length = len(element.get_text(strip=True))
-            
-            if text_length > 100:
-                text_blocks.append({
-                    'element': element,
-                    'density': density,
-                    'length': text_length
-                })
-        
-        # 按文本密度和长度排序
-        text_blocks.sort(key=lambda x: (x['density'], x['length']), reverse=True)
-        
-        # 2. 如果找到了高密度区域
-        if text_blocks:
-            main_element = text_blocks[0]['element']
-            
-            # 提取段落和标题
-            for element in main_element.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-                text = self.clean_text(element.get_text())
-                if text and len(text) > 20:
-                    if element.name.startswith('h'):
-                        main_content.append(f"\n### {text}\n")
-                    else:
-                        main_content.append(text)
-        
-        # 3. 如果上述方法没有提取到足够的内容，使用备选方案
-        if len(main_content) < 3:
-            logger.info("Using alternative method to extract content...")
-            paragraphs = soup.find_all('p')
-            
-            valid_paragraphs = []
-            for p in paragraphs:
-                text = self.clean_text(p.get_text())
-                if len(text) > 50:
-                    valid_paragraphs.append((text, len(text)))
-            
-            valid_paragraphs.sort(key=lambda x: x[1], reverse=True)
-            
-            for text, _ in valid_paragraphs[:10]:
-                if text not in main_content:
-                    main_content.append(text)
-        
-        return "\n\n".join(main_content)
+    async def _get_main_content(self, url: str) -> str:
+        """提取网页正文，同一次处理内只提取一次；大页面解析耗时较长，放到线程中执行"""
+        async def extract() -> str:
+            html = await self._get_page_html(url)
+            return await asyncio.to_thread(self.extract_main_content, html)
+        return await memoized("webpage.main_content", url, extract)
     
+    async def _get_page_html(self, url: str) -> str:
+        """下载网页 HTML，同一次处理内只下载一次，跨请求的重复下载由网页磁盘缓存处理"""
+        # 连接池、按主机限流及 5xx 重试由 FetchClient 统一处理
+        return await memoized("webpage.html", url, lambda: page_cache.get_html(url, verify=False, timeout=30))
+
     async def fetch(self, url: str) -> Optional[str]:
         """获取网页内容"""
         try:
-            response = self.session.get(url, verify=False, timeout=30)
-            response.raise_for_status()
-            response.encoding = response.apparent_encoding
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 移除script和style标签
-            for script in soup(['script', 'style']):
-                script.decompose()
-            
             # 提取主要内容
-            content = self.extract_main_content(soup)
+            content = await self._get_main_content(url)
             
             return content
             
@@ -188,11 +81,7 @@ class WebPageFetcher(ContentFetcher):
     async def get_video_info(self, url: str) -> Optional[VideoInfo]:
         """获取网页信息"""
         try:
-            response = self.session.get(url, verify=False, timeout=30)
-            response.raise_for_status()
-            response.encoding = response.apparent_encoding
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(await self._get_page_html(url), 'html.parser')
             
             # 获取标题
             title = soup.title.string if soup.title else url
@@ -206,7 +95,7 @@ class WebPageFetcher(ContentFetcher):
             
             if not description:
                 # 如果没有meta描述,使用正文前200个字符作为描述
-                content = self.extract_main_content(soup)
+                content = await self._get_main_content(url)
                 description = content[:200] + "..." if content else ""
             
             # 获取作者信息
@@ -264,11 +153,7 @@ class WebPageFetcher(ContentFetcher):
     async def get_chapters(self, url: str) -> Optional[str]:
         """获取网页章节信息"""
         try:
-            response = self.session.get(url, verify=False, timeout=30)
-            response.raise_for_status()
-            response.encoding = response.apparent_encoding
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(await self._get_page_html(url), 'html.parser')
             
             # 获取所有标题标签
             headers = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
@@ -11,6 +11,7 @@ from typing import Optional, Dict, Any
 from datetime import datetime
 
 from .base import ContentFetcher, VideoInfo
+from .context import memoized
 from app.config import settings
 from app.utils.decorators import retry_decorator
 from app.models.request import FetchRequest
@@ -69,6 +70,10 @@ class WeChatFetcher(ContentFetcher):
             return None
     
     async def _get_article_detail(self, url: str) -> Optional[Dict[str, Any]]:
+        """获取文章详情，同一次处理内只调用一次API"""
+        return await memoized("wechat.article_detail", url, lambda: self._request_article_detail(url))
+
+    async def _request_article_detail(self, url: str) -> Optional[Dict[str, Any]]:
         """调用极致了API获取文章详情"""
         if not self.api_key or not self.verify_code:
             logger.error("API密钥或验证码未配置")
@@ -2,13 +2,14 @@ from typing import Optional, Dict
 from .base import ContentFetcher, VideoInfo, AuthorInfo
 import re
 from app.utils.logger import logger
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 from app.models.article import ArticleCreate
 from app.services.transcript.tencent_asr import TencentASRClient
 from app.config import settings
 from app.services.transcript.xiaoyuzhou_resolver import XiaoYuZhouResolver
+from app.utils.page_cache import page_cache
+from .context import memoized
 
 class XiaoYuZhouFetcher(ContentFetcher):
     """Fetcher for XiaoYuZhou pages with anti-bot aware access and verbose logging"""
@@ -24,17 +25,18 @@ class XiaoYuZhouFetcher(ContentFetcher):
         if getattr(settings, "USE_PROXY", False) and getattr(settings, "PROXY_URL", None):
             logger.info("[XiaoYuZhou] Proxy detected in settings but ignored for XiaoYuZhou fetcher")
 
-    def _get_soup(self, url: str) -> BeautifulSoup:
-        """Request a URL and return BeautifulSoup, with logging on failures."""
+    async def _get_soup(self, url: str) -> BeautifulSoup:
+        """Request a URL and return BeautifulSoup; the HTML is fetched once per processing context."""
+        html = await memoized("xiaoyuzhou.html", url, lambda: self._download_html(url))
+        return BeautifulSoup(html, "html.parser")
+
+    async def _download_html(self, url: str) -> str:
+        """Request a URL through the page disk cache and return the HTML text, with logging on failures."""
         logger.info(f"[XiaoYuZhou][Step] HTTP request start: {url}")
         try:
-            resp = requests.get(url, headers=self.default_headers, timeout=20)
-            # Log basic diagnostics before raising
-            logger.info(
-                f"[XiaoYuZhou][Step] HTTP response: status={resp.status_code}, len={len(resp.text)}"
-            )
-            resp.raise_for_status()
-            return BeautifulSoup(resp.text, "html.parser")
+            html = await page_cache.get_html(url, headers=self.default_headers, timeout=20)
+            logger.info(f"[XiaoYuZhou][Step] HTML ready: len={len(html)}")
+            return html
         except Exception as e:
             logger.error(f"[XiaoYuZhou][Step] HTTP request failed: {type(e).__name__}: {e}")
             raise
@@ -74,23 +76,24 @@ class XiaoYuZhouFetcher(ContentFetcher):
             return f"https://www.xiaoyuzhoufm.com{src}"
         return src
 
-    def _fallback_audio_via_podcast(self, episode_url: str, episode_id: str, podcast_url: str) -> Optional[str]:
+    async def _fallback_audio_via_podcast(self, episode_url: str, episode_id: str, podcast_url: str) -> Optional[str]:
         try:
             logger.info(f"[XiaoYuZhou][Step] Fallback via podcast page: {podcast_url}")
-            ep_links = self.resolver._find_episode_links(podcast_url)
-            logger.info(f"[XiaoYuZhou][Step] Podcast episodes discovered: {len(ep_links)}")
-            # Match by episode id
+            # Match by episode id; a cached listing may not contain a newly published
+            # episode yet, so revalidate the listing upstream once on a miss
             target = None
-            for link in ep_links:
-                if episode_id and episode_id in link:
-                    target = link
+            for refresh in (False, True):
+                ep_links = await self.resolver._find_episode_links(podcast_url, refresh=refresh)
+                logger.info(f"[XiaoYuZhou][Step] Podcast episodes discovered: {len(ep_links)}")
+                target = next((link for link in ep_links if episode_id and episode_id in link), None)
+                if target or not episode_id:
                     break
             if not target:
                 logger.warning(f"[XiaoYuZhou][Step] Fallback match by id failed: id='{episode_id}'")
                 return None
             logger.info(f"[XiaoYuZhou][Step] Fallback target episode: {target}")
             # Reuse resolver path to read meta
-            title, audio = self.resolver._get_episode_meta(target)
+            title, audio = await self.resolver._get_episode_meta(target)
             logger.info(f"[XiaoYuZhou][Step] Fallback meta extracted: title={'yes' if title else 'no'}, audio={'yes' if audio else 'no'}")
             return audio or None
         except Exception as e:
@@ -105,7 +108,7 @@ class XiaoYuZhouFetcher(ContentFetcher):
         try:
             logger.info(f"[XiaoYuZhou][Step] start fetch: {url}")
             # 解析音频直链
-            soup = self._get_soup(url)
+            soup = await self._get_soup(url)
             audio_meta = soup.find('meta', property='og:audio')
             audio_url = audio_meta.get('content', '') if audio_meta else ''
             if not audio_url:
@@ -115,7 +118,7 @@ class XiaoYuZhouFetcher(ContentFetcher):
                 if podcast_url:
                     episode_id = self._extract_episode_id(url)
                     logger.info(f"[XiaoYuZhou][Step] Attempt fallback using podcast_url and episode_id: {podcast_url} | {episode_id}")
-                    audio_url = self._fallback_audio_via_podcast(url, episode_id, podcast_url) or ''
+                    audio_url = await self._fallback_audio_via_podcast(url, episode_id, podcast_url) or ''
                     if audio_url:
                         logger.info(f"[XiaoYuZhou][Step] Fallback audio_url parsed")
                     else:
@@ -159,7 +162,7 @@ class XiaoYuZhouFetcher(ContentFetcher):
         """获取小宇宙信息"""
         try:
             logger.info(f"[XiaoYuZhou][Step] start get_video_info: {url}")
-            soup = self._get_soup(url)
+            soup = await self._get_soup(url)
 
             title = ''
             desc = ''
@@ -242,7 +245,7 @@ class XiaoYuZhouFetcher(ContentFetcher):
     async def get_author_info(self, url: str) -> Optional[AuthorInfo]:
         """获取小宇宙播客作者信息"""
         try:
-            soup = self._get_soup(url)
+            soup = await self._get_soup(url)
             header = soup.find(lambda tag: tag.name == 'header' and tag.find('h1'))
             name = None
             icon = None
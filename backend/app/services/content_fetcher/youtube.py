@@ -13,6 +13,7 @@ from datetime import datetime
 from urllib.parse import urlparse, parse_qs
 
 from .base import ContentFetcher, VideoInfo
+from .context import memoized
 from app.config import settings
 from app.utils.decorators import retry_decorator
 from app.models.request import FetchRequest
@@ -207,7 +208,11 @@ class YouTubeFetcher(ContentFetcher):
             return None
     
     async def _get_serpapi_info(self, video_id: str) -> Optional[Dict[str, Any]]:
-        """使用SerpAPI获取视频信息"""
+        """使用SerpAPI获取视频信息，同一次处理内只请求一次"""
+        return await memoized("youtube.serpapi", video_id, lambda: self._request_serpapi_info(video_id))
+
+    async def _request_serpapi_info(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """请求SerpAPI视频信息"""
         if not self.serpapi_key:
             logger.error("SERPAPI_KEY未配置")
             return None
@@ -292,6 +297,10 @@ class YouTubeFetcher(ContentFetcher):
             return None
     
     async def _get_transcript(self, video_id: str) -> Optional[str]:
+        """获取视频转录/字幕，同一次处理内只请求一次"""
+        return await memoized("youtube.transcript", video_id, lambda: self._request_transcript(video_id))
+
+    async def _request_transcript(self, video_id: str) -> Optional[str]:
         """获取视频转录/字幕 - 优先使用Supadata API，备选youtube-transcript-api"""
         if not video_id:
             logger.error("视频ID为空，无法获取字幕")
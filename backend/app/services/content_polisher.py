@@ -3,6 +3,7 @@ import re
 from app.utils.logger import logger
 from app.services.coze import CozeService
 from app.repositories.supabase import SupabaseService
+from app.services.llm_cache import llm_cache
 import json
 import asyncio
 
@@ -79,7 +80,8 @@ class ContentPolisherService:
     async def polish_content_batch(
         batches: str, 
         language: str,
-        workflow_id: str
+        workflow_id: str,
+        fair_key: str = "default"
     ) -> List[dict]:
         """调用 Coze 接口润色内容批次
         
@@ -87,6 +89,7 @@ class ContentPolisherService:
             batches: JSON格式的批次内容
             language: 语言类型
             workflow_id: Coze 工作流 ID
+            fair_key: 公平排队分组，通常为文章ID
             
         Returns:
             List[dict]: Coze API 的响应结果列表
@@ -94,15 +97,13 @@ class ContentPolisherService:
         try:
             logger.info(f"开始并发调用 Coze API 处理内容润色: language={language}")
             
-            # 创建信号量控制并发数
-            semaphore = asyncio.Semaphore(15)
-            
             # 解析JSON字符串为Python对象
             content_batches = json.loads(batches)
             
             async def process_single_batch(index: int, batch_content: str) -> tuple[int, dict]:
                 """处理单个批次内容"""
-                async with semaphore:
+                # 并发数由所有文章共享的 Coze 限制器控制
+                async with CozeService.limiter.slot(fair_key):
                     try:
                         logger.info(f"开始处理第 {index + 1} 个批次")
                         coze_service = CozeService()
@@ -322,12 +323,20 @@ class ContentPolisherService:
             # 3. 处理批次数组并转换为 JSON
             batches_json = cls.prepare_batches_json(batches)
             
-            # 4. 调用 Coze 接口一次性处理所有批次
-            coze_results = await cls.polish_content_batch(
-                batches_json,
-                language,
-                workflow_id
-            )
+            # 4. 调用 Coze 接口一次性处理所有批次，相同工作流、内容和语言的结果直接复用缓存
+            cache_key = llm_cache.make_key(workflow_id, "", batches_json, language)
+            coze_results = await llm_cache.get("polish", cache_key)
+            if coze_results is not None:
+                logger.info(f"命中润色缓存: article_id={article_id}, language={language}")
+            else:
+                coze_results = await cls.polish_content_batch(
+                    batches_json,
+                    language,
+                    workflow_id,
+                    fair_key=str(article_id)
+                )
+                if all(result.get('code') == 0 for result in coze_results):
+                    await llm_cache.set("polish", cache_key, coze_results)
             
             # 5. 保存 Coze 返回结果到请求表
             await SupabaseService.update_polished_content(
@@ -1,31 +1,13 @@
 from typing import Optional, Tuple
 from app.utils.logger import logger
-from .platform_parser.base import PlatformParser
-from .platform_parser.youtube import YouTubeParser
-from .platform_parser.apple import ApplePodcastParser
-from .platform_parser.spotify import SpotifyParser
-from .platform_parser.webpage import WebPageParser
-from .platform_parser.xiaoyuzhou import XiaoYuZhouParser
-from .platform_parser.wechat import WeChatParser
-from .platform_parser.bilibili import BilibiliParser
-from .platform_parser.github import GitHubParser
+from .platform_registry import PlatformRegistry
 
 class ContentResolver:
     """内容解析服务"""
     
     def __init__(self):
-        # 注意：GitHub Parser 优先级最高，放在最前面
-        # 这样可以确保所有 GitHub 链接都走 Deep Research 分析
-        self.parsers: list[PlatformParser] = [
-            GitHubParser(),  # GitHub 优先（Deep Research 分析）
-            WeChatParser(),
-            BilibiliParser(),
-            XiaoYuZhouParser(),
-            YouTubeParser(),
-            ApplePodcastParser(),
-            SpotifyParser(),
-            WebPageParser()
-        ]
+        # 解析器按域名从共享的路由表中查找，GitHub 链接优先走 Deep Research 分析
+        self.registry = PlatformRegistry.default()
     
     async def resolve(self, url: str) -> Optional[Tuple[str, str, str]]:
         """
@@ -39,11 +21,10 @@ class ContentResolver:
         """
         logger.info(f"开始解析URL: {url}")
         
-        for parser in self.parsers:
-            if parser.can_handle(url):
-                result = await parser.parse(url)
-                if result:
-                    return result
+        for route in self.registry.parser_routes(url):
+            result = await route.parser.parse(url)
+            if result:
+                return result
                     
         logger.warning(f"没有找到合适的析器处理URL: {url}")
         return None 
\ No newline at end of file
@@ -1,11 +1,12 @@
-import httpx
-import boto3
 import json
-from botocore.config import Config
-from typing import Dict, AsyncGenerator
+from contextlib import aclosing
+from typing import Dict, AsyncGenerator, Optional
 from app.config import settings
 from app.utils.logger import logger
 from app.utils.sse import SSEMessage
+from app.utils.http_client import HttpClientRegistry
+from app.services.bedrock_client import BedrockClientFactory
+from app.utils.token_estimator import TokenEstimator
 
 class DeepseekService:
     # OpenRouter 配置
@@ -30,9 +31,26 @@ class DeepseekService:
         provider = settings.LLM_CHAT_PROVIDER
         logger.info(f"Chat使用 {provider} 进行流式响应")
         
+        # 调用前预估 token 数，输入放不下时直接使用长上下文模型，不再等待调用失败
+        texts = [context["prompt"]] + [msg["content"] for msg in context["history"]]
+        if provider == "bedrock":
+            candidates = [self.BEDROCK_MODEL, self.OPENROUTER_LONG_CONTEXT_MODEL]
+        else:
+            candidates = [self.OPENROUTER_MODEL, self.OPENROUTER_LONG_CONTEXT_MODEL]
+        route = TokenEstimator.choose_model(
+            candidates, texts,
+            desired_output=self.BEDROCK_MAX_TOKENS,
+            min_output=settings.CHAT_MIN_OUTPUT_TOKENS
+        )
+        if route is None or route[0] == self.OPENROUTER_LONG_CONTEXT_MODEL:
+            logger.warning(f"预估输入超出 {candidates[0]} 上下文窗口，直接使用 OpenRouter 长上下文模型: {self.OPENROUTER_LONG_CONTEXT_MODEL}")
+            async for chunk in self._chat_stream_openrouter(context, use_long_context_model=True):
+                yield chunk
+            return
+        
         if provider == "bedrock":
             try:
-                async for chunk in self._chat_stream_bedrock(context):
+                async for chunk in self._chat_stream_bedrock(context, max_tokens=route[1]):
                     yield chunk
             except Exception as e:
                 # 检查是否是输入过长的错误，如果是则 fallback 到 OpenRouter 长上下文模型
@@ -48,25 +66,14 @@ class DeepseekService:
             async for chunk in self._chat_stream_openrouter(context):
                 yield chunk
     
-    async def _chat_stream_bedrock(self, context: Dict) -> AsyncGenerator[str, None]:
-        """流式调用 AWS Bedrock API (Claude Haiku 4.5)"""
+    async def _chat_stream_bedrock(self, context: Dict, max_tokens: Optional[int] = None) -> AsyncGenerator[str, None]:
+        """流式调用 AWS Bedrock API (Claude Haiku 4.5)
+        
+        Args:
+            context: 上下文信息
+            max_tokens: 最大输出 token 数，默认为 BEDROCK_MAX_TOKENS
+        """
         try:
-            # 配置超时时间
-            config = Config(
-                read_timeout=120,
-                connect_timeout=30,
-                retries={'max_attempts': 3}
-            )
-            
-            # 创建Bedrock客户端
-            bedrock_client = boto3.client(
-                'bedrock-runtime',
-                region_name=self.BEDROCK_REGION,
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                config=config
-            )
-            
             # 构建消息列表
             messages = []
             for msg in context["history"]:
@@ -78,7 +85,7 @@ class DeepseekService:
             # 构建请求数据
             request_data = {
                 "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": self.BEDROCK_MAX_TOKENS,
+                "max_tokens": max_tokens or self.BEDROCK_MAX_TOKENS,
                 "temperature": 0.1,
                 "system": context["prompt"],  # system prompt
                 "messages": messages
@@ -88,19 +95,28 @@ class DeepseekService:
             logger.info(f"模型: {self.BEDROCK_MODEL}")
             
             # 调用Bedrock流式API
-            response = bedrock_client.invoke_model_with_response_stream(
-                modelId=self.BEDROCK_MODEL,
-                body=json.dumps(request_data),
-                contentType="application/json"
+            stream = BedrockClientFactory.invoke_model_stream(
+                model_id=self.BEDROCK_MODEL,
+                body=request_data,
+                region=self.BEDROCK_REGION,
+                read_timeout=120,
+                connect_timeout=30
             )
             
-            # 处理流式响应
-            for event in response['body']:
-                if 'chunk' in event:
-                    chunk_data = json.loads(event['chunk']['bytes'].decode('utf-8'))
-                    
+            # 处理流式响应，提前退出或客户端断开时立即关闭流、释放读取线程
+            async with aclosing(stream):
+                async for chunk_data in stream:
                     # 处理不同类型的事件
-                    if chunk_data.get('type') == 'content_block_delta':
+                    if chunk_data.get('type') == 'message_start':
+                        # 用实际输入 token 数校准估算
+                        input_tokens = chunk_data.get('message', {}).get('usage', {}).get('input_tokens', 0)
+                        TokenEstimator.calibrate(
+                            self.BEDROCK_MODEL,
+                            TokenEstimator.estimate_messages([request_data["system"]] + TokenEstimator.message_texts(messages)),
+                            input_tokens
+                        )
+                
+                    elif chunk_data.get('type') == 'content_block_delta':
                         delta = chunk_data.get('delta', {})
                         if delta.get('type') == 'text_delta':
                             text = delta.get('text', '')
@@ -109,7 +125,7 @@ class DeepseekService:
                                     content=text,
                                     event_type="bedrock"
                                 )
-                    
+                
                     # 处理结束事件
                     elif chunk_data.get('type') == 'message_stop':
                         yield SSEMessage.create(content="", done=True)
@@ -153,40 +169,40 @@ class DeepseekService:
                     "content": msg["content"]
                 })
             
-            async with httpx.AsyncClient() as client:
-                async with client.stream(
-                    "POST",
-                    self.api_url,
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                        "Accept": "text/event-stream"
-                    },
-                    json=request_data,
-                    timeout=120.0
-                ) as response:
-                    response.raise_for_status()
-                    
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            if line.strip() == "data: [DONE]":
-                                yield SSEMessage.create(content="", done=True)
-                                break
-                            
-                            try:
-                                data = json.loads(line[6:])
-                                if content := data["choices"][0]["delta"].get("content"):
-                                    yield SSEMessage.create(
-                                        content=content,
-                                        event_type="openrouter"
-                                    )
-                            except json.JSONDecodeError:
-                                logger.error(f"OpenRouter API JSON解析失败，原始数据为: {line}")
-                                continue
-                            except KeyError as e:
-                                logger.error(f"OpenRouter API 返回数据结构异常: {str(e)}, 数据: {data}")
-                                continue
-                    
+            client = HttpClientRegistry.get_client("openrouter")
+            async with client.stream(
+                "POST",
+                self.api_url,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                    "Accept": "text/event-stream"
+                },
+                json=request_data,
+                timeout=HttpClientRegistry.timeout("openrouter.chat_stream")
+            ) as response:
+                response.raise_for_status()
+                
+                async for line in response.aiter_lines():
+                    if line.startswith("data: "):
+                        if line.strip() == "data: [DONE]":
+                            yield SSEMessage.create(content="", done=True)
+                            break
+                        
+                        try:
+                            data = json.loads(line[6:])
+                            if content := data["choices"][0]["delta"].get("content"):
+                                yield SSEMessage.create(
+                                    content=content,
+                                    event_type="openrouter"
+                                )
+                        except json.JSONDecodeError:
+                            logger.error(f"OpenRouter API JSON解析失败，原始数据为: {line}")
+                            continue
+                        except KeyError as e:
+                            logger.error(f"OpenRouter API 返回数据结构异常: {str(e)}, 数据: {data}")
+                            continue
+                
         except Exception as e:
             logger.error(f"OpenRouter Chat API 调用失败: {str(e)}", exc_info=True)
             raise 
@@ -0,0 +1,377 @@
+"""
+持久化后台任务队列
+
+替代 FastAPI BackgroundTasks，任务先写入本地 SQLite，再由固定数量的 worker 消费：
+- worker 池大小可配置，突发的大量提交会排队，而不是同时启动全部流水线
+- 按任务类型限制并发数
+- 进程重启时检查遗留的 processing 任务：处理函数不是幂等的，只有注册了恢复检查且检查通过的任务才重新排队，
+  其余标记为失败，避免重复创建文章或分段
+- 多个进程共享同一个数据库文件时，领取任务在 BEGIN IMMEDIATE 事务内完成，同一任务只会被一个进程领取
+"""
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.utils.logger import logger
+from app.utils.sqlite_store import connect_sqlite
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+# 恢复检查：接收 payload，返回 True 时重新执行，返回 False 时标记失败（可在其中更新业务状态）
+ResumeCheck = Callable[[Dict[str, Any]], Awaitable[bool]]
+
+
+class JobTypes:
+    """任务类型定义"""
+    ARTICLE = "article"                    # 文章处理流程
+    GITHUB_AGENT = "github_agent"          # GitHub Deep Research 流程
+    MULTILINGUAL = "multilingual"          # 多语言补充处理
+    PRIVATE_CONTENT = "private_content"    # 私密内容处理
+
+
+class JobQueue:
+    """基于 SQLite 的持久化任务队列"""
+
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    def __init__(
+        self,
+        db_path: str,
+        worker_count: int,
+        type_limits: Dict[str, int],
+        poll_interval: float = 1.0,
+        max_attempts: int = 3,
+        retention_days: int = 7
+    ):
+        """初始化任务队列
+
+        Args:
+            db_path: SQLite 数据库文件路径
+            worker_count: worker 数量，即全局最大并发任务数
+            type_limits: 各任务类型的最大并发数，未配置的类型只受 worker 数量限制
+            poll_interval: 空闲 worker 轮询间隔（秒）
+            max_attempts: 任务最大执行次数，超过后不再在重启时恢复
+            retention_days: 已结束任务的保留天数
+        """
+        self.db_path = db_path
+        self.worker_count = max(1, worker_count)
+        self.type_limits = type_limits
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retention_days = retention_days
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._resume_checks: Dict[str, ResumeCheck] = {}
+        # 领取任务时记录的进程标识，重启恢复时跳过同一主机上仍在运行的其他进程的任务
+        self._owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._running: Dict[str, int] = {}
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def register(self, job_type: str, handler: JobHandler, can_resume: Optional[ResumeCheck] = None) -> None:
+        """注册任务处理函数
+
+        Args:
+            job_type: 任务类型
+            handler: 接收 payload 字典的异步处理函数
+            can_resume: 进程中断后的恢复检查，未提供时中断的任务一律标记失败，不会重新执行
+        """
+        self._handlers[job_type] = handler
+        if can_resume is not None:
+            self._resume_checks[job_type] = can_resume
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """获取 SQLite 连接，首次调用时建表"""
+        if self._conn is None:
+            conn = connect_sqlite(self.db_path, [
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_type TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """,
+                "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id)",
+            ])
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            self._conn = conn
+        return self._conn
+
+    def _owner_alive(self, owner: Optional[str]) -> bool:
+        """判断领取任务的进程是否仍在运行（只能判断同一主机上的进程）"""
+        if not owner or owner == self._owner:
+            return False
+        host, _, pid = owner.rpartition(":")
+        if host != self._owner.rpartition(":")[0] or not pid.isdigit():
+            return False
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def _recover(self) -> Tuple[List[Tuple[int, str, Dict[str, Any]]], int]:
+        """取出上次进程遗留的 processing 任务
+
+        Returns:
+            Tuple[List[Tuple[int, str, Dict[str, Any]]], int]:
+                (需要检查能否恢复的任务, 因超过重试次数而标记失败的任务数)
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT id, job_type, payload, attempts, owner FROM jobs WHERE status = ?",
+                    (self.STATUS_PROCESSING,)
+                ).fetchall()
+                interrupted = []
+                failed = 0
+                for job_id, job_type, payload, attempts, owner in rows:
+                    if self._owner_alive(owner):
+                        continue
+                    if attempts >= self.max_attempts:
+                        conn.execute(
+                            "UPDATE jobs SET status = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                            (self.STATUS_FAILED, "超过最大执行次数", now, job_id)
+                        )
+                        failed += 1
+                    else:
+                        # 检查期间由当前进程持有，避免被其他进程同时恢复
+                        conn.execute("UPDATE jobs SET owner = ? WHERE id = ?", (self._owner, job_id))
+                        interrupted.append((job_id, job_type, json.loads(payload)))
+                conn.execute(
+                    "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                    (self.STATUS_DONE, self.STATUS_FAILED, now - self.retention_days * 86400)
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return interrupted, failed
+
+    def _resolve_recovered(self, job_id: int, resume: bool) -> None:
+        """恢复检查通过的任务重新排队，其余标记失败"""
+        with self._lock:
+            if resume:
+                self._get_conn().execute(
+                    "UPDATE jobs SET status = ?, owner = NULL, updated_at = ? WHERE id = ?",
+                    (self.STATUS_PENDING, time.time(), job_id)
+                )
+            else:
+                self._get_conn().execute(
+                    "UPDATE jobs SET status = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                    (self.STATUS_FAILED, "进程中断，任务可能已部分执行，不自动重试", time.time(), job_id)
+                )
+
+    def _insert(self, job_type: str, payload: Dict[str, Any]) -> int:
+        """写入一条待处理任务"""
+        now = time.time()
+        with self._lock:
+            cursor = self._get_conn().execute(
+                "INSERT INTO jobs (job_type, payload, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_type, json.dumps(payload, ensure_ascii=False), self.STATUS_PENDING, now, now)
+            )
+            return cursor.lastrowid
+
+    def _claim_next(self) -> Optional[Tuple[int, str, Dict[str, Any]]]:
+        """领取下一个可执行的任务，跳过已达到并发上限的任务类型
+
+        查询和更新在同一个 BEGIN IMMEDIATE 事务内完成，多个进程共享数据库时不会重复领取。
+        """
+        with self._lock:
+            conn = self._get_conn()
+            saturated = [
+                job_type for job_type, limit in self.type_limits.items()
+                if self._running.get(job_type, 0) >= limit
+            ]
+            sql = "SELECT id, job_type, payload FROM jobs WHERE status = ?"
+            params: List[Any] = [self.STATUS_PENDING]
+            if saturated:
+                sql += f" AND job_type NOT IN ({','.join('?' * len(saturated))})"
+                params.extend(saturated)
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(sql + " ORDER BY id LIMIT 1", params).fetchone()
+                if row:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, attempts = attempts + 1, owner = ?, updated_at = ? WHERE id = ?",
+                        (self.STATUS_PROCESSING, self._owner, time.time(), row[0])
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            if not row:
+                return None
+
+            job_id, job_type, payload = row
+            self._running[job_type] = self._running.get(job_type, 0) + 1
+            return job_id, job_type, json.loads(payload)
+
+    def _release(self, job_type: str) -> None:
+        """释放任务类型的并发名额"""
+        with self._lock:
+            self._running[job_type] = max(0, self._running.get(job_type, 0) - 1)
+
+    def _finish(self, job_id: int, job_type: str, status: str, error: Optional[str] = None) -> None:
+        """记录任务结束状态并释放并发名额"""
+        with self._lock:
+            self._get_conn().execute(
+                "UPDATE jobs SET status = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                (status, error, time.time(), job_id)
+            )
+            self._running[job_type] = max(0, self._running.get(job_type, 0) - 1)
+
+    async def enqueue(self, job_type: str, payload: Dict[str, Any]) -> int:
+        """提交任务
+
+        Args:
+            job_type: 任务类型，需已通过 register 注册
+            payload: 可 JSON 序列化的任务参数
+
+        Returns:
+            int: 任务ID
+        """
+        if job_type not in self._handlers:
+            raise ValueError(f"未注册的任务类型: {job_type}")
+
+        job_id = await asyncio.to_thread(self._insert, job_type, payload)
+        logger.info(f"任务已入队: job_id={job_id}, type={job_type}")
+        if self._wakeup:
+            self._wakeup.set()
+        return job_id
+
+    async def _worker(self, index: int) -> None:
+        """worker 主循环"""
+        while True:
+            self._wakeup.clear()
+            try:
+                job = await asyncio.to_thread(self._claim_next)
+            except Exception as e:
+                logger.error(f"任务领取失败: worker={index}, error={str(e)}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job_id, job_type, payload = job
+            handler = self._handlers.get(job_type)
+            start_time = time.time()
+            logger.info(f"开始执行任务: job_id={job_id}, type={job_type}, worker={index}")
+
+            try:
+                if handler is None:
+                    raise ValueError(f"未注册的任务类型: {job_type}")
+                await handler(payload)
+                await asyncio.to_thread(self._finish, job_id, job_type, self.STATUS_DONE)
+                logger.info(f"任务执行完成: job_id={job_id}, 耗时 {time.time() - start_time:.1f}s")
+            except asyncio.CancelledError:
+                # 进程关闭时保留 processing 状态，下次启动时检查能否恢复
+                self._release(job_type)
+                raise
+            except Exception as e:
+                logger.error(f"任务执行失败: job_id={job_id}, type={job_type}, error={str(e)}", exc_info=True)
+                await asyncio.to_thread(self._finish, job_id, job_type, self.STATUS_FAILED, str(e))
+
+            # 释放了并发名额，唤醒其他等待中的 worker
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        """恢复遗留任务并启动 worker 池"""
+        if self._workers:
+            return
+
+        self._wakeup = asyncio.Event()
+        interrupted, failed = await asyncio.to_thread(self._recover)
+        recovered = 0
+        for job_id, job_type, payload in interrupted:
+            check = self._resume_checks.get(job_type)
+            resume = False
+            if check is not None:
+                try:
+                    resume = await check(payload)
+                except Exception as e:
+                    logger.error(f"任务恢复检查失败: job_id={job_id}, type={job_type}, error={str(e)}")
+            await asyncio.to_thread(self._resolve_recovered, job_id, resume)
+            if resume:
+                recovered += 1
+            else:
+                failed += 1
+                logger.warning(f"中断的任务不重新执行: job_id={job_id}, type={job_type}")
+        if recovered or failed:
+            logger.info(f"任务队列恢复遗留任务: 重新排队 {recovered} 个, 标记失败 {failed} 个")
+
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"job-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+        logger.info(
+            f"任务队列已启动: workers={self.worker_count}, "
+            f"type_limits={self.type_limits}, db={self.db_path}"
+        )
+
+    async def stop(self) -> None:
+        """停止 worker 池，执行中的任务保留为 processing，下次启动时检查能否恢复"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        logger.info("任务队列已停止")
+
+    def stats(self) -> Dict[str, Any]:
+        """获取队列状态
+
+        Returns:
+            Dict[str, Any]: 各状态任务数量及各类型执行中的任务数
+        """
+        with self._lock:
+            rows = self._get_conn().execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+            running = dict(self._running)
+        return {
+            "counts": {status: count for status, count in rows},
+            "running": running,
+            "workers": len(self._workers)
+        }
+
+
+# 全局任务队列实例
+job_queue = JobQueue(
+    db_path=settings.JOB_QUEUE_DB_PATH,
+    worker_count=settings.JOB_QUEUE_WORKERS,
+    type_limits=settings.job_queue_type_limits,
+    poll_interval=settings.JOB_QUEUE_POLL_INTERVAL,
+    max_attempts=settings.JOB_QUEUE_MAX_ATTEMPTS
+)
@@ -0,0 +1,135 @@
+"""
+LLM 结果缓存
+
+以 hash(模型, 提示词, 输入内容, 语言) 为键缓存 LLM / Coze 工作流的原始结果，
+同一内容被多个用户重复提交时直接复用，不再产生新的调用费用。
+- 本地 SQLite 存储，进程重启后仍然有效
+- 按总字节数限制容量，超出时按最近访问时间淘汰（LRU）
+- 按命名空间统计命中 / 未命中次数
+"""
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.utils.logger import logger
+from app.utils.sqlite_store import SqliteLRUStore
+
+
+class LLMResultCache:
+    """基于 SQLite 的 LLM 结果缓存"""
+
+    def __init__(self, db_path: str, max_bytes: int, enabled: bool = True):
+        """初始化缓存
+
+        Args:
+            db_path: SQLite 数据库文件路径
+            max_bytes: 缓存内容总字节数上限
+            enabled: 是否启用缓存
+        """
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._store = SqliteLRUStore(
+            db_path,
+            table="llm_cache",
+            columns="namespace TEXT NOT NULL, value TEXT NOT NULL, created_at REAL NOT NULL",
+            max_bytes=max_bytes,
+            label_column="namespace"
+        )
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def make_key(model: str, prompt: str, content: str, language: str) -> str:
+        """生成缓存键
+
+        Args:
+            model: 模型名称或 Coze 工作流 ID
+            prompt: 提示词原文
+            content: 输入内容
+            language: 语言代码
+
+        Returns:
+            str: sha256 十六进制摘要
+        """
+        raw = json.dumps([model, prompt, content, language], ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _count(self, namespace: str, field: str, amount: int = 1) -> None:
+        stats = self._stats.setdefault(namespace, {"hits": 0, "misses": 0, "stores": 0, "evictions": 0})
+        stats[field] += amount
+
+    def _get(self, namespace: str, key: str) -> Optional[Any]:
+        row = self._store.get(key, ("value",))
+        if row is None:
+            self._count(namespace, "misses")
+            return None
+        self._count(namespace, "hits")
+        return json.loads(row[0])
+
+    def _set(self, namespace: str, key: str, value: Any) -> None:
+        data = json.dumps(value, ensure_ascii=False)
+        size = len(data.encode('utf-8'))
+        if size > self.max_bytes:
+            logger.warning(f"LLM 结果超过缓存容量上限，不缓存: namespace={namespace}, size={size}")
+            return
+
+        evicted = self._store.put(key, size, namespace=namespace, value=data, created_at=time.time())
+        self._count(namespace, "stores")
+        for evicted_namespace in evicted:
+            self._count(evicted_namespace, "evictions")
+
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        """读取缓存
+
+        Args:
+            namespace: 命名空间，如 'summary'、'polish'、'detail'
+            key: make_key 生成的缓存键
+
+        Returns:
+            Optional[Any]: 缓存的结果，未命中或读取失败时返回 None
+        """
+        if not self.enabled:
+            return None
+        try:
+            return await asyncio.to_thread(self._get, namespace, key)
+        except Exception as e:
+            logger.error(f"读取LLM结果缓存失败: {str(e)}")
+            return None
+
+    async def set(self, namespace: str, key: str, value: Any) -> None:
+        """写入缓存，写入失败只记录日志
+
+        Args:
+            namespace: 命名空间
+            key: make_key 生成的缓存键
+            value: 可 JSON 序列化的结果
+        """
+        if not self.enabled:
+            return
+        try:
+            await asyncio.to_thread(self._set, namespace, key, value)
+        except Exception as e:
+            logger.error(f"写入LLM结果缓存失败: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """获取缓存统计
+
+        Returns:
+            Dict[str, Any]: 总字节数、上限及各命名空间的命中 / 未命中 / 写入 / 淘汰次数
+        """
+        return {
+            "total_bytes": self._store.total_bytes,
+            "max_bytes": self.max_bytes,
+            "namespaces": {name: dict(stats) for name, stats in self._stats.items()}
+        }
+
+
+# 全局 LLM 结果缓存实例
+llm_cache = LLMResultCache(
+    db_path=settings.LLM_CACHE_DB_PATH,
+    max_bytes=settings.LLM_CACHE_MAX_BYTES,
+    enabled=settings.LLM_CACHE_ENABLED
+)
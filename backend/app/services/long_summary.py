@@ -0,0 +1,244 @@
+"""
+超长内容的分层总结（map-reduce）
+
+长播客、长视频的字幕可能超出单个模型的上下文窗口（Bedrock 返回 "Input is too long"）。
+分层总结先把内容按章节 / 时间戳 / 段落边界切成若干块，并发为每块生成详细笔记（map），
+再把按顺序拼接的笔记交给原有的总结提示词生成最终总结（reduce）：
+- 切分优先在章节开始处断开，其次在时间戳行、段落等换行处，超长的单行按句子切开
+- 各块的调用共享一个进程级自适应并发限制器，按文章公平排队
+- 笔记拼接后仍然过长时再做一轮，直到不超过阈值或达到最大轮数
+"""
+import re
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.config import settings
+from app.utils.adaptive_limiter import AdaptiveLimiter, is_overload_error
+from app.utils.logger import logger
+from app.utils.task_graph import TaskGraph
+
+# 行首时间戳，如 [01:02:03]、[02:03]、01:02:03
+TIMESTAMP_RE = re.compile(r'^\s*\[?((?:\d{1,2}:)?\d{1,2}:\d{2})\]?')
+# 句末标点之后的位置
+SENTENCE_END_RE = re.compile(r'(?<=[。！？；!?;.])\s+|(?<=[。！？；])')
+# 网页章节格式，如 "h2: 标题"
+HEADING_CHAPTER_RE = re.compile(r'^h[1-6]:\s*(.+)$')
+
+MAP_PROMPT = """You are reading part {index} of {total} of a long transcript or article. Write detailed notes for this part only, in {language}:
+- Keep every key point, argument, data point, example and notable quote
+- Keep the original timestamps (e.g. [00:12:30]) next to the points they belong to
+- Follow the original order; do not add an introduction or a conclusion
+- Do not use the headings "## Summary", "## End" or "## Additional Processing\""""
+
+# 模型调用函数：(提示词, 内容, 请求ID, 语言) -> OpenRouter 格式的响应
+SummaryCall = Callable[[str, str, int, str], Awaitable[Optional[Dict[str, Any]]]]
+
+
+def is_llm_overload_error(exc: BaseException) -> bool:
+    """判断异常是否表示 LLM 上游过载，在 HTTP 过载之外识别 Bedrock 的限流错误"""
+    if is_overload_error(exc):
+        return True
+    response = getattr(exc, 'response', None)
+    if isinstance(response, dict):
+        code = response.get('Error', {}).get('Code')
+        return code in ('ThrottlingException', 'ServiceUnavailableException', 'ModelNotReadyException')
+    return False
+
+
+def _to_seconds(timestamp: str) -> int:
+    seconds = 0
+    for part in timestamp.split(':'):
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+
+def chapter_boundaries(lines: List[str], chapters: Optional[str]) -> Set[int]:
+    """定位各章节在内容中开始的行号
+
+    支持两种章节格式：带时间戳的章节（与字幕中的时间戳行对应）和网页标题（"h2: 标题"，按行内容匹配）。
+
+    Args:
+        lines: 按行拆分的内容
+        chapters: 章节信息，每行一个章节
+
+    Returns:
+        Set[int]: 章节开始的行号
+    """
+    if not chapters:
+        return set()
+
+    line_seconds: List[Tuple[int, int]] = []
+    for index, line in enumerate(lines):
+        match = TIMESTAMP_RE.match(line)
+        if match:
+            line_seconds.append((_to_seconds(match.group(1)), index))
+
+    boundaries = set()
+    for chapter in chapters.splitlines():
+        chapter = chapter.strip()
+        if not chapter:
+            continue
+        match = TIMESTAMP_RE.match(chapter)
+        if match and line_seconds:
+            start = _to_seconds(match.group(1))
+            index = next((i for seconds, i in line_seconds if seconds >= start), None)
+            if index is not None:
+                boundaries.add(index)
+            continue
+        heading = HEADING_CHAPTER_RE.match(chapter)
+        title = (heading.group(1) if heading else chapter).strip()
+        if title:
+            index = next((i for i, line in enumerate(lines) if line.strip().startswith(title)), None)
+            if index is not None:
+                boundaries.add(index)
+    return boundaries
+
+
+def _split_long_line(line: str, max_chars: int) -> List[str]:
+    """将超长的单行按句子切开，单个句子仍超长时直接截断"""
+    pieces: List[str] = []
+    current = ""
+    for sentence in SENTENCE_END_RE.split(line):
+        if not sentence:
+            continue
+        while len(sentence) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            separator = "" if not current or current[-1] in "。！？；" else " "
+            current = f"{current}{separator}{sentence}"
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_content(content: str, max_chars: int, chapters: Optional[str] = None) -> List[str]:
+    """按章节、时间戳和段落边界将内容切分为不超过 max_chars 的块
+
+    Args:
+        content: 原始内容
+        max_chars: 每块的最大字符数
+        chapters: 章节信息，块已达到一半大小时优先在章节开始处断开
+
+    Returns:
+        List[str]: 切分后的内容块
+    """
+    lines = content.split('\n')
+    boundaries = chapter_boundaries(lines, chapters)
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+
+    def flush():
+        nonlocal current, size
+        text = '\n'.join(current).strip()
+        if text:
+            chunks.append(text)
+        current = []
+        size = 0
+
+    for index, line in enumerate(lines):
+        if index in boundaries and size >= max_chars // 2:
+            flush()
+        units = _split_long_line(line, max_chars) if len(line) > max_chars else [line]
+        for unit in units:
+            if current and size + len(unit) + 1 > max_chars:
+                flush()
+            current.append(unit)
+            size += len(unit) + 1
+    flush()
+    return chunks
+
+
+class MapReduceSummarizer:
+    """超长内容的分层总结"""
+
+    # 进程内所有文章共享的分块总结并发限制
+    limiter = AdaptiveLimiter(
+        "summary_map",
+        initial_limit=settings.SUMMARY_MAP_CONCURRENCY,
+        min_limit=1,
+        max_limit=settings.SUMMARY_MAP_CONCURRENCY_MAX,
+        is_overload=is_llm_overload_error
+    )
+
+    # 笔记拼接后仍然过长时最多再做的轮数
+    MAX_ROUNDS = 3
+
+    @classmethod
+    async def condense(
+        cls,
+        content: str,
+        call: SummaryCall,
+        request_id: int,
+        lang: str,
+        chapters: Optional[str] = None,
+        max_chars: Optional[int] = None,
+        fair_key: str = "default"
+    ) -> str:
+        """将超长内容压缩为按顺序拼接的分块笔记，供原有总结提示词生成最终总结
+
+        Args:
+            content: 原始内容
+            call: 模型调用函数，如 OpenRouterService.call_summary_api 的偏函数
+            request_id: 请求ID
+            lang: 语言代码
+            chapters: 章节信息，仅第一轮切分时使用
+            max_chars: 每块的最大字符数，默认为 SUMMARY_CHUNK_MAX_CHARS
+            fair_key: 公平排队的分组标识，如文章ID
+
+        Returns:
+            str: 拼接后的分块笔记
+        """
+        max_chars = max_chars or settings.SUMMARY_CHUNK_MAX_CHARS
+        text = content
+        for round_index in range(1, cls.MAX_ROUNDS + 1):
+            chunks = split_content(text, max_chars, chapters if round_index == 1 else None)
+            logger.info(
+                f"分层总结第 {round_index} 轮: request_id={request_id}, lang={lang}, "
+                f"输入 {len(text)} 字符, 切分为 {len(chunks)} 块"
+            )
+            # 任一块失败时取消其余块的调用，不再为注定失败的总结继续消耗模型额度
+            graph = TaskGraph(f"分层总结第 {round_index} 轮")
+            for index, chunk in enumerate(chunks, start=1):
+                graph.add(
+                    f"chunk_{index}",
+                    partial(cls._summarize_chunk, chunk, index, len(chunks), call, request_id, lang, fair_key)
+                )
+            results = await graph.run()
+            notes = [results[f"chunk_{index}"] for index in range(1, len(chunks) + 1)]
+            text = "The following are detailed notes of consecutive parts of a long content, in order.\n\n" + "\n\n".join(
+                f"### Part {index}/{len(notes)}\n{note}" for index, note in enumerate(notes, start=1)
+            )
+            if len(text) <= settings.SUMMARY_MAP_REDUCE_THRESHOLD_CHARS or len(chunks) <= 1:
+                break
+        logger.info(f"分层总结笔记生成完成: request_id={request_id}, lang={lang}, {len(content)} -> {len(text)} 字符")
+        return text
+
+    @classmethod
+    async def _summarize_chunk(
+        cls,
+        chunk: str,
+        index: int,
+        total: int,
+        call: SummaryCall,
+        request_id: int,
+        lang: str,
+        fair_key: str
+    ) -> str:
+        """为单个内容块生成笔记"""
+        prompt = MAP_PROMPT.format(index=index, total=total, language="Chinese" if lang == 'zh' else "English")
+        async with cls.limiter.slot(fair_key):
+            response = await call(prompt, chunk, request_id, lang)
+
+        note = ((response or {}).get('choices') or [{}])[0].get('message', {}).get('content')
+        if not note:
+            raise Exception(f"分块总结返回内容为空: 第 {index}/{total} 块")
+        return note.strip()
@@ -1,15 +1,18 @@
-import httpx
-import boto3
 import json
-from botocore.config import Config
-from typing import Optional, Dict, Any
+from contextlib import aclosing
+from typing import Optional, Dict, Any, Awaitable, Callable, Tuple
 from app.config import settings
 from app.utils.logger import logger
 from app.repositories.prompt_repository import PromptRepository
 from app.repositories.supabase import SupabaseService
 from app.repositories.llm_records_repository import LLMRecordsRepository
 from app.utils.decorators import retry_decorator
-import requests
+from app.utils.http_client import HttpClientRegistry
+from app.services.bedrock_client import BedrockClientFactory
+from app.services.llm_cache import llm_cache
+from app.services.summary_stream import SummarySectionParser, ProgressiveSectionWriter
+from app.services.long_summary import MapReduceSummarizer
+from app.utils.token_estimator import TokenEstimator
 
 class OpenRouterService:
     # OpenRouter 配置
@@ -118,11 +121,11 @@ class OpenRouterService:
                     "temperature": 0.1
                 }
                 
-                response = requests.post(
+                response = await HttpClientRegistry.get_client("openrouter").post(
                     OpenRouterService.API_URL,
                     headers=headers,
                     json=request_data,
-                    timeout=30
+                    timeout=HttpClientRegistry.timeout("openrouter.classify")
                 )
                 
                 if response.status_code == 200:
@@ -144,6 +147,116 @@ class OpenRouterService:
             logger.error(f"游戏内容判断失败: {str(e)}")
             return False
 
+    @staticmethod
+    def build_bedrock_request(prompt: str, content: str) -> Dict[str, Any]:
+        """构建 Bedrock 总结请求体（Messages API 格式），max_tokens 按预估的输入 token 数确定
+        
+        Args:
+            prompt: 提示词
+            content: 需要总结的内容
+            
+        Returns:
+            Dict[str, Any]: 请求体
+        """
+        text = f"Please follow my requirement to summary the content\n\n{prompt}\n\n{content}"
+        # 输入加输出不能超出上下文窗口，长输入时相应减小 max_tokens
+        input_tokens = TokenEstimator.estimate_messages([text], OpenRouterService.BEDROCK_MODEL)
+        max_tokens = TokenEstimator.max_output_tokens(
+            OpenRouterService.BEDROCK_MODEL, input_tokens, OpenRouterService.BEDROCK_MAX_TOKENS
+        )
+        return {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max(max_tokens, settings.SUMMARY_MIN_OUTPUT_TOKENS),
+            "temperature": 0.1,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": text
+                }
+            ]
+        }
+
+    @staticmethod
+    def build_openrouter_request(prompt: str, content: str) -> Dict[str, Any]:
+        """构建 OpenRouter 总结请求体
+        
+        Args:
+            prompt: 提示词
+            content: 需要总结的内容
+            
+        Returns:
+            Dict[str, Any]: 请求体
+        """
+        return {
+            "model": OpenRouterService.MODEL,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": "Please follow my requirement to summary the content"
+                },
+                {
+                    "role": "system",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": prompt
+                        },
+                        {
+                            "type": "text",
+                            "text": content
+                        }
+                    ]
+                }
+            ],
+            "provider": {
+                "order": [
+                  "Amazon Bedrock",
+                  "Google"
+                ],
+                "allow_fallbacks": False
+            },
+            "temperature": 0.1
+        }
+
+    @staticmethod
+    def to_openrouter_format(text: str, usage: Dict[str, Any]) -> Dict[str, Any]:
+        """将 Bedrock 的输出转换为 OpenRouter 响应格式
+        
+        Args:
+            text: 模型输出的完整文本
+            usage: Bedrock 返回的 token 使用情况（input_tokens / output_tokens）
+            
+        Returns:
+            Dict[str, Any]: OpenRouter 格式的响应
+        """
+        return {
+            'choices': [{
+                'message': {
+                    'content': text
+                }
+            }],
+            'model': OpenRouterService.BEDROCK_MODEL,
+            'usage': {
+                'prompt_tokens': usage.get('input_tokens', 0),
+                'completion_tokens': usage.get('output_tokens', 0),
+                'total_tokens': usage.get('input_tokens', 0) + usage.get('output_tokens', 0)
+            }
+        }
+
+    @staticmethod
+    def calibrate_tokens(model: str, request_data: Optional[Dict[str, Any]], input_tokens: int) -> None:
+        """用 usage 中的实际输入 token 数校准 token 估算
+        
+        Args:
+            model: 模型ID
+            request_data: 请求体
+            input_tokens: 实际输入 token 数
+        """
+        if not request_data or not input_tokens:
+            return
+        raw_estimate = TokenEstimator.estimate_messages(TokenEstimator.message_texts(request_data.get("messages", [])))
+        TokenEstimator.calibrate(model, raw_estimate, input_tokens)
+
     @staticmethod
     @retry_decorator()
     async def call_bedrock_api(prompt: str, content: str, request_id: int, lang: str) -> Optional[Dict[str, Any]]:
@@ -163,71 +276,32 @@ class OpenRouterService:
         request_data = None
         
         try:
-            # 配置超时时间（长文本需要更长的处理时间）
-            config = Config(
-                read_timeout=300,  # 5分钟读取超时
-                connect_timeout=60,
-                retries={'max_attempts': 3}
-            )
-            
-            # 创建Bedrock客户端
-            bedrock_client = boto3.client(
-                'bedrock-runtime',
-                region_name=OpenRouterService.BEDROCK_REGION,
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                config=config
-            )
-            
             # 构建请求数据 - 使用Messages API格式
-            request_data = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": OpenRouterService.BEDROCK_MAX_TOKENS,
-                "temperature": 0.1,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": f"Please follow my requirement to summary the content\n\n{prompt}\n\n{content}"
-                    }
-                ]
-            }
+            request_data = OpenRouterService.build_bedrock_request(prompt, content)
             
             logger.info(f"正在调用AWS Bedrock API...")
             logger.info(f"模型: {OpenRouterService.BEDROCK_MODEL}")
             logger.info(f"区域: {OpenRouterService.BEDROCK_REGION}")
             logger.info(f"输入内容长度: {len(content)} 字符")
             
-            # 调用Bedrock API
-            response = bedrock_client.invoke_model(
-                modelId=OpenRouterService.BEDROCK_MODEL,
-                body=json.dumps(request_data),
-                contentType="application/json"
+            # 调用Bedrock API（长文本需要更长的处理时间，读取超时5分钟）
+            bedrock_response = await BedrockClientFactory.invoke_model(
+                model_id=OpenRouterService.BEDROCK_MODEL,
+                body=request_data,
+                region=OpenRouterService.BEDROCK_REGION,
+                read_timeout=300,
+                connect_timeout=60
             )
             
-            # 解析响应
-            response_body = response['body'].read()
-            bedrock_response = json.loads(response_body)
-            
             # 记录token使用情况
             usage = bedrock_response.get('usage', {})
             if usage:
                 logger.info(f"Bedrock Token使用情况: 输入={usage.get('input_tokens', 0)}, "
                           f"输出={usage.get('output_tokens', 0)}")
+                OpenRouterService.calibrate_tokens(OpenRouterService.BEDROCK_MODEL, request_data, usage.get('input_tokens', 0))
             
             # 转换为OpenRouter格式以保持兼容性
-            response_data = {
-                'choices': [{
-                    'message': {
-                        'content': bedrock_response['content'][0]['text']
-                    }
-                }],
-                'model': OpenRouterService.BEDROCK_MODEL,
-                'usage': {
-                    'prompt_tokens': usage.get('input_tokens', 0),
-                    'completion_tokens': usage.get('output_tokens', 0),
-                    'total_tokens': usage.get('input_tokens', 0) + usage.get('output_tokens', 0)
-                }
-            }
+            response_data = OpenRouterService.to_openrouter_format(bedrock_response['content'][0]['text'], usage)
             
             logger.info(f"Bedrock API调用成功")
             return response_data
@@ -277,77 +351,51 @@ class OpenRouterService:
                 "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}"
             }
             
-            request_data = {
-                "model": OpenRouterService.MODEL,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": "Please follow my requirement to summary the content"
-                    },
-                    {
-                        "role": "system",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": prompt
-                            },
-                            {
-                                "type": "text",
-                                "text": content
-                            }
-                        ]
-                    }
-                ],
-                "provider": {
-                    "order": [
-                      "Amazon Bedrock",
-                      "Google"
-                    ],
-                    "allow_fallbacks": False
-                },
-                "temperature": 0.1
-            }
+            request_data = OpenRouterService.build_openrouter_request(prompt, content)
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    OpenRouterService.API_URL,
-                    headers=headers,
-                    json=request_data,
-                    timeout=60.0
-                )
+            client = HttpClientRegistry.get_client("openrouter")
+            response = await client.post(
+                OpenRouterService.API_URL,
+                headers=headers,
+                json=request_data,
+                timeout=HttpClientRegistry.timeout("openrouter.summary")
+            )
                 
-                response_data = response.json()
+            response_data = response.json()
                 
-                # 检查错误响应
-                if 'error' in response_data:
-                    # 2024-03-14: 添加完整的响应数据日志
-                    logger.error(f"API完整响应数据: {response_data}")
-                    
-                    error_info = response_data['error']
-                    error_code = error_info.get('code', 0)
-                    error_message = error_info.get('message', 'Unknown error')
-                    metadata = error_info.get('metadata', {})
-                    # 2024-03-14: 添加provider信息到错误日志
-                    provider = response_data.get('provider', 'Unknown provider')
-                    
-                    error_msg = (
-                        f"OpenRouter API调用失败: \n"
-                        f"错误码: {error_code}\n"
-                        f"错误信息: {error_message}\n"
-                        f"Provider: {provider}\n"
-                        f"元数据: {metadata}"
-                    )
-                    logger.error(error_msg)
-                    raise Exception(error_msg)
+            # 检查错误响应
+            if 'error' in response_data:
+                # 2024-03-14: 添加完整的响应数据日志
+                logger.error(f"API完整响应数据: {response_data}")
                 
-                # 检查响应状态码
-                if response.status_code == 200:
-                    logger.info(f"OpenRouter API调用成功: {response_data}")
-                    return response_data
-                else:
-                    error_msg = f"OpenRouter API调用失败: HTTP状态码 {response.status_code}"
-                    logger.error(error_msg)
-                    raise Exception(error_msg)
+                error_info = response_data['error']
+                error_code = error_info.get('code', 0)
+                error_message = error_info.get('message', 'Unknown error')
+                metadata = error_info.get('metadata', {})
+                # 2024-03-14: 添加provider信息到错误日志
+                provider = response_data.get('provider', 'Unknown provider')
+                
+                error_msg = (
+                    f"OpenRouter API调用失败: \n"
+                    f"错误码: {error_code}\n"
+                    f"错误信息: {error_message}\n"
+                    f"Provider: {provider}\n"
+                    f"元数据: {metadata}"
+                )
+                logger.error(error_msg)
+                raise Exception(error_msg)
+                
+            # 检查响应状态码
+            if response.status_code == 200:
+                logger.info(f"OpenRouter API调用成功: {response_data}")
+                OpenRouterService.calibrate_tokens(
+                    OpenRouterService.MODEL, request_data, response_data.get('usage', {}).get('prompt_tokens', 0)
+                )
+                return response_data
+            else:
+                error_msg = f"OpenRouter API调用失败: HTTP状态码 {response.status_code}"
+                logger.error(error_msg)
+                raise Exception(error_msg)
                 
         except Exception as e:
             error_msg = str(e)
@@ -366,6 +414,335 @@ class OpenRouterService:
                 error_message=error_msg
             )
 
+    @staticmethod
+    async def stream_bedrock_api(
+        prompt: str,
+        content: str,
+        request_id: int,
+        lang: str,
+        on_text: Callable[[str], Awaitable[None]]
+    ) -> Dict[str, Any]:
+        """流式调用 AWS Bedrock API，每收到一段文本即回调 on_text
+        
+        Args:
+            prompt: 提示词
+            content: 需要总结的内容
+            request_id: 请求ID
+            lang: 语言代码
+            on_text: 接收文本增量的异步回调
+            
+        Returns:
+            Dict[str, Any]: 拼接完整后的响应（OpenRouter格式，与 call_bedrock_api 一致）
+        """
+        response_data = None
+        error_msg = None
+        request_data = OpenRouterService.build_bedrock_request(prompt, content)
+        
+        try:
+            logger.info(f"正在流式调用AWS Bedrock API: 模型={OpenRouterService.BEDROCK_MODEL}, 输入内容长度={len(content)} 字符")
+            
+            parts = []
+            usage = {}
+            stream = BedrockClientFactory.invoke_model_stream(
+                model_id=OpenRouterService.BEDROCK_MODEL,
+                body=request_data,
+                region=OpenRouterService.BEDROCK_REGION,
+                read_timeout=300,
+                connect_timeout=60
+            )
+            async with aclosing(stream):
+                async for chunk_data in stream:
+                    chunk_type = chunk_data.get('type')
+                    if chunk_type == 'message_start':
+                        usage['input_tokens'] = chunk_data.get('message', {}).get('usage', {}).get('input_tokens', 0)
+                    elif chunk_type == 'content_block_delta':
+                        delta = chunk_data.get('delta', {})
+                        if delta.get('type') == 'text_delta' and delta.get('text'):
+                            parts.append(delta['text'])
+                            await on_text(delta['text'])
+                    elif chunk_type == 'message_delta':
+                        usage['output_tokens'] = chunk_data.get('usage', {}).get('output_tokens', 0)
+            
+            logger.info(f"Bedrock Token使用情况: 输入={usage.get('input_tokens', 0)}, "
+                      f"输出={usage.get('output_tokens', 0)}")
+            OpenRouterService.calibrate_tokens(OpenRouterService.BEDROCK_MODEL, request_data, usage.get('input_tokens', 0))
+            response_data = OpenRouterService.to_openrouter_format("".join(parts), usage)
+            return response_data
+            
+        except Exception as e:
+            error_msg = str(e)
+            logger.error(f"Bedrock 流式API调用异常: {error_msg}")
+            raise
+            
+        finally:
+            await LLMRecordsRepository.create_record(
+                request_id=request_id,
+                provider="bedrock",
+                model=OpenRouterService.BEDROCK_MODEL,
+                prompt_type=f"summary_{lang}",
+                input_content=request_data,
+                output_content=response_data,
+                error_message=error_msg
+            )
+
+    @staticmethod
+    async def stream_openrouter_api(
+        prompt: str,
+        content: str,
+        request_id: int,
+        lang: str,
+        on_text: Callable[[str], Awaitable[None]]
+    ) -> Dict[str, Any]:
+        """流式调用 OpenRouter API，每收到一段文本即回调 on_text
+        
+        Args:
+            prompt: 提示词
+            content: 需要总结的内容
+            request_id: 请求ID
+            lang: 语言代码
+            on_text: 接收文本增量的异步回调
+            
+        Returns:
+            Dict[str, Any]: 拼接完整后的响应（与 call_openrouter_api 的格式一致）
+        """
+        response_data = None
+        error_msg = None
+        request_data = OpenRouterService.build_openrouter_request(prompt, content)
+        request_data["stream"] = True
+        # 在最后一个事件中返回 token 使用情况
+        request_data["usage"] = {"include": True}
+        
+        try:
+            parts = []
+            usage = {}
+            model = OpenRouterService.MODEL
+            client = HttpClientRegistry.get_client("openrouter")
+            async with client.stream(
+                "POST",
+                OpenRouterService.API_URL,
+                headers={
+                    "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
+                    "Accept": "text/event-stream"
+                },
+                json=request_data,
+                timeout=HttpClientRegistry.timeout("openrouter.summary_stream")
+            ) as response:
+                if response.status_code != 200:
+                    body = await response.aread()
+                    raise Exception(f"OpenRouter 流式API调用失败: HTTP状态码 {response.status_code}, "
+                                    f"响应: {body[:500].decode('utf-8', errors='replace')}")
+                
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    payload = line[6:].strip()
+                    if payload == "[DONE]":
+                        break
+                    try:
+                        data = json.loads(payload)
+                    except json.JSONDecodeError:
+                        logger.error(f"OpenRouter 流式响应JSON解析失败，原始数据为: {line}")
+                        continue
+                    
+                    if 'error' in data:
+                        raise Exception(f"OpenRouter 流式API返回错误: {data['error']}")
+                    model = data.get('model') or model
+                    if data.get('usage'):
+                        usage = data['usage']
+                    choices = data.get('choices') or []
+                    text = (choices[0].get('delta') or {}).get('content') if choices else None
+                    if text:
+                        parts.append(text)
+                        await on_text(text)
+            
+            OpenRouterService.calibrate_tokens(OpenRouterService.MODEL, request_data, usage.get('prompt_tokens', 0))
+            response_data = {
+                'choices': [{'message': {'content': "".join(parts)}}],
+                'model': model,
+                'usage': usage
+            }
+            return response_data
+            
+        except Exception as e:
+            error_msg = str(e)
+            logger.error(f"OpenRouter 流式API调用异常: {error_msg}")
+            raise
+            
+        finally:
+            await LLMRecordsRepository.create_record(
+                request_id=request_id,
+                provider="openrouter",
+                model=OpenRouterService.MODEL,
+                prompt_type=f"summary_{lang}",
+                input_content=request_data,
+                output_content=response_data,
+                error_message=error_msg
+            )
+
+    @staticmethod
+    async def stream_summary(
+        prompt: str,
+        content: str,
+        request_id: int,
+        article_id: int,
+        lang: str,
+        provider: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[ProgressiveSectionWriter]]:
+        """流式生成总结，边生成边将已完成的小节写入 keep_article_sections
+        
+        流式调用失败时删除已写入的中间内容并返回 (None, None)，由调用方回退到非流式调用；
+        输入超出上下文窗口时直接抛出异常。
+        
+        Args:
+            prompt: 提示词
+            content: 需要总结的内容
+            request_id: 请求ID
+            article_id: 文章ID
+            lang: 语言代码
+            provider: 'bedrock' 或 'openrouter'
+            
+        Returns:
+            Tuple[Optional[Dict[str, Any]], Optional[ProgressiveSectionWriter]]: 完整响应及中间内容写入器
+        """
+        parser = SummarySectionParser()
+        writer = ProgressiveSectionWriter(article_id, lang, min_interval=settings.SUMMARY_STREAM_FLUSH_INTERVAL)
+        
+        async def on_text(text: str) -> None:
+            parser.feed(text)
+            try:
+                await writer.publish(parser.completed_content(), force=parser.finished)
+            except Exception as e:
+                # 中间写入失败不影响生成，最终结果仍会完整保存
+                logger.error(f"写入流式总结中间内容失败: article_id={article_id}, 错误: {str(e)}")
+        
+        try:
+            if provider == "bedrock":
+                api_response = await OpenRouterService.stream_bedrock_api(prompt, content, request_id, lang, on_text)
+            else:
+                api_response = await OpenRouterService.stream_openrouter_api(prompt, content, request_id, lang, on_text)
+            logger.info(f"流式总结生成完成: request_id={request_id}, lang={lang}, 中间写入 {writer.writes} 次")
+            return api_response, writer
+        except Exception as e:
+            await writer.discard()
+            if OpenRouterService.is_input_too_long(e):
+                # 输入超出上下文窗口时非流式调用同样会失败，交由调用方改用分层总结
+                raise
+            logger.error(f"流式总结失败，回退到非流式调用: request_id={request_id}, 错误: {str(e)}")
+            return None, None
+
+    @staticmethod
+    def route_summary(prompt: str, content: str, provider: str) -> Tuple[str, bool]:
+        """调用前预估 token 数，选择总结使用的 Provider 及是否需要分块
+        
+        Args:
+            prompt: 提示词
+            content: 需要总结的内容
+            provider: 配置的 Provider
+            
+        Returns:
+            Tuple[str, bool]: (实际使用的 Provider, 是否需要分块总结)
+        """
+        candidates = [OpenRouterService.BEDROCK_MODEL, OpenRouterService.MODEL] if provider == "bedrock" else [OpenRouterService.MODEL]
+        route = TokenEstimator.choose_model(
+            candidates, [prompt, content],
+            desired_output=OpenRouterService.BEDROCK_MAX_TOKENS,
+            min_output=settings.SUMMARY_MIN_OUTPUT_TOKENS
+        )
+        if route is None:
+            return provider, True
+        if provider == "bedrock" and route[0] != OpenRouterService.BEDROCK_MODEL:
+            logger.info(f"预估输入超出 Bedrock 上下文窗口，改用 OpenRouter 长上下文模型: {route[0]}")
+            return "openrouter", False
+        return provider, False
+
+    @staticmethod
+    def is_input_too_long(error: Exception) -> bool:
+        """判断异常是否为输入超出模型上下文窗口"""
+        message = str(error).lower()
+        return any(keyword in message for keyword in (
+            "input is too long", "too long for requested model", "prompt is too long", "maximum context length"
+        ))
+
+    @staticmethod
+    async def call_summary_api(prompt: str, content: str, request_id: int, lang: str, provider: str) -> Optional[Dict[str, Any]]:
+        """按 Provider 非流式调用总结模型
+        
+        Args:
+            prompt: 提示词
+            content: 需要总结的内容
+            request_id: 请求ID
+            lang: 语言代码
+            provider: 'bedrock' 或 'openrouter'
+            
+        Returns:
+            Optional[Dict[str, Any]]: OpenRouter 格式的响应
+        """
+        if provider == "bedrock":
+            return await OpenRouterService.call_bedrock_api(prompt, content, request_id, lang)
+        return await OpenRouterService.call_openrouter_api(prompt, content, request_id, lang)
+
+    @staticmethod
+    async def generate_summary(
+        prompt: str,
+        content: str,
+        request_id: int,
+        article_id: int,
+        lang: str,
+        provider: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[ProgressiveSectionWriter]]:
+        """生成总结，启用流式时优先流式生成，失败时回退到非流式调用
+        
+        Args:
+            prompt: 提示词
+            content: 需要总结的内容
+            request_id: 请求ID
+            article_id: 文章ID
+            lang: 语言代码
+            provider: 'bedrock' 或 'openrouter'
+            
+        Returns:
+            Tuple[Optional[Dict[str, Any]], Optional[ProgressiveSectionWriter]]: 完整响应及流式中间内容写入器
+        """
+        if settings.SUMMARY_STREAMING_ENABLED:
+            api_response, stream_writer = await OpenRouterService.stream_summary(
+                prompt, content, request_id, article_id, lang, provider
+            )
+            if api_response is not None:
+                return api_response, stream_writer
+        return await OpenRouterService.call_summary_api(prompt, content, request_id, lang, provider), None
+
+    @staticmethod
+    async def condense_long_content(
+        content: str,
+        request_id: int,
+        article_id: int,
+        lang: str,
+        provider: str,
+        chapters: Optional[str] = None,
+        max_chars: Optional[int] = None
+    ) -> str:
+        """分块总结超长内容，返回供总结提示词使用的分块笔记
+        
+        Args:
+            content: 原始内容
+            request_id: 请求ID
+            article_id: 文章ID，用于公平排队
+            lang: 语言代码
+            provider: 'bedrock' 或 'openrouter'
+            chapters: 章节信息，用于选择切分位置
+            max_chars: 每块的最大字符数
+            
+        Returns:
+            str: 按顺序拼接的分块笔记
+        """
+        async def call(prompt: str, chunk: str, request_id: int, lang: str) -> Optional[Dict[str, Any]]:
+            return await OpenRouterService.call_summary_api(prompt, chunk, request_id, lang, provider)
+        
+        return await MapReduceSummarizer.condense(
+            content, call, request_id, lang,
+            chapters=chapters, max_chars=max_chars, fair_key=str(article_id)
+        )
+
     @staticmethod
     def validate_api_response(response: Optional[Dict[str, Any]], lang: str) -> Optional[str]:
         """验证API响应的有效性并提取内容
@@ -654,44 +1031,48 @@ class OpenRouterService:
             logger.info(f"开始调用翻译API，使用模型: {request_data['model']}")
             logger.info(f"翻译内容长度: {len(summary_content)} 字符")
             
-            async with httpx.AsyncClient() as client:
-                try:
-                    response = await client.post(
-                        OpenRouterService.API_URL,
-                        headers=headers,
-                        json=request_data,
-                        timeout=30.0
-                    )
-                    logger.info(f"翻译API响应状态码: {response.status_code}")
-                    logger.info(f"翻译API原始响应: {response.text}")
-                    
-                    response_data = response.json()
-                    logger.info(f"翻译API响应数据: {response_data}")
-                    
-                    if response.status_code == 200 and 'choices' in response_data:
-                        translated_content = response_data['choices'][0]['message']['content']
-                        logger.info(f"翻译成功，翻译后内容长度: {len(translated_content)} 字符")
-                        # 保存中文翻译结果
-                        await OpenRouterService.save_summary_result(article_id, translated_content, 'zh')
-                        logger.info(f"英文总结已成功翻译并保存为中文版本: article_id={article_id}")
-                    else:
-                        logger.error(f"翻译API调用失败: {response_data}")
-                except Exception as e:
-                    logger.error(f"翻译API请求过程中发生错误: {str(e)}", exc_info=True)
-                    
+            client = HttpClientRegistry.get_client("openrouter")
+            try:
+                response = await client.post(
+                    OpenRouterService.API_URL,
+                    headers=headers,
+                    json=request_data,
+                    timeout=HttpClientRegistry.timeout("openrouter.translate")
+                )
+                logger.info(f"翻译API响应状态码: {response.status_code}")
+                logger.info(f"翻译API原始响应: {response.text}")
+                
+                response_data = response.json()
+                logger.info(f"翻译API响应数据: {response_data}")
+                
+                if response.status_code == 200 and 'choices' in response_data:
+                    translated_content = response_data['choices'][0]['message']['content']
+                    logger.info(f"翻译成功，翻译后内容长度: {len(translated_content)} 字符")
+                    # 保存中文翻译结果
+                    await OpenRouterService.save_summary_result(article_id, translated_content, 'zh')
+                    logger.info(f"英文总结已成功翻译并保存为中文版本: article_id={article_id}")
+                else:
+                    logger.error(f"翻译API调用失败: {response_data}")
+            except Exception as e:
+                logger.error(f"翻译API请求过程中发生错误: {str(e)}", exc_info=True)
+                
         except Exception as e:
             # 翻译失败不影响主流程
             logger.error(f"翻译英文总结到中文时发生错误: {str(e)}")
 
     @staticmethod
-    async def get_summary(content: str, request_id: int, article_id: int, lang: str) -> Optional[str]:
+    async def get_summary(content: str, request_id: int, article_id: int, lang: str, chapters: Optional[str] = None) -> Optional[str]:
         """获取内容总结的主方法
         
+        调用前预估 token 数：Bedrock 放不下时改用 OpenRouter 长上下文模型，都放不下或模型返回输入过长时，
+        先分块总结再汇总。
+        
         Args:
             content: 需要总结的内容
             request_id: 请求ID  
             article_id: 文章ID
             lang: 语言代码
+            chapters: 章节信息，分块总结时用于选择切分位置
             
         Returns:
             Optional[str]: 总结结果，如果失败返回 None
@@ -706,27 +1087,66 @@ class OpenRouterService:
             if not prompt:
                 raise Exception("获取提示词失败")
             
-            # 2. 根据配置选择调用哪个API
-            provider = settings.LLM_SUMMARY_PROVIDER
-            logger.info(f"使用 {provider} 进行文章总结")
+            # 2. 根据配置及预估的 token 数选择调用哪个API，相同模型、提示词、内容和语言的结果直接复用缓存
+            provider, needs_chunking = OpenRouterService.route_summary(prompt, content, settings.LLM_SUMMARY_PROVIDER)
+            model = OpenRouterService.BEDROCK_MODEL if provider == "bedrock" else OpenRouterService.MODEL
+            cache_key = llm_cache.make_key(model, prompt, content, lang)
+            api_response = await llm_cache.get("summary", cache_key)
+            cache_hit = api_response is not None
             
-            if provider == "bedrock":
-                api_response = await OpenRouterService.call_bedrock_api(prompt, content, request_id, lang)
+            # 流式生成时已写入的中间内容
+            stream_writer = None
+            
+            if cache_hit:
+                logger.info(f"命中总结缓存: request_id={request_id}, lang={lang}")
             else:
-                api_response = await OpenRouterService.call_openrouter_api(prompt, content, request_id, lang)
+                logger.info(f"使用 {provider} 进行文章总结")
+                summary_input = content
+                if needs_chunking:
+                    logger.info(f"预估输入超出模型上下文窗口，使用分层总结: request_id={request_id}, 内容长度 {len(content)} 字符")
+                    summary_input = await OpenRouterService.condense_long_content(
+                        content, request_id, article_id, lang, provider, chapters
+                    )
+                try:
+                    api_response, stream_writer = await OpenRouterService.generate_summary(
+                        prompt, summary_input, request_id, article_id, lang, provider
+                    )
+                except Exception as e:
+                    if summary_input is not content or not OpenRouterService.is_input_too_long(e):
+                        raise
+                    logger.warning(f"输入超出模型上下文窗口，改用分层总结: request_id={request_id}, 内容长度 {len(content)} 字符")
+                    summary_input = await OpenRouterService.condense_long_content(
+                        content, request_id, article_id, lang, provider, chapters,
+                        max_chars=min(settings.SUMMARY_CHUNK_MAX_CHARS, len(content) // 2 + 1)
+                    )
+                    api_response, stream_writer = await OpenRouterService.generate_summary(
+                        prompt, summary_input, request_id, article_id, lang, provider
+                    )
             
-            # 3. 预处理响应
-            processed_response = OpenRouterService.preprocess_api_response(api_response)
-            if not processed_response:
-                raise Exception("预处理API响应失败")
+            try:
+                # 3. 预处理响应
+                processed_response = OpenRouterService.preprocess_api_response(api_response)
+                if not processed_response:
+                    raise Exception("预处理API响应失败")
+                
+                # 4. 验证响应
+                summary_content = OpenRouterService.validate_api_response(processed_response, lang)
+                if not summary_content:
+                    raise Exception("验证API响应失败")
+            except Exception:
+                # 最终结果不合格时，撤回流式过程中写入的中间内容
+                if stream_writer is not None:
+                    await stream_writer.discard()
+                raise
             
-            # 4. 验证响应
-            summary_content = OpenRouterService.validate_api_response(processed_response, lang)
-            if not summary_content:
-                raise Exception("验证API响应失败")
+            if not cache_hit:
+                await llm_cache.set("summary", cache_key, api_response)
             
-            # 5. 保存结果
-            await OpenRouterService.save_summary_result(article_id, summary_content, lang)
+            # 5. 保存结果（流式生成时用最终内容覆盖中间内容）
+            if stream_writer is not None and stream_writer.section_id is not None:
+                await SupabaseService.update_article_section(stream_writer.section_id, summary_content)
+            else:
+                await OpenRouterService.save_summary_result(article_id, summary_content, lang)
             
             # 6. 保存完整的LLM返回内容到detailed_content_zh字段
             if 'full_content' in processed_response:
@@ -2,6 +2,7 @@ from typing import Optional, Tuple
 from .base import PlatformParser
 from app.utils.logger import logger
 from app.models.article import ArticleCreate
+from app.utils.url_host import host_matches
 from bs4 import BeautifulSoup
 import requests
 import re
@@ -19,7 +20,8 @@ class WebPageParser(PlatformParser):
             'open.spotify.com',
             'xiaoyuzhoufm.com'
         ]
-        return not any(platform in url for platform in known_platforms)
+        # 只比较主机名，查询参数或路径中带有平台域名的普通网页仍然按网页处理
+        return not host_matches(url, known_platforms)
     
     async def parse(self, url: str) -> Optional[Tuple[str, str, str]]:
         """
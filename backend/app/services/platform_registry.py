@@ -0,0 +1,168 @@
+"""
+平台路由表
+
+ContentResolver 原来依次调用 8 个解析器的 can_handle，ContentFetcherService 每个操作
+（fetch_content / get_video_info / get_chapters / get_author_info）又依次调用 7 个获取器的 can_handle，
+每个请求还会重新创建全部解析器和获取器实例。PlatformRegistry 在进程内只建立一次：
+- 按域名（含子域名）和 scheme 建立索引，一次查表找到候选平台，再用 can_handle 确认
+- 都不匹配时交给通用网页的解析器 / 获取器
+- 同一个 URL 的查找结果按 LRU 缓存
+- 解析器和获取器实例在进程内共享（均不保存请求级状态）
+
+与原来按子串匹配的区别：只有域名属于某个平台时才会路由到该平台，
+查询参数或路径中包含平台域名的普通网页不会再被误判。
+"""
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from app.services.platform_parser.base import PlatformParser
+from app.services.platform_parser.github import GitHubParser
+from app.services.platform_parser.wechat import WeChatParser
+from app.services.platform_parser.bilibili import BilibiliParser
+from app.services.platform_parser.xiaoyuzhou import XiaoYuZhouParser
+from app.services.platform_parser.youtube import YouTubeParser
+from app.services.platform_parser.apple import ApplePodcastParser
+from app.services.platform_parser.spotify import SpotifyParser
+from app.services.platform_parser.webpage import WebPageParser
+from app.services.content_fetcher.base import ContentFetcher
+from app.services.content_fetcher.file import FileFetcher
+from app.services.content_fetcher.wechat import WeChatFetcher
+from app.services.content_fetcher.bilibili import BilibilitFetcher
+from app.services.content_fetcher.youtube import YouTubeFetcher
+from app.services.content_fetcher.xiaoyuzhou import XiaoYuZhouFetcher
+from app.services.content_fetcher.apple import ApplePodcastFetcher
+from app.services.content_fetcher.webpage import WebPageFetcher
+from app.utils.logger import logger
+
+
+class PlatformRoute:
+    """单个平台的路由：匹配的域名 / scheme 及对应的解析器和获取器"""
+
+    def __init__(
+        self,
+        name: str,
+        domains: Sequence[str] = (),
+        schemes: Sequence[str] = (),
+        parser: Optional[PlatformParser] = None,
+        fetcher: Optional[ContentFetcher] = None
+    ):
+        """
+        Args:
+            name: 平台名称
+            domains: 平台域名，同时匹配其子域名，如 'youtube.com' 匹配 'm.youtube.com'
+            schemes: 匹配的 URL scheme，如 'file'
+            parser: URL 解析器，平台不需要解析时为 None
+            fetcher: 内容获取器，平台没有获取器时为 None
+        """
+        self.name = name
+        self.domains = tuple(domain.lower() for domain in domains)
+        self.schemes = tuple(schemes)
+        self.parser = parser
+        self.fetcher = fetcher
+
+
+class PlatformRegistry:
+    """按域名索引的平台路由表"""
+
+    # 单个 URL 查找结果的缓存条数
+    CACHE_SIZE = 4096
+
+    _default: Optional["PlatformRegistry"] = None
+
+    def __init__(self, routes: Sequence[PlatformRoute], fallback: PlatformRoute):
+        """建立索引
+
+        Args:
+            routes: 各平台路由，同一域名有多个平台时按此顺序确认
+            fallback: 没有平台匹配时使用的路由（通用网页）
+        """
+        self.routes = list(routes)
+        self.fallback = fallback
+        self._by_domain: Dict[str, List[PlatformRoute]] = {}
+        self._by_scheme: Dict[str, List[PlatformRoute]] = {}
+        for route in self.routes:
+            for domain in route.domains:
+                self._by_domain.setdefault(domain, []).append(route)
+            for scheme in route.schemes:
+                self._by_scheme.setdefault(scheme, []).append(route)
+        self._lookup = lru_cache(maxsize=self.CACHE_SIZE)(self._match)
+
+    @classmethod
+    def default(cls) -> "PlatformRegistry":
+        """获取进程内共享的路由表，首次调用时创建
+
+        解析器的顺序与原 ContentResolver 一致（GitHub 优先走 Deep Research 分析），
+        获取器的顺序与原 ContentFetcherService 一致。
+        """
+        if cls._default is None:
+            cls._default = cls(
+                routes=[
+                    PlatformRoute("file", schemes=("file",), fetcher=FileFetcher()),
+                    PlatformRoute("github", domains=("github.com",), parser=GitHubParser()),
+                    PlatformRoute("wechat", domains=("mp.weixin.qq.com",), parser=WeChatParser(), fetcher=WeChatFetcher()),
+                    PlatformRoute(
+                        "bilibili", domains=("bilibili.com", "b23.tv"),
+                        parser=BilibiliParser(), fetcher=BilibilitFetcher()
+                    ),
+                    PlatformRoute(
+                        "xiaoyuzhou", domains=("xiaoyuzhoufm.com",),
+                        parser=XiaoYuZhouParser(), fetcher=XiaoYuZhouFetcher()
+                    ),
+                    PlatformRoute(
+                        "youtube", domains=("youtube.com", "youtu.be"),
+                        parser=YouTubeParser(), fetcher=YouTubeFetcher()
+                    ),
+                    PlatformRoute(
+                        "apple", domains=("podcasts.apple.com",),
+                        parser=ApplePodcastParser(), fetcher=ApplePodcastFetcher()
+                    ),
+                    PlatformRoute("spotify", domains=("open.spotify.com",), parser=SpotifyParser()),
+                ],
+                fallback=PlatformRoute("webpage", parser=WebPageParser(), fetcher=WebPageFetcher())
+            )
+            logger.info(f"平台路由表已建立: {[route.name for route in cls._default.routes]}")
+        return cls._default
+
+    @staticmethod
+    def _split(url: str) -> Tuple[str, str]:
+        """获取 URL 的 scheme 和小写主机名，兼容省略 scheme 的写法（如 'youtu.be/xxx'）"""
+        parts = urlsplit(url.strip() if "://" in url else f"//{url.strip()}")
+        return parts.scheme.lower(), (parts.hostname or "")
+
+    def _match(self, url: str) -> Tuple[Tuple[PlatformRoute, ...], Tuple[PlatformRoute, ...]]:
+        """查找 URL 的 (解析器路由, 获取器路由)，均已通过 can_handle 确认，按优先级排列"""
+        scheme, host = self._split(url)
+        candidates: List[PlatformRoute] = list(self._by_scheme.get(scheme, ()))
+        labels = host.split(".")
+        # 从完整主机名开始逐级去掉子域名查找，不单独匹配顶级域名
+        for i in range(max(len(labels) - 1, 0)):
+            candidates.extend(self._by_domain.get(".".join(labels[i:]), ()))
+        candidates.append(self.fallback)
+
+        parsers = tuple(route for route in candidates if route.parser and route.parser.can_handle(url))
+        fetchers = tuple(route for route in candidates if route.fetcher and route.fetcher.can_handle(url))
+        return parsers, fetchers
+
+    def parser_routes(self, url: str) -> Tuple[PlatformRoute, ...]:
+        """获取可以解析该 URL 的平台，按优先级排列
+
+        Args:
+            url: 原始URL
+
+        Returns:
+            Tuple[PlatformRoute, ...]: 前一个解析失败时依次尝试后一个
+        """
+        return self._lookup(url)[0]
+
+    def fetcher_route(self, url: str) -> Optional[PlatformRoute]:
+        """获取负责获取该 URL 内容的平台
+
+        Args:
+            url: 解析后的URL
+
+        Returns:
+            Optional[PlatformRoute]: 第一个可以处理该 URL 的平台，没有时返回 None
+        """
+        routes = self._lookup(url)[1]
+        return routes[0] if routes else None
@@ -344,7 +344,7 @@ class PrivateContentService:
                 'publish_date': datetime.now().strftime('%Y-%m-%d')  # 设置发布日期为当前日期
             }
             
-            result = client.table('keep_articles').insert(article_data).execute()
+            result = await SupabaseService.execute(client.table('keep_articles').insert(article_data))
             
             if result.data:
                 article = result.data[0]
@@ -476,7 +476,7 @@ class PrivateContentService:
             
             # 更新文章标题
             client = SupabaseService.get_client()
-            client.table('keep_articles').update({'title': final_title}).eq('id', article_id).execute()
+            await SupabaseService.execute(client.table('keep_articles').update({'title': final_title}).eq('id', article_id))
             logger.info(f"更新文章标题: article_id={article_id}, title={final_title}")
             
             # 更新状态为已完成
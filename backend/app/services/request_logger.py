@@ -1,6 +1,10 @@
 from contextlib import asynccontextmanager
+from collections import deque
+import asyncio
 import traceback
+from datetime import datetime, timezone
 from typing import Optional
+from app.config import settings
 from app.repositories.supabase import SupabaseService
 from app.models.log import LogCreate
 from app.utils.logger import logger
@@ -29,7 +33,19 @@ class Steps:
     BILIBILI_SUBTITLE_DOWNLOAD = "下载B站字幕"
 
 class RequestLogger:
-    """请求日志记录器"""
+    """请求日志记录器
+
+    日志先写入内存环形缓冲区，再由后台任务按数量或时间阈值批量写入数据库：
+    - ERROR 日志立即触发写入
+    - 应用关闭时清空缓冲区
+    - 缓冲区溢出或数据库不可用时丢弃的条数会被计数
+    """
+
+    _buffer: deque = deque(maxlen=settings.REQUEST_LOG_BUFFER_SIZE)
+    _flush_lock: Optional[asyncio.Lock] = None
+    _flush_task: Optional[asyncio.Task] = None
+    _pending_flush: Optional[asyncio.Task] = None
+    _dropped_count: int = 0
     
     @classmethod
     def log(
@@ -41,7 +57,7 @@ class RequestLogger:
         error_trace: Optional[str] = None,
         metadata: Optional[dict] = None
     ):
-        """记录日志到数据库"""
+        """记录日志到缓冲区，并同时输出到控制台"""
         try:
             log_data = LogCreate(
                 request_id=request_id,
@@ -50,10 +66,14 @@ class RequestLogger:
                 step=step,
                 error_trace=error_trace,
                 metadata=metadata
-            )
+            ).dict()
+            # 写入数据库可能延迟到批量写入时，记录产生日志的时间而不是写入时间
+            log_data["created_at"] = datetime.now(timezone.utc).isoformat()
             
-            client = SupabaseService.get_client()
-            result = client.table('keep_article_requests_logs').insert(log_data.dict()).execute()
+            # 缓冲区已满时，deque 会覆盖最旧的一条
+            if len(cls._buffer) == cls._buffer.maxlen:
+                cls._dropped_count += 1
+            cls._buffer.append(log_data)
             
             # 同时输出到控制台日志
             log_message = f"RequestID: {request_id} | Step: {step} | {message}"
@@ -62,11 +82,85 @@ class RequestLogger:
             else:
                 logger.info(log_message)
                 
-            return result.data[0] if result.data else None
+            return log_data
             
         except Exception as e:
             logger.error(f"写入日志失败: {str(e)}", exc_info=True)
 
+    @classmethod
+    def _get_lock(cls) -> asyncio.Lock:
+        if cls._flush_lock is None:
+            cls._flush_lock = asyncio.Lock()
+        return cls._flush_lock
+
+    @classmethod
+    async def flush(cls) -> int:
+        """将缓冲区中的日志批量写入数据库
+        
+        Returns:
+            int: 成功写入的条数
+        """
+        async with cls._get_lock():
+            written = 0
+            client = SupabaseService.get_client()
+            while cls._buffer:
+                batch_size = min(len(cls._buffer), settings.REQUEST_LOG_BATCH_SIZE)
+                batch = [cls._buffer.popleft() for _ in range(batch_size)]
+                try:
+                    await SupabaseService.execute(
+                        client.table('keep_article_requests_logs').insert(batch)
+                    )
+                    written += len(batch)
+                except Exception as e:
+                    # 数据库不可用时丢弃当前批次，剩余日志留待下次写入
+                    cls._dropped_count += len(batch)
+                    logger.error(
+                        f"批量写入日志失败，丢弃 {len(batch)} 条，累计丢弃 {cls._dropped_count} 条: {str(e)}"
+                    )
+                    break
+            return written
+
+    @classmethod
+    def _schedule_flush(cls):
+        """缓冲区达到批量阈值时，在后台触发一次写入"""
+        if cls._pending_flush is None or cls._pending_flush.done():
+            cls._pending_flush = asyncio.create_task(cls.flush())
+
+    @classmethod
+    async def _flush_loop(cls):
+        """按时间阈值定期写入"""
+        while True:
+            await asyncio.sleep(settings.REQUEST_LOG_FLUSH_INTERVAL)
+            try:
+                await cls.flush()
+            except Exception as e:
+                logger.error(f"定时写入日志失败: {str(e)}", exc_info=True)
+
+    @classmethod
+    def start(cls):
+        """启动定时写入任务"""
+        if cls._flush_task is None:
+            cls._flush_task = asyncio.create_task(cls._flush_loop())
+            logger.info("请求日志定时写入已启动")
+
+    @classmethod
+    async def shutdown(cls):
+        """停止定时写入任务，并写入缓冲区中剩余的日志"""
+        if cls._flush_task is not None:
+            cls._flush_task.cancel()
+            try:
+                await cls._flush_task
+            except asyncio.CancelledError:
+                pass
+            cls._flush_task = None
+        written = await cls.flush()
+        logger.info(f"请求日志缓冲区已清空: 写入 {written} 条，累计丢弃 {cls._dropped_count} 条")
+
+    @classmethod
+    def dropped_count(cls) -> int:
+        """获取累计丢弃的日志条数"""
+        return cls._dropped_count
+
     @classmethod
     async def info(
         cls,
@@ -76,7 +170,10 @@ class RequestLogger:
         metadata: Optional[dict] = None
     ):
         """记录信息级别日志"""
-        return cls.log(request_id, "INFO", message, step, metadata=metadata)
+        result = cls.log(request_id, "INFO", message, step, metadata=metadata)
+        if len(cls._buffer) >= settings.REQUEST_LOG_BATCH_SIZE:
+            cls._schedule_flush()
+        return result
 
     @classmethod
     async def error(
@@ -87,8 +184,8 @@ class RequestLogger:
         error: Exception,
         metadata: Optional[dict] = None
     ):
-        """记录错误级别日志"""
-        return cls.log(
+        """记录错误级别日志，并立即在后台触发写入，不阻塞调用方"""
+        result = cls.log(
             request_id,
             "ERROR",
             message,
@@ -96,6 +193,8 @@ class RequestLogger:
             error_trace=traceback.format_exc(),
             metadata=metadata
         )
+        cls._schedule_flush()
+        return result
 
     @classmethod
     @asynccontextmanager
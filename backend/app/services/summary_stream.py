@@ -0,0 +1,142 @@
+"""
+流式总结的增量解析与渐进保存
+
+总结模型的输出格式为 "## Summary" ... "## End"，之后可能跟随 "## Additional Processing"。
+流式生成时：
+- SummarySectionParser 按行解析到达的文本，识别 Summary 区块及其中的小标题
+- 某个小标题之后出现下一个小标题（或 "## End"）时，前面的小节视为已完成
+- ProgressiveSectionWriter 将已完成部分写入 keep_article_sections，首次插入、之后按ID更新，
+  并按时间间隔节流，避免每个 token 都写一次数据库
+最终内容仍以完整输出经 extract_summary_content / validate_api_response 处理后的结果为准。
+"""
+import time
+from typing import List, Optional
+
+from app.repositories.supabase import SupabaseService
+from app.utils.logger import logger
+
+
+class SummarySectionParser:
+    """增量解析总结输出中的 Summary 区块"""
+
+    START_MARKER = "## Summary"
+    END_MARKER = "## End"
+
+    def __init__(self):
+        # 尚未遇到换行的残余文本
+        self._pending = ""
+        self._summary_lines: List[str] = []
+        # Summary 区块内已完成部分的行数（下一个小标题之前的所有行）
+        self._completed_lines = 0
+        self._in_summary = False
+        self.finished = False
+
+    def feed(self, text: str) -> None:
+        """追加一段模型输出
+
+        Args:
+            text: 流式返回的文本增量
+        """
+        if self.finished or not text:
+            return
+        self._pending += text
+        if "\n" not in self._pending:
+            return
+        *lines, self._pending = self._pending.split("\n")
+        for line in lines:
+            self._process_line(line)
+            if self.finished:
+                break
+
+    def _process_line(self, line: str) -> None:
+        stripped = line.strip()
+        if not self._in_summary:
+            index = line.find(self.START_MARKER)
+            if index != -1:
+                self._in_summary = True
+                rest = line[index + len(self.START_MARKER):].strip()
+                if rest:
+                    self._summary_lines.append(rest)
+            return
+
+        if stripped.startswith(self.END_MARKER):
+            self._completed_lines = len(self._summary_lines)
+            self.finished = True
+            return
+
+        if stripped.startswith("#"):
+            # 新小标题出现，之前的小节已经完整
+            self._completed_lines = len(self._summary_lines)
+        self._summary_lines.append(line)
+
+    def completed_content(self) -> Optional[str]:
+        """获取 Summary 区块中已完成的部分
+
+        Returns:
+            Optional[str]: 已完成小节拼接后的内容，尚无完成的小节时返回 None
+        """
+        content = "\n".join(self._summary_lines[:self._completed_lines]).strip()
+        return content or None
+
+
+class ProgressiveSectionWriter:
+    """将逐步生成的小节内容写入 keep_article_sections"""
+
+    def __init__(self, article_id: int, lang: str, section_type: str = '总结', min_interval: float = 2.0):
+        """初始化写入器
+
+        Args:
+            article_id: 文章ID
+            lang: 语言代码
+            section_type: 小节类型
+            min_interval: 两次中间写入之间的最短间隔（秒）
+        """
+        self.article_id = article_id
+        self.lang = lang
+        self.section_type = section_type
+        self.min_interval = min_interval
+        self.section_id: Optional[int] = None
+        self.writes = 0
+        self._last_content: Optional[str] = None
+        self._last_write = 0.0
+
+    async def publish(self, content: Optional[str], force: bool = False) -> None:
+        """写入当前内容，内容未变化或距上次写入太近时跳过
+
+        Args:
+            content: 当前已完成的内容
+            force: 是否忽略写入间隔
+        """
+        if not content or content == self._last_content:
+            return
+        if not force and time.monotonic() - self._last_write < self.min_interval:
+            return
+
+        if self.section_id is None:
+            rows = await SupabaseService.create_article_sections(self.article_id, [
+                {
+                    'article_id': self.article_id,
+                    'content': content,
+                    'language': self.lang,
+                    'section_type': self.section_type
+                }
+            ])
+            self.section_id = rows[0]['id'] if rows else None
+        else:
+            await SupabaseService.update_article_section(self.section_id, content)
+
+        self._last_content = content
+        self._last_write = time.monotonic()
+        self.writes += 1
+
+    async def discard(self) -> None:
+        """删除已写入的中间内容，用于流式生成失败或最终校验不通过"""
+        if self.section_id is None:
+            return
+        try:
+            await SupabaseService.delete_article_section_by_id(self.section_id)
+        except Exception as e:
+            logger.error(f"删除流式总结中间内容失败: section_id={self.section_id}, 错误: {str(e)}")
+        finally:
+            self.section_id = None
+            self._last_content = None
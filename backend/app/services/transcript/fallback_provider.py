@@ -31,7 +31,7 @@ class TranscriptFallbackProvider:
 
     async def transcribe_from_xiaoyuzhou(self, title: str, podcast_url: str) -> Optional[str]:
         logger.info(f"[XZ Fallback] Start resolve audio by title. podcast_url='{podcast_url}' title='{title[:80]}'")
-        audio_url = self.resolver.find_episode_audio(podcast_url, title)
+        audio_url = await self.resolver.find_episode_audio(podcast_url, title)
         if not audio_url:
             logger.warning("[XZ Fallback] No matched episode audio url found.")
             return None
@@ -4,8 +4,8 @@ from difflib import SequenceMatcher
 from typing import Optional
 from urllib.parse import urljoin
 
-import requests
 from bs4 import BeautifulSoup
+from app.utils.page_cache import page_cache
 from app.utils.logger import logger
 
 
@@ -34,11 +34,15 @@ class XiaoYuZhouResolver:
         text = re.sub(r"[\[\]（）()【】<>《》:：,.!?！？、·-]", "", text)
         return text.lower()
 
-    def _find_episode_links(self, podcast_url: str) -> list[str]:
-        logger.info(f"[XZ Resolver] Fetch podcast page: {podcast_url}")
-        resp = requests.get(podcast_url, headers=self.headers, timeout=20)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
+    async def _find_episode_links(self, podcast_url: str, refresh: bool = False) -> list[str]:
+        """List episode links on a podcast page.
+
+        The listing is served from the page cache within its TTL; pass refresh=True to
+        revalidate it upstream when looking for a newly published episode.
+        """
+        logger.info(f"[XZ Resolver] Fetch podcast page: {podcast_url} (refresh={refresh})")
+        html = await page_cache.get_html(podcast_url, headers=self.headers, timeout=20, refresh=refresh)
+        soup = BeautifulSoup(html, "html.parser")
         links: list[str] = []
         for a in soup.find_all("a", href=True):
             href = a["href"]
@@ -49,17 +53,16 @@ class XiaoYuZhouResolver:
         logger.info(f"[XZ Resolver] episode links found: {len(uniq)}")
         return uniq
 
-    def _get_episode_meta(self, episode_url: str) -> tuple[str, str]:
-        resp = requests.get(episode_url, headers=self.headers, timeout=20)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
+    async def _get_episode_meta(self, episode_url: str) -> tuple[str, str]:
+        html = await page_cache.get_html(episode_url, headers=self.headers, timeout=20)
+        soup = BeautifulSoup(html, "html.parser")
         title_meta = soup.find("meta", property="og:title")
         audio_meta = soup.find("meta", property="og:audio")
         title = title_meta.get("content", "") if title_meta else ""
         audio = audio_meta.get("content", "") if audio_meta else ""
         return title, audio
 
-    def find_episode_audio(self, podcast_url: str, title: str, threshold: float = 0.75) -> Optional[str]:
+    async def find_episode_audio(self, podcast_url: str, title: str, threshold: float = 0.75) -> Optional[str]:
         """Find best-matching episode by title and return audio URL.
 
         Args:
@@ -75,21 +78,30 @@ class XiaoYuZhouResolver:
 
         best_audio: Optional[str] = None
         best_score: float = 0.0
+        seen: set[str] = set()
 
-        for ep in self._find_episode_links(podcast_url):
-            try:
-                ep_title, ep_audio = self._get_episode_meta(ep)
-                if not ep_title or not ep_audio:
+        # A cached listing may predate the episode being matched: on a miss, revalidate
+        # the listing once and only score the links that were not seen before.
+        for refresh in (False, True):
+            if refresh and best_score >= threshold:
+                break
+            for ep in await self._find_episode_links(podcast_url, refresh=refresh):
+                if ep in seen:
+                    continue
+                seen.add(ep)
+                try:
+                    ep_title, ep_audio = await self._get_episode_meta(ep)
+                    if not ep_title or not ep_audio:
+                        continue
+                    score = SequenceMatcher(None, target, self._normalize_title(ep_title)).ratio()
+                    logger.info(f"[XZ Resolver] candidate score={score:.3f} title='{ep_title[:60]}' audio={'yes' if ep_audio else 'no'}")
+                    if score > best_score:
+                        best_score = score
+                        best_audio = ep_audio
+                    if best_score >= 0.99:  # perfect early-stop
+                        break
+                except Exception:
                     continue
-                score = SequenceMatcher(None, target, self._normalize_title(ep_title)).ratio()
-                logger.info(f"[XZ Resolver] candidate score={score:.3f} title='{ep_title[:60]}' audio={'yes' if ep_audio else 'no'}")
-                if score > best_score:
-                    best_score = score
-                    best_audio = ep_audio
-                if best_score >= 0.99:  # perfect early-stop
-                    break
-            except Exception:
-                continue
         ok = best_audio if best_score >= threshold else None
         logger.info(f"[XZ Resolver] best_score={best_score:.3f} threshold={threshold} matched={'yes' if ok else 'no'}")
         return ok
@@ -0,0 +1,195 @@
+"""
+进程级自适应并发限制器
+
+替代每次调用各自创建的 asyncio.Semaphore，同一上游服务的所有调用共享一个限制器：
+- AIMD 调整并发上限：每次成功缓慢增加，遇到 429 / 超时 / 网关错误时按比例快速下降
+- 公平排队：按调用方提供的 key（如文章ID）轮转分配名额，单篇长文章不会占满所有并发
+- 提供并发上限、执行中调用数、排队数等指标
+"""
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Deque, Dict, Optional
+
+import httpx
+
+from app.utils.logger import logger
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """判断异常是否表示上游过载
+
+    Args:
+        exc: 调用抛出的异常
+
+    Returns:
+        bool: 超时或 429 / 502 / 503 / 504 时返回 True
+    """
+    if isinstance(exc, httpx.TimeoutException):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in (429, 502, 503, 504)
+    return False
+
+
+class AdaptiveLimiter:
+    """AIMD 自适应并发限制器"""
+
+    # 名称 -> 实例，用于导出指标
+    _instances: Dict[str, "AdaptiveLimiter"] = {}
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        decrease_factor: float = 0.5,
+        decrease_cooldown: float = 5.0,
+        is_overload: Callable[[BaseException], bool] = is_overload_error
+    ):
+        """初始化限制器
+
+        Args:
+            name: 限制器名称，通常为上游服务名
+            initial_limit: 初始并发上限
+            min_limit: 并发上限的下限
+            max_limit: 并发上限的上限
+            decrease_factor: 过载时并发上限的缩小比例
+            decrease_cooldown: 两次缩小之间的最短间隔（秒），避免同一批超时连续缩小
+            is_overload: 判断异常是否表示上游过载
+        """
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.is_overload = is_overload
+
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        # key -> 等待中的调用，按 key 轮转分配名额
+        self._queues: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self._last_decrease = 0.0
+        self._counters = {"success": 0, "overload": 0, "error": 0}
+        AdaptiveLimiter._instances[name] = self
+
+    @property
+    def limit(self) -> int:
+        """当前并发上限"""
+        return max(self.min_limit, int(self._limit))
+
+    def queue_depth(self) -> int:
+        """当前排队的调用数"""
+        return sum(len(queue) for queue in self._queues.values())
+
+    @asynccontextmanager
+    async def slot(self, key: str = "default") -> AsyncIterator[None]:
+        """获取一个并发名额
+
+        用法:
+            async with limiter.slot(key=str(article_id)):
+                await call_upstream()
+
+        Args:
+            key: 公平排队的分组标识，如文章ID
+        """
+        await self._acquire(key)
+        try:
+            yield
+        except BaseException as e:
+            if self.is_overload(e):
+                self._on_overload()
+            elif not isinstance(e, asyncio.CancelledError):
+                self._counters["error"] += 1
+            raise
+        else:
+            self._on_success()
+        finally:
+            self._release()
+
+    async def _acquire(self, key: str) -> None:
+        if self._in_flight < self.limit and not self._queues:
+            self._in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(key, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 已分配到名额但调用方被取消，归还名额
+                self._release()
+            else:
+                self._remove_waiter(key, future)
+            raise
+
+    def _remove_waiter(self, key: str, future: asyncio.Future) -> None:
+        queue = self._queues.get(key)
+        if queue is None:
+            return
+        try:
+            queue.remove(future)
+        except ValueError:
+            pass
+        if not queue:
+            del self._queues[key]
+
+    def _dispatch(self) -> None:
+        """按 key 轮转，将空闲名额分配给排队中的调用"""
+        while self._in_flight < self.limit and self._queues:
+            key, queue = next(iter(self._queues.items()))
+            future = queue.popleft()
+            if queue:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+            if future.done():
+                continue
+            self._in_flight += 1
+            future.set_result(None)
+
+    def _release(self) -> None:
+        self._in_flight = max(0, self._in_flight - 1)
+        self._dispatch()
+
+    def _on_success(self) -> None:
+        self._counters["success"] += 1
+        # 加性增加：大约每完成一轮（当前上限次）成功调用，上限加 1
+        self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+
+    def _on_overload(self) -> None:
+        self._counters["overload"] += 1
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+        logger.warning(f"上游过载，降低并发上限: {self.name} {previous} -> {self.limit}")
+
+    def stats(self) -> Dict[str, float]:
+        """获取限制器状态
+
+        Returns:
+            Dict[str, float]: 并发上限、执行中调用数、排队数、排队分组数及成功 / 过载 / 失败次数
+        """
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth(),
+            "queued_keys": len(self._queues),
+            **self._counters
+        }
+
+    @classmethod
+    def all_stats(cls) -> Dict[str, Dict[str, float]]:
+        """获取所有限制器的状态"""
+        return {name: limiter.stats() for name, limiter in cls._instances.items()}
+
+    @classmethod
+    def get(cls, name: str) -> Optional["AdaptiveLimiter"]:
+        """按名称获取限制器"""
+        return cls._instances.get(name)
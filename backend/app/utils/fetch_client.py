@@ -0,0 +1,238 @@
+"""
+内容抓取共享的异步 HTTP 客户端
+
+各平台的内容获取器原来在 async 方法里直接调用阻塞的 requests，每次下载页面都会卡住事件循环，
+期间对话等其他请求也无法响应。FetchClient 为所有获取器提供统一的异步抓取：
+- 按主机在 HttpClientRegistry 中注册 httpx.AsyncClient，每个主机独立的连接池，保持长连接
+- 按主机限制同时进行的请求数，避免对同一站点并发过高触发风控
+- GET / HEAD 在连接失败、超时及 429 / 5xx 时按指数退避重试，优先遵循 Retry-After
+- 主机数超过上限时关闭最久未使用且没有进行中请求的连接池
+"""
+import asyncio
+import random
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from charset_normalizer import from_bytes
+
+from app.config import settings
+from app.utils.http_client import HttpClientRegistry
+from app.utils.logger import logger
+
+# 可以安全重试的请求方法
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# 需要重试的响应状态码
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# 单次退避的最长等待时间（秒）
+MAX_BACKOFF = 30.0
+# HTML 中声明的字符集，如 <meta charset="gbk"> 或 content="text/html; charset=gb2312"
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_\-]+)', re.IGNORECASE)
+
+
+class _HostPool:
+    """单个主机的连接池及统计"""
+
+    def __init__(self, name: str, client: httpx.AsyncClient):
+        self.name = name
+        self.client = client
+        self.in_flight = 0
+        self.stats = {"requests": 0, "retries": 0, "errors": 0}
+
+
+class FetchClient:
+    """内容抓取的异步 HTTP 客户端"""
+
+    # (主机, 是否校验证书) -> 连接池，按最近使用排序
+    _pools: "OrderedDict[Tuple[str, bool], _HostPool]" = OrderedDict()
+    # 主机 -> 并发限制
+    _semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    @classmethod
+    def _create_pool(cls, host: str, verify: bool) -> _HostPool:
+        name = f"fetch:{host}" if verify else f"fetch:{host}:insecure"
+        client = HttpClientRegistry.register(
+            name,
+            max_connections=settings.FETCH_MAX_CONNECTIONS_PER_HOST,
+            timeout=httpx.Timeout(settings.FETCH_TIMEOUT, connect=10.0),
+            verify=verify
+        )
+        return _HostPool(name, client)
+
+    @classmethod
+    async def _get_pool(cls, host: str, verify: bool) -> _HostPool:
+        """获取主机的连接池，不存在时创建，并淘汰多余的空闲连接池"""
+        key = (host, verify)
+        pool = cls._pools.get(key)
+        if pool is not None and not pool.client.is_closed:
+            cls._pools.move_to_end(key)
+            return pool
+
+        pool = cls._create_pool(host, verify)
+        cls._pools[key] = pool
+
+        idle = [k for k, p in cls._pools.items() if p.in_flight == 0 and k != key]
+        for evicted in idle[:max(0, len(cls._pools) - settings.FETCH_MAX_HOSTS)]:
+            evicted_pool = cls._pools.pop(evicted)
+            await HttpClientRegistry.close(evicted_pool.name)
+            if not any(k[0] == evicted[0] for k in cls._pools):
+                cls._semaphores.pop(evicted[0], None)
+        return pool
+
+    @classmethod
+    def _semaphore(cls, host: str) -> asyncio.Semaphore:
+        semaphore = cls._semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(settings.FETCH_HOST_CONCURRENCY)
+            cls._semaphores[host] = semaphore
+        return semaphore
+
+    @staticmethod
+    def _backoff(attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """计算第 attempt 次重试前的等待时间，响应带有 Retry-After（秒）时优先使用"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), MAX_BACKOFF)
+        delay = settings.FETCH_RETRY_BACKOFF * (2 ** attempt)
+        return min(delay, MAX_BACKOFF) * random.uniform(0.8, 1.2)
+
+    @classmethod
+    async def request(
+        cls,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        timeout: Optional[float] = None,
+        verify: bool = True,
+        follow_redirects: bool = True,
+        retries: Optional[int] = None
+    ) -> httpx.Response:
+        """发送请求并读取完整响应
+
+        非 2xx 响应在重试用尽后照常返回，由调用方检查状态码。
+
+        Args:
+            method: 请求方法
+            url: 请求地址
+            headers: 请求头
+            params: 查询参数
+            json: JSON 请求体
+            timeout: 超时时间（秒），默认为 FETCH_TIMEOUT
+            verify: 是否校验证书
+            follow_redirects: 是否跟随重定向
+            retries: 最大重试次数，默认为 FETCH_MAX_RETRIES，非幂等请求不重试
+
+        Returns:
+            httpx.Response: 响应
+
+        Raises:
+            httpx.HTTPError: 重试用尽后仍然连接失败或超时
+        """
+        method = method.upper()
+        host = urlsplit(url).hostname or ""
+        max_retries = settings.FETCH_MAX_RETRIES if retries is None else retries
+        if method not in IDEMPOTENT_METHODS:
+            max_retries = 0
+
+        pool = await cls._get_pool(host, verify)
+        # 整个调用期间（含退避等待）保持计数，避免连接池在重试间隙被淘汰关闭
+        pool.in_flight += 1
+        try:
+            attempt = 0
+            while True:
+                pool.stats["requests"] += 1
+                response = None
+                try:
+                    async with cls._semaphore(host):
+                        response = await pool.client.request(
+                            method,
+                            url,
+                            headers=headers,
+                            params=params,
+                            json=json,
+                            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+                            follow_redirects=follow_redirects
+                        )
+                    if response.status_code not in RETRY_STATUSES or attempt >= max_retries:
+                        return response
+                    reason = f"HTTP {response.status_code}"
+                except httpx.TransportError as e:
+                    if attempt >= max_retries:
+                        pool.stats["errors"] += 1
+                        raise
+                    reason = f"{type(e).__name__}: {str(e)}"
+
+                delay = cls._backoff(attempt, response)
+                attempt += 1
+                pool.stats["retries"] += 1
+                logger.warning(f"抓取失败，{delay:.1f} 秒后第 {attempt} 次重试: {method} {url}, 原因: {reason}")
+                await asyncio.sleep(delay)
+        finally:
+            pool.in_flight -= 1
+
+    @classmethod
+    async def get(cls, url: str, **kwargs) -> httpx.Response:
+        """发送 GET 请求，参数同 request"""
+        return await cls.request("GET", url, **kwargs)
+
+    @classmethod
+    async def head(cls, url: str, **kwargs) -> httpx.Response:
+        """发送 HEAD 请求，参数同 request"""
+        return await cls.request("HEAD", url, **kwargs)
+
+    @staticmethod
+    def html_text(response: httpx.Response) -> str:
+        """按响应头或页面中声明的字符集解码 HTML
+
+        都没有声明时先按 UTF-8 解码，不是合法的 UTF-8 时检测字符集（如未声明的 GBK / GB2312 中文网页），
+        检测不出时按 UTF-8 解码并替换无法解码的字节。
+
+        Args:
+            response: 响应
+
+        Returns:
+            str: 解码后的文本
+        """
+        if response.charset_encoding:
+            return response.text
+        content = response.content
+        match = META_CHARSET_RE.search(content[:4096])
+        if match:
+            try:
+                return content.decode(match.group(1).decode("ascii"), errors="replace")
+            except LookupError:
+                pass
+        try:
+            return content.decode("utf-8")
+        except UnicodeDecodeError:
+            pass
+        best = from_bytes(content).best()
+        if best is not None:
+            return str(best)
+        return content.decode("utf-8", errors="replace")
+
+    @classmethod
+    async def shutdown(cls):
+        """应用关闭时释放所有连接池"""
+        for pool in list(cls._pools.values()):
+            await HttpClientRegistry.close(pool.name)
+        logger.info(f"内容抓取客户端已关闭: {len(cls._pools)} 个主机")
+        cls._pools.clear()
+        cls._semaphores.clear()
+
+    @classmethod
+    def stats(cls) -> Dict[str, Dict[str, int]]:
+        """获取各主机的请求数、重试次数、失败次数和进行中的请求数"""
+        result: Dict[str, Dict[str, int]] = {}
+        for (host, _), pool in cls._pools.items():
+            stats = result.setdefault(host, {"requests": 0, "retries": 0, "errors": 0, "in_flight": 0})
+            for field, value in pool.stats.items():
+                stats[field] += value
+            stats["in_flight"] += pool.in_flight
+        return result
@@ -0,0 +1,202 @@
+"""
+进程级 HTTP 客户端注册表
+
+为每个上游服务维护一个长期存活的 httpx.AsyncClient：
+- 应用启动时创建，关闭时统一释放
+- 每个客户端只访问一个主机，连接池上限即为该主机的连接上限
+- 保持长连接，避免每次调用重复 TCP/TLS 握手
+- 可选 HTTP/2（需要安装 h2）
+- 超时按接口配置
+- 统计请求数与新建连接数，用于观察连接复用率
+- 支持按需注册和关闭的动态客户端，如内容抓取按主机创建的连接池
+"""
+from typing import Dict, Optional
+
+import httpx
+
+from app.config import settings
+from app.utils.logger import logger
+
+
+class HttpClientRegistry:
+    """上游服务 HTTP 客户端注册表"""
+
+    # 各上游服务的连接池配置
+    PROVIDERS: Dict[str, Dict[str, int]] = {
+        "coze": {"max_connections": 32, "max_keepalive_connections": 32},
+        "openrouter": {"max_connections": 64, "max_keepalive_connections": 32},
+    }
+
+    # 各接口的超时配置
+    TIMEOUTS: Dict[str, httpx.Timeout] = {
+        "coze.workflow": httpx.Timeout(300.0, connect=60.0),
+        "openrouter.summary": httpx.Timeout(60.0),
+        "openrouter.summary_stream": httpx.Timeout(120.0, connect=30.0),
+        "openrouter.translate": httpx.Timeout(30.0),
+        "openrouter.classify": httpx.Timeout(30.0),
+        "openrouter.chat_stream": httpx.Timeout(120.0),
+    }
+
+    DEFAULT_TIMEOUT = httpx.Timeout(60.0)
+
+    _clients: Dict[str, httpx.AsyncClient] = {}
+    _stats: Dict[str, Dict[str, int]] = {}
+    _http2: Optional[bool] = None
+
+    @classmethod
+    def _http2_enabled(cls) -> bool:
+        """判断是否启用 HTTP/2，未安装 h2 时自动降级为 HTTP/1.1"""
+        if cls._http2 is None:
+            cls._http2 = False
+            if settings.HTTP2_ENABLED:
+                try:
+                    import h2  # noqa: F401
+                    cls._http2 = True
+                except ImportError:
+                    logger.warning("HTTP2_ENABLED 已开启但未安装 h2，使用 HTTP/1.1")
+        return cls._http2
+
+    @classmethod
+    def _create_client(
+        cls,
+        name: str,
+        limits: httpx.Limits,
+        timeout: httpx.Timeout,
+        verify: bool = True
+    ) -> httpx.AsyncClient:
+        """创建带统计钩子的客户端"""
+        stats = cls._stats.setdefault(name, {"requests": 0, "connections_opened": 0})
+
+        async def trace(event_name: str, info: dict):
+            # httpcore 在建立新 TCP 连接时触发该事件，复用连接时不会触发
+            if event_name.endswith("connect_tcp.complete"):
+                stats["connections_opened"] += 1
+
+        async def on_request(request: httpx.Request):
+            stats["requests"] += 1
+            request.extensions["trace"] = trace
+
+        return httpx.AsyncClient(
+            http2=cls._http2_enabled(),
+            verify=verify,
+            timeout=timeout,
+            limits=limits,
+            event_hooks={"request": [on_request]}
+        )
+
+    @classmethod
+    def get_client(cls, name: str) -> httpx.AsyncClient:
+        """获取指定上游服务的客户端，未初始化时按需创建
+
+        Args:
+            name: 上游服务名称，如 'coze'、'openrouter'
+
+        Returns:
+            httpx.AsyncClient: 共享的客户端实例，调用方不要关闭它
+        """
+        client = cls._clients.get(name)
+        if client is None or client.is_closed:
+            config = cls.PROVIDERS.get(name, {})
+            client = cls._create_client(
+                name,
+                httpx.Limits(
+                    max_connections=config.get("max_connections", 32),
+                    max_keepalive_connections=config.get("max_keepalive_connections", 16),
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+                ),
+                cls.DEFAULT_TIMEOUT
+            )
+            cls._clients[name] = client
+        return client
+
+    @classmethod
+    def register(
+        cls,
+        name: str,
+        max_connections: int,
+        timeout: httpx.Timeout,
+        verify: bool = True
+    ) -> httpx.AsyncClient:
+        """获取或创建动态客户端，由调用方决定何时通过 close 释放
+
+        Args:
+            name: 客户端名称，如 'fetch:www.bilibili.com'
+            max_connections: 连接池上限（同时作为长连接上限）
+            timeout: 默认超时配置
+            verify: 是否校验证书
+
+        Returns:
+            httpx.AsyncClient: 共享的客户端实例，调用方不要直接关闭它
+        """
+        client = cls._clients.get(name)
+        if client is None or client.is_closed:
+            client = cls._create_client(
+                name,
+                httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+                ),
+                timeout,
+                verify=verify
+            )
+            cls._clients[name] = client
+        return client
+
+    @classmethod
+    async def close(cls, name: str):
+        """关闭并移除指定客户端及其统计，不存在时忽略
+
+        Args:
+            name: 客户端名称
+        """
+        client = cls._clients.pop(name, None)
+        cls._stats.pop(name, None)
+        if client is not None:
+            await client.aclose()
+
+    @classmethod
+    def timeout(cls, endpoint: str) -> httpx.Timeout:
+        """获取接口对应的超时配置
+
+        Args:
+            endpoint: 接口名称，格式为 '服务.接口'，如 'coze.workflow'
+
+        Returns:
+            httpx.Timeout: 超时配置，未配置时返回默认值
+        """
+        return cls.TIMEOUTS.get(endpoint, cls.DEFAULT_TIMEOUT)
+
+    @classmethod
+    def startup(cls):
+        """应用启动时创建所有客户端"""
+        for name in cls.PROVIDERS:
+            cls.get_client(name)
+        logger.info(f"HTTP 客户端已创建: {list(cls.PROVIDERS)}, http2={cls._http2_enabled()}")
+
+    @classmethod
+    async def shutdown(cls):
+        """应用关闭时释放所有客户端连接"""
+        for name, client in list(cls._clients.items()):
+            await client.aclose()
+            logger.info(f"HTTP 客户端已关闭: {name}, 统计: {cls.stats().get(name)}")
+        cls._clients.clear()
+
+    @classmethod
+    def stats(cls) -> Dict[str, Dict[str, float]]:
+        """获取各客户端的连接复用统计
+
+        Returns:
+            Dict[str, Dict[str, float]]: 每个客户端的请求数、新建连接数和连接复用率
+        """
+        result = {}
+        for name, stats in cls._stats.items():
+            requests_count = stats["requests"]
+            opened = stats["connections_opened"]
+            reuse_ratio = 1 - opened / requests_count if requests_count else 0.0
+            result[name] = {
+                "requests": requests_count,
+                "connections_opened": opened,
+                "reuse_ratio": round(max(reuse_ratio, 0.0), 4)
+            }
+        return result
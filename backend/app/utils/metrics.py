@@ -0,0 +1,162 @@
+"""
+进程内延迟指标
+
+按处理步骤记录耗时直方图，以 Prometheus 文本格式导出：
+- 步骤标签取 Steps 的属性名（如 URL_RESOLVE），便于在 Prometheus 中查询
+- 按平台、语言、成功 / 失败细分
+- 只在进程内累计，进程重启后清零，由 Prometheus 负责持久化
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.services.request_logger import Steps
+
+# 默认分桶（秒），覆盖从 URL 解析到长视频 LLM 处理的耗时范围
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+# Steps 取值 -> 属性名，如 "URL解析" -> "URL_RESOLVE"
+_STAGE_NAMES: Dict[str, str] = {
+    value: name for name, value in vars(Steps).items()
+    if not name.startswith('_') and isinstance(value, str)
+}
+
+
+def _escape(value: str) -> str:
+    """转义 Prometheus 标签值"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels: Dict[str, str]) -> str:
+    """格式化标签，如 {platform="youtube",language="zh"}"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def render_gauge(name: str, help_text: str, samples: List[Tuple[Dict[str, str], float]], metric_type: str = "gauge") -> List[str]:
+    """将一组采样值渲染为 Prometheus 文本
+
+    Args:
+        name: 指标名称
+        help_text: 指标说明
+        samples: (标签, 数值) 列表
+        metric_type: 指标类型，gauge 或 counter
+
+    Returns:
+        List[str]: 文本行
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    for labels, value in samples:
+        lines.append(f"{name}{format_labels(labels)} {value}")
+    return lines
+
+
+class Histogram:
+    """带标签的直方图"""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """初始化直方图
+
+        Args:
+            name: 指标名称
+            help_text: 指标说明
+            label_names: 标签名称列表
+            buckets: 分桶上限（升序），+Inf 自动追加
+        """
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # 标签取值 -> (各分桶计数, 总和, 总数)
+        self._series: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """记录一次观测值
+
+        Args:
+            value: 观测值
+            **labels: 标签取值，缺少的标签记为空字符串
+        """
+        key = tuple(str(labels.get(name) or "") for name in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = [[0] * len(self.buckets), 0.0, 0]
+                self._series[key] = series
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        """渲染为 Prometheus 文本行"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(key, list(counts), total, count) for key, (counts, total, count) in self._series.items()]
+
+        for key, counts, total, count in sorted(items):
+            labels = dict(zip(self.label_names, key))
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f"{self.name}_bucket{format_labels({**labels, 'le': repr(float(bound))})} {bucket_count}")
+            lines.append(f"{self.name}_bucket{format_labels({**labels, 'le': '+Inf'})} {count}")
+            lines.append(f"{self.name}_sum{format_labels(labels)} {round(total, 6)}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {count}")
+        return lines
+
+
+# 各处理步骤耗时
+STAGE_DURATION = Histogram(
+    "keepup_stage_duration_seconds",
+    "各处理步骤耗时（秒）",
+    ("stage", "platform", "language", "status")
+)
+
+# 从开始后台处理到开始第一次 LLM 调用的耗时
+TIME_TO_FIRST_LLM = Histogram(
+    "keepup_time_to_first_llm_seconds",
+    "从开始后台处理到开始第一次 LLM 调用的耗时（秒）",
+    ("platform",)
+)
+
+
+def stage_name(step: str) -> str:
+    """将 Steps 取值转换为属性名，未定义的步骤原样返回"""
+    return _STAGE_NAMES.get(step, step)
+
+
+@contextmanager
+def stage_timer(step: str, platform: Optional[str] = None, language: Optional[str] = None) -> Iterator[Dict[str, str]]:
+    """记录一个处理步骤的耗时
+
+    用法:
+        with stage_timer(Steps.SUMMARY_PROCESS, platform, lang) as labels:
+            ...
+            labels["status"] = "error"  # 未抛异常但处理失败时手动标记
+
+    抛出异常时 status 自动记为 error。
+
+    Args:
+        step: Steps 中定义的步骤
+        platform: 平台，如 youtube、bilibili，未知时记为 unknown
+        language: 语言，不区分语言的步骤记为 all
+
+    Yields:
+        Dict[str, str]: 标签字典，可在步骤内补充 platform 或修改 status
+    """
+    labels = {
+        "platform": platform or "unknown",
+        "language": language or "all",
+        "status": "ok"
+    }
+    start = time.perf_counter()
+    try:
+        yield labels
+    except BaseException:
+        labels["status"] = "error"
+        raise
+    finally:
+        STAGE_DURATION.observe(time.perf_counter() - start, stage=stage_name(step), **labels)
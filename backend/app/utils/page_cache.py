@@ -0,0 +1,195 @@
+"""
+网页磁盘缓存
+
+Apple 播客、小宇宙节目 / 播客页面及普通网页每次提交、解析或匹配时都会重新下载。
+PageCache 在 FetchClient 之上缓存页面 HTML：
+- 本地 SQLite 存储，进程重启后仍然有效
+- 有效期内直接返回缓存，不发出请求；有效期按域名（含子域名）配置
+- 过期后带 If-None-Match / If-Modified-Since 发出条件请求，304 时续期并复用缓存
+- 调用方可以指定 refresh 忽略有效期立即重新验证，如在播客列表页中查找新发布的节目
+- 重新验证时连接失败或上游 5xx，返回过期的缓存并记录日志
+- 按总字节数限制容量，超出时按最近访问时间淘汰（LRU）
+- 响应带有 Cache-Control: no-store 时不缓存
+"""
+import asyncio
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import settings
+from app.utils.fetch_client import FetchClient
+from app.utils.logger import logger
+from app.utils.sqlite_store import SqliteLRUStore
+
+
+class PageCache:
+    """基于 SQLite、支持条件请求的网页缓存"""
+
+    def __init__(
+        self,
+        db_path: str,
+        max_bytes: int,
+        default_ttl: int,
+        domain_ttls: Optional[Dict[str, int]] = None,
+        enabled: bool = True
+    ):
+        """初始化缓存
+
+        Args:
+            db_path: SQLite 数据库文件路径
+            max_bytes: 缓存页面总字节数上限
+            default_ttl: 默认有效期（秒）
+            domain_ttls: 域名 -> 有效期（秒），同时作用于子域名
+            enabled: 是否启用缓存
+        """
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.domain_ttls = domain_ttls or {}
+        self.enabled = enabled
+        self._store = SqliteLRUStore(
+            db_path,
+            table="page_cache",
+            columns=(
+                "host TEXT NOT NULL, body TEXT NOT NULL, etag TEXT, last_modified TEXT, "
+                "validated_at REAL NOT NULL"
+            ),
+            max_bytes=max_bytes,
+            key_column="url"
+        )
+        self._stats = {"hits": 0, "revalidated": 0, "misses": 0, "stale": 0, "stores": 0, "evictions": 0}
+
+    def ttl_for(self, host: str) -> int:
+        """获取主机的有效期，从完整主机名开始逐级去掉子域名查找，都未配置时使用默认值
+
+        Args:
+            host: 小写主机名
+
+        Returns:
+            int: 有效期（秒）
+        """
+        labels = host.split(".")
+        for i in range(max(len(labels) - 1, 1)):
+            ttl = self.domain_ttls.get(".".join(labels[i:]))
+            if ttl is not None:
+                return ttl
+        return self.default_ttl
+
+    def _load(self, url: str) -> Optional[Tuple[str, Optional[str], Optional[str], float]]:
+        """读取缓存条目 (body, etag, last_modified, validated_at)，并更新最近访问时间"""
+        return self._store.get(url, ("body", "etag", "last_modified", "validated_at"))
+
+    def _save(self, url: str, host: str, body: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        size = len(body.encode('utf-8'))
+        if size > self.max_bytes:
+            logger.warning(f"网页超过缓存容量上限，不缓存: {url}, size={size}")
+            return
+
+        evicted = self._store.put(
+            url, size, host=host, body=body, etag=etag, last_modified=last_modified, validated_at=time.time()
+        )
+        self._stats["stores"] += 1
+        self._stats["evictions"] += len(evicted)
+
+    def _renew(self, url: str) -> None:
+        """304 后续期"""
+        self._store.update(url, validated_at=time.time())
+
+    async def _run(self, func, *args) -> Any:
+        """在线程中执行 SQLite 操作，失败只记录日志"""
+        try:
+            return await asyncio.to_thread(func, *args)
+        except Exception as e:
+            logger.error(f"网页缓存读写失败: {str(e)}")
+            return None
+
+    async def get_html(
+        self,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        verify: bool = True,
+        refresh: bool = False
+    ) -> str:
+        """获取页面 HTML，优先使用缓存
+
+        Args:
+            url: 页面地址
+            headers: 请求头
+            timeout: 超时时间（秒）
+            verify: 是否校验证书
+            refresh: 忽略有效期，向上游重新验证（仍带条件请求头，未变化时上游返回 304）
+
+        Returns:
+            str: 按声明的字符集解码的 HTML
+
+        Raises:
+            httpx.HTTPError: 请求失败或返回非 2xx，且没有可用的缓存
+        """
+        if not self.enabled:
+            response = await FetchClient.get(url, headers=headers, timeout=timeout, verify=verify)
+            response.raise_for_status()
+            return FetchClient.html_text(response)
+
+        host = urlsplit(url).hostname or ""
+        entry = await self._run(self._load, url)
+        request_headers = dict(headers or {})
+        if entry is not None:
+            body, etag, last_modified, validated_at = entry
+            if not refresh and time.time() - validated_at < self.ttl_for(host):
+                self._stats["hits"] += 1
+                return body
+            if etag:
+                request_headers["If-None-Match"] = etag
+            if last_modified:
+                request_headers["If-Modified-Since"] = last_modified
+
+        try:
+            response = await FetchClient.get(url, headers=request_headers, timeout=timeout, verify=verify)
+        except httpx.TransportError as e:
+            if entry is None:
+                raise
+            self._stats["stale"] += 1
+            logger.warning(f"重新验证网页缓存失败，使用过期缓存: {url}, 错误: {str(e)}")
+            return entry[0]
+
+        if entry is not None:
+            if response.status_code == 304:
+                self._stats["revalidated"] += 1
+                await self._run(self._renew, url)
+                return entry[0]
+            if response.status_code >= 500:
+                self._stats["stale"] += 1
+                logger.warning(f"重新验证网页缓存失败，使用过期缓存: {url}, 状态码: {response.status_code}")
+                return entry[0]
+
+        response.raise_for_status()
+        self._stats["misses"] += 1
+        body = FetchClient.html_text(response)
+        if "no-store" not in response.headers.get("Cache-Control", "").lower():
+            await self._run(
+                self._save, url, host, body,
+                response.headers.get("ETag"), response.headers.get("Last-Modified")
+            )
+        return body
+
+    def stats(self) -> Dict[str, int]:
+        """获取缓存统计
+
+        Returns:
+            Dict[str, int]: 总字节数、上限及命中 / 304 续期 / 未命中 / 使用过期缓存 / 写入 / 淘汰次数
+        """
+        return {"total_bytes": self._store.total_bytes, "max_bytes": self.max_bytes, **self._stats}
+
+
+# 全局网页缓存实例
+page_cache = PageCache(
+    db_path=settings.PAGE_CACHE_DB_PATH,
+    max_bytes=settings.PAGE_CACHE_MAX_BYTES,
+    default_ttl=settings.PAGE_CACHE_DEFAULT_TTL,
+    domain_ttls=settings.page_cache_domain_ttls,
+    enabled=settings.PAGE_CACHE_ENABLED
+)
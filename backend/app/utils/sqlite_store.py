@@ -0,0 +1,162 @@
+"""
+本地 SQLite 存储的公共部分
+
+LLM 结果缓存、网页磁盘缓存、后台任务队列和规范化 URL 索引都使用本地 SQLite 文件：
+- connect_sqlite: 创建目录、打开自动提交的连接、启用 WAL 并建表
+- SqliteLRUStore: 按总字节数限制容量、按最近访问时间淘汰（LRU）的键值表
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, List, Optional, Sequence, Tuple
+
+
+def connect_sqlite(db_path: str, statements: Sequence[str] = ()) -> sqlite3.Connection:
+    """打开 SQLite 连接并执行建表语句
+
+    Args:
+        db_path: 数据库文件路径，目录不存在时自动创建
+        statements: 建表、建索引等初始化语句
+
+    Returns:
+        sqlite3.Connection: 可跨线程使用的自动提交连接，调用方负责加锁
+    """
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    for statement in statements:
+        conn.execute(statement)
+    return conn
+
+
+class SqliteLRUStore:
+    """按总字节数限制容量的 SQLite 键值表，超出上限时按最近访问时间淘汰"""
+
+    def __init__(
+        self,
+        db_path: str,
+        table: str,
+        columns: str,
+        max_bytes: int,
+        key_column: str = "key",
+        label_column: Optional[str] = None
+    ):
+        """
+        Args:
+            db_path: SQLite 数据库文件路径
+            table: 表名
+            columns: 除键、size、last_access 以外的列定义，如 "value TEXT NOT NULL, created_at REAL NOT NULL"
+            max_bytes: 所有条目 size 之和的上限
+            key_column: 主键列名
+            label_column: 淘汰时返回的列（如命名空间），默认返回键
+        """
+        self.db_path = db_path
+        self.table = table
+        self.columns = columns
+        self.max_bytes = max_bytes
+        self.key_column = key_column
+        self.label_column = label_column or key_column
+        self.lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._total_bytes: Optional[int] = None
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes or 0
+
+    def conn(self) -> sqlite3.Connection:
+        """获取连接，首次调用时建表并统计已有的总字节数；调用方需持有 lock"""
+        if self._conn is None:
+            self._conn = connect_sqlite(self.db_path, [
+                f"""
+                CREATE TABLE IF NOT EXISTS {self.table} (
+                    {self.key_column} TEXT PRIMARY KEY,
+                    {self.columns},
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """,
+                f"CREATE INDEX IF NOT EXISTS idx_{self.table}_access ON {self.table} (last_access)",
+            ])
+            self._total_bytes = self._conn.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM {self.table}"
+            ).fetchone()[0]
+        return self._conn
+
+    def get(self, key: str, fields: Sequence[str]) -> Optional[Tuple[Any, ...]]:
+        """读取条目并更新最近访问时间
+
+        Args:
+            key: 键
+            fields: 读取的列
+
+        Returns:
+            Optional[Tuple[Any, ...]]: 各列的值，不存在时返回 None
+        """
+        with self.lock:
+            conn = self.conn()
+            row = conn.execute(
+                f"SELECT {', '.join(fields)} FROM {self.table} WHERE {self.key_column} = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    f"UPDATE {self.table} SET last_access = ? WHERE {self.key_column} = ?", (time.time(), key)
+                )
+            return row
+
+    def put(self, key: str, size: int, **values: Any) -> List[Any]:
+        """写入或替换条目，超出容量上限时淘汰最久未访问的条目
+
+        Args:
+            key: 键
+            size: 条目计入容量的字节数，调用方需保证不超过 max_bytes
+            **values: 其余各列的值
+
+        Returns:
+            List[Any]: 被淘汰条目的 label_column 值
+        """
+        names = [self.key_column, *values, "size", "last_access"]
+        params = [key, *values.values(), size, time.time()]
+        with self.lock:
+            conn = self.conn()
+            old = conn.execute(
+                f"SELECT size FROM {self.table} WHERE {self.key_column} = ?", (key,)
+            ).fetchone()
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} ({', '.join(names)}) "
+                f"VALUES ({', '.join('?' * len(names))})",
+                params
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            return self._evict(conn)
+
+    def update(self, key: str, **values: Any) -> None:
+        """更新条目的部分列（不改变大小）"""
+        with self.lock:
+            self.conn().execute(
+                f"UPDATE {self.table} SET {', '.join(f'{name} = ?' for name in values)} "
+                f"WHERE {self.key_column} = ?",
+                [*values.values(), key]
+            )
+
+    def _evict(self, conn: sqlite3.Connection) -> List[Any]:
+        """按最近访问时间淘汰，直到总字节数回到上限以内"""
+        evicted: List[Any] = []
+        while self._total_bytes > self.max_bytes:
+            rows = conn.execute(
+                f"SELECT {self.key_column}, size, {self.label_column} FROM {self.table} "
+                f"ORDER BY last_access LIMIT 20"
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                break
+            for key, size, label in rows:
+                conn.execute(f"DELETE FROM {self.table} WHERE {self.key_column} = ?", (key,))
+                self._total_bytes -= size
+                evicted.append(label)
+                if self._total_bytes <= self.max_bytes:
+                    break
+        return evicted
@@ -1,5 +1,5 @@
 import json
-from typing import Any, Optional
+from typing import List
 
 class SSEMessage:
     """统一的 SSE 消息格式"""
@@ -27,4 +27,35 @@ class SSEMessage:
             "content": content,
             "type": event_type
         }
-        return f"data: {json.dumps(data)}\n\n" 
\ No newline at end of file
+        return f"data: {json.dumps(data)}\n\n" 
+
+
+class SSEContentAssembler:
+    """在转发 SSE 消息的同时增量拼接消息内容
+
+    每条消息只解析一次，只保留文本片段，不保留原始消息。
+    """
+
+    def __init__(self):
+        self._parts: List[str] = []
+
+    def feed(self, message: str) -> None:
+        """处理一条由 SSEMessage.create 生成的消息
+
+        Args:
+            message: SSE 消息
+        """
+        if not message.startswith("data: "):
+            # 结束消息为 "event: done"，没有内容
+            return
+        try:
+            data = json.loads(message[6:])
+        except json.JSONDecodeError:
+            return
+        if isinstance(data, dict) and (content := data.get("content")):
+            self._parts.append(content)
+
+    @property
+    def content(self) -> str:
+        """已拼接的完整内容"""
+        return "".join(self._parts)
@@ -0,0 +1,99 @@
+"""
+小型异步依赖图
+
+按声明的依赖关系调度协程：没有依赖关系的节点并发执行，
+节点在其全部依赖完成后立即开始，而不是等待固定时间或整批完成。
+- 节点函数以关键字参数接收依赖节点的返回值
+- 任一节点失败时取消其余未完成的节点，并抛出该节点的原始异常
+- 记录每个节点的开始时间和耗时，便于定位关键路径
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+NodeFunc = Callable[..., Awaitable[Any]]
+
+
+class TaskGraph:
+    """异步任务依赖图"""
+
+    def __init__(self, name: str = ""):
+        """初始化依赖图
+
+        Args:
+            name: 依赖图名称，用于日志
+        """
+        self.name = name
+        self._nodes: Dict[str, Tuple[NodeFunc, Tuple[str, ...]]] = {}
+        self._order: List[str] = []
+        # 节点名 -> (相对开始时间, 耗时)，单位秒
+        self.timings: Dict[str, Tuple[float, float]] = {}
+
+    def add(self, name: str, func: NodeFunc, deps: Sequence[str] = ()) -> "TaskGraph":
+        """添加节点
+
+        Args:
+            name: 节点名称
+            func: 异步函数，以依赖节点名为关键字参数接收其返回值
+            deps: 依赖的节点名称，必须已经添加
+
+        Returns:
+            TaskGraph: 自身，便于链式调用
+        """
+        if name in self._nodes:
+            raise ValueError(f"节点重复: {name}")
+        missing = [dep for dep in deps if dep not in self._nodes]
+        if missing:
+            # 只允许依赖已添加的节点，从而保证不存在环
+            raise ValueError(f"节点 {name} 依赖了未定义的节点: {missing}")
+        self._nodes[name] = (func, tuple(deps))
+        self._order.append(name)
+        return self
+
+    async def run(self) -> Dict[str, Any]:
+        """执行依赖图
+
+        Returns:
+            Dict[str, Any]: 节点名 -> 返回值
+
+        Raises:
+            Exception: 第一个失败节点的原始异常
+        """
+        started_at = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_node(name: str) -> Any:
+            func, deps = self._nodes[name]
+            kwargs = {dep: await tasks[dep] for dep in deps}
+            node_start = time.perf_counter()
+            try:
+                return await func(**kwargs)
+            finally:
+                self.timings[name] = (node_start - started_at, time.perf_counter() - node_start)
+
+        for name in self._order:
+            tasks[name] = asyncio.create_task(run_node(name), name=f"{self.name}:{name}")
+
+        try:
+            done, pending = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+            failed: Optional[asyncio.Task] = next(
+                (tasks[name] for name in self._order
+                 if tasks[name] in done and not tasks[name].cancelled() and tasks[name].exception()),
+                None
+            )
+            if failed is not None:
+                raise failed.exception()
+            return {name: task.result() for name, task in tasks.items()}
+        finally:
+            unfinished = [task for task in tasks.values() if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                await asyncio.gather(*unfinished, return_exceptions=True)
+
+    def describe_timings(self) -> str:
+        """格式化各节点耗时，如 'video_info@0.00s+1.20s, content@0.00s+3.40s'"""
+        return ", ".join(
+            f"{name}@{start:.2f}s+{duration:.2f}s"
+            for name, (start, duration) in sorted(self.timings.items(), key=lambda item: item[1][0])
+        )
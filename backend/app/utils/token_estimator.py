@@ -0,0 +1,167 @@
+"""
+Token 数量估算与调用前的模型选择
+
+原来只有在模型返回 "Input is too long" 之后才切换模型或改用分层总结，白白浪费一次完整的往返。
+TokenEstimator 在调用前估算输入的 token 数：
+- 中日韩字符与其他字符分开估算（中文约 1 字 1 token 以上，英文约 4 个字符 1 token）
+- 按模型记录实际 usage 与估算值的比例（指数滑动平均），逐步校准估算结果
+- 结合各模型的上下文窗口，决定使用哪个模型、max_tokens 设为多少以及是否需要分块
+"""
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.utils.logger import logger
+
+# 中日韩统一表意文字、假名、韩文音节及全角字符
+CJK_RE = re.compile(r'[\u3000-\u303f\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uff00-\uffef]')
+
+# 各模型的上下文窗口（token），按模型ID包含的关键字匹配
+MODEL_CONTEXT_WINDOWS: Tuple[Tuple[str, int], ...] = (
+    ("claude-sonnet-4-5", 200000),
+    ("claude-haiku-4-5", 200000),
+    ("claude-3-5-sonnet", 200000),
+    ("gemini-2.5", 1048576),
+    ("gemini-3", 1048576),
+    ("deepseek-chat", 64000),
+)
+DEFAULT_CONTEXT_WINDOW = 128000
+
+
+class TokenEstimator:
+    """基于字符统计的 token 估算器，按模型用实际 usage 校准"""
+
+    # 未校准时每个中日韩字符 / 其他字符对应的 token 数
+    CJK_TOKENS_PER_CHAR = 1.2
+    OTHER_TOKENS_PER_CHAR = 0.27
+    # 每条消息的固定开销（角色、分隔符等）
+    MESSAGE_OVERHEAD = 8
+    # 预留给估算误差的比例
+    SAFETY_MARGIN = 0.05
+    # 校准系数的滑动平均权重及取值范围
+    CALIBRATION_ALPHA = 0.2
+    CALIBRATION_RANGE = (0.5, 2.0)
+
+    # 模型ID -> 实际 token 数 / 估算 token 数
+    _calibration: Dict[str, float] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def raw_estimate(cls, text: str) -> int:
+        """不经校准的估算值"""
+        if not text:
+            return 0
+        cjk = len(CJK_RE.findall(text))
+        return int(cjk * cls.CJK_TOKENS_PER_CHAR + (len(text) - cjk) * cls.OTHER_TOKENS_PER_CHAR) + 1
+
+    @classmethod
+    def estimate(cls, text: str, model: Optional[str] = None) -> int:
+        """估算文本的 token 数
+
+        Args:
+            text: 文本
+            model: 模型ID，提供时使用该模型的校准系数
+
+        Returns:
+            int: 估算的 token 数
+        """
+        return int(cls.raw_estimate(text) * cls._calibration.get(model, 1.0))
+
+    @classmethod
+    def estimate_messages(cls, texts: Iterable[str], model: Optional[str] = None) -> int:
+        """估算多条消息的 token 总数，不提供 model 时即为用于校准的原始估算值"""
+        total = 0
+        for text in texts:
+            total += cls.raw_estimate(text) + cls.MESSAGE_OVERHEAD
+        return int(total * cls._calibration.get(model, 1.0))
+
+    @staticmethod
+    def message_texts(messages: Iterable[Dict[str, Any]]) -> List[str]:
+        """提取请求消息中的文本，支持字符串和 [{"type": "text", "text": ...}] 两种 content 格式"""
+        texts = []
+        for message in messages:
+            content = message.get("content")
+            if isinstance(content, str):
+                texts.append(content)
+            elif isinstance(content, list):
+                texts.extend(part.get("text", "") for part in content if isinstance(part, dict))
+        return texts
+
+    @classmethod
+    def calibrate(cls, model: str, raw_estimate: int, actual_tokens: int) -> None:
+        """用 provider 返回的实际输入 token 数校准估算
+
+        Args:
+            model: 模型ID
+            raw_estimate: 本次输入不经校准的估算值（estimate_messages 不传 model 的结果）
+            actual_tokens: usage 中的实际输入 token 数
+        """
+        if not model or raw_estimate <= 0 or not actual_tokens:
+            return
+        low, high = cls.CALIBRATION_RANGE
+        ratio = min(max(actual_tokens / raw_estimate, low), high)
+        with cls._lock:
+            previous = cls._calibration.get(model)
+            cls._calibration[model] = ratio if previous is None else (
+                previous + cls.CALIBRATION_ALPHA * (ratio - previous)
+            )
+
+    @classmethod
+    def calibration(cls) -> Dict[str, float]:
+        """获取各模型当前的校准系数"""
+        return {model: round(ratio, 4) for model, ratio in cls._calibration.items()}
+
+    @staticmethod
+    def context_window(model: str) -> int:
+        """获取模型的上下文窗口大小"""
+        for keyword, window in MODEL_CONTEXT_WINDOWS:
+            if keyword in (model or ""):
+                return window
+        return DEFAULT_CONTEXT_WINDOW
+
+    @classmethod
+    def max_output_tokens(cls, model: str, input_tokens: int, desired: int) -> int:
+        """在上下文窗口内可用的最大输出 token 数
+
+        Args:
+            model: 模型ID
+            input_tokens: 估算的输入 token 数
+            desired: 期望的最大输出 token 数
+
+        Returns:
+            int: 不超过 desired 且输入加输出不超出窗口的 max_tokens，窗口不足时可能小于等于 0
+        """
+        window = cls.context_window(model)
+        available = int(window * (1 - cls.SAFETY_MARGIN)) - input_tokens
+        return min(desired, available)
+
+    @classmethod
+    def choose_model(
+        cls,
+        candidates: Sequence[str],
+        texts: Iterable[str],
+        desired_output: int,
+        min_output: int
+    ) -> Optional[Tuple[str, int]]:
+        """按顺序选择第一个能容纳输入且能留出至少 min_output 输出的模型
+
+        Args:
+            candidates: 候选模型ID，按优先级排列
+            texts: 输入的各条消息
+            desired_output: 期望的最大输出 token 数
+            min_output: 至少需要的输出 token 数
+
+        Returns:
+            Optional[Tuple[str, int]]: (模型ID, max_tokens)，都放不下时返回 None（需要分块）
+        """
+        texts = list(texts)
+        for model in candidates:
+            input_tokens = cls.estimate_messages(texts, model)
+            max_tokens = cls.max_output_tokens(model, input_tokens, desired_output)
+            if max_tokens >= min_output:
+                return model, max_tokens
+            logger.info(
+                f"预估输入 {input_tokens} tokens 超出模型 {model} 的上下文窗口 "
+                f"{cls.context_window(model)}，尝试下一个模型"
+            )
+        return None
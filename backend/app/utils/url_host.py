@@ -0,0 +1,38 @@
+"""
+按主机名判断 URL 所属的域名
+
+平台识别原来按子串匹配整个 URL，查询参数或路径中带有平台域名的普通网页会被误判。
+这里只比较主机名，域名同时匹配其子域名（如 'youtube.com' 匹配 'm.youtube.com'）。
+"""
+from typing import Iterable
+from urllib.parse import urlsplit
+
+
+def url_host(url: str) -> str:
+    """获取 URL 的小写主机名，兼容省略 scheme 的写法（如 'youtu.be/xxx'）
+
+    Args:
+        url: URL
+
+    Returns:
+        str: 主机名，无法解析时返回空字符串
+    """
+    url = url.strip()
+    try:
+        return urlsplit(url if "://" in url else f"//{url}").hostname or ""
+    except ValueError:
+        return ""
+
+
+def host_matches(url: str, domains: Iterable[str]) -> bool:
+    """判断 URL 的主机名是否属于给定域名或其子域名
+
+    Args:
+        url: URL
+        domains: 小写域名列表
+
+    Returns:
+        bool: 是否匹配
+    """
+    host = url_host(url)
+    return any(host == domain or host.endswith(f".{domain}") for domain in domains)
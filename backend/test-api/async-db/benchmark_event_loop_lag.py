@@ -0,0 +1,111 @@
+"""
+数据库调用事件循环延迟基准测试
+
+模拟 50 个并发工作流，每个工作流依次执行若干次数据库查询，对比两种模式下的事件循环延迟：
+- blocking: 在协程中直接调用同步的 query.execute()（改造前的写法）
+- offload:  通过 SupabaseService.execute() 放到有界线程池执行（改造后的写法）
+
+事件循环延迟通过一个心跳协程测量：每隔 TICK_INTERVAL 秒醒来一次，记录实际醒来时间与预期时间的差值。
+
+用法:
+    python benchmark_event_loop_lag.py            # 使用 .env 中的 Supabase 实际查询
+    python benchmark_event_loop_lag.py --simulate # 使用 time.sleep 模拟数据库往返，无需网络
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+from dotenv import load_dotenv
+
+# 添加backend到sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+# 加载环境变量
+env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../.env'))
+load_dotenv(env_path)
+
+from app.repositories.supabase import SupabaseService
+
+# 配置
+CONCURRENT_WORKFLOWS = 50  # 并发工作流数量
+QUERIES_PER_WORKFLOW = 10  # 每个工作流的查询次数
+TICK_INTERVAL = 0.01  # 心跳间隔（秒）
+SIMULATED_LATENCY = 0.08  # 模拟模式下单次数据库往返耗时（秒）
+
+
+class SimulatedQuery:
+    """模拟的查询对象，execute() 同步阻塞一段时间"""
+
+    def execute(self):
+        time.sleep(SIMULATED_LATENCY)
+        return None
+
+
+def build_query(simulate: bool):
+    """构建一个轻量的只读查询"""
+    if simulate:
+        return SimulatedQuery()
+    return SupabaseService.get_client().table('keep_prompt').select('id').limit(1)
+
+
+async def run_workflow(mode: str, simulate: bool):
+    """模拟单个工作流的数据库调用序列"""
+    for _ in range(QUERIES_PER_WORKFLOW):
+        query = build_query(simulate)
+        if mode == "blocking":
+            query.execute()
+        else:
+            await SupabaseService.execute(query)
+        # 让出事件循环，模拟两次查询之间的其他处理
+        await asyncio.sleep(0)
+
+
+async def measure(mode: str, simulate: bool) -> dict:
+    """运行一轮测试并统计事件循环延迟"""
+    lags = []
+    stop = asyncio.Event()
+
+    async def heartbeat():
+        loop = asyncio.get_running_loop()
+        while not stop.is_set():
+            expected = loop.time() + TICK_INTERVAL
+            await asyncio.sleep(TICK_INTERVAL)
+            lags.append(max(0.0, loop.time() - expected))
+
+    ticker = asyncio.create_task(heartbeat())
+    start = time.perf_counter()
+    await asyncio.gather(*(run_workflow(mode, simulate) for _ in range(CONCURRENT_WORKFLOWS)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    return {
+        "mode": mode,
+        "elapsed": elapsed,
+        "ticks": len(lags),
+        "p50": statistics.median(lags_ms),
+        "p95": lags_ms[int(len(lags_ms) * 0.95) - 1] if len(lags_ms) > 1 else lags_ms[0],
+        "max": lags_ms[-1],
+    }
+
+
+async def main():
+    simulate = "--simulate" in sys.argv
+    print(f"并发工作流: {CONCURRENT_WORKFLOWS}, 每个工作流查询: {QUERIES_PER_WORKFLOW}, "
+          f"模式: {'模拟' if simulate else 'Supabase'}")
+
+    for mode in ("blocking", "offload"):
+        result = await measure(mode, simulate)
+        print(
+            f"[{result['mode']:>8}] 总耗时 {result['elapsed']:.2f}s | 心跳 {result['ticks']} 次 | "
+            f"延迟 p50 {result['p50']:.1f}ms, p95 {result['p95']:.1f}ms, max {result['max']:.1f}ms"
+        )
+
+    SupabaseService.shutdown_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
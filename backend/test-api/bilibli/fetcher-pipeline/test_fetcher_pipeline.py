@@ -0,0 +1,59 @@
+"""
+B站获取器链路测试
+
+使用数据库中的 cookie-bilbli 配置，对给定视频调用 BilibilitFetcher.get_video_info：
+- 第一次调用：解析并验证 cookie，视频信息接口与 分页 -> 播放器 -> 字幕 链路并发执行
+- 第二次调用：复用缓存的 cookie，不再请求导航接口
+输出每次调用的耗时、选中的字幕长度及各主机的请求数。
+
+用法:
+    python test_fetcher_pipeline.py                     # 使用默认视频
+    python test_fetcher_pipeline.py URL [URL ...]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+
+# 添加backend到sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+# 加载环境变量
+env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../.env'))
+load_dotenv(env_path)
+
+from app.services.content_fetcher.bilibili import BilibilitFetcher
+from app.utils.fetch_client import FetchClient
+
+# 配置
+DEFAULT_URLS = ["https://www.bilibili.com/video/BV1sWobYuEa6"]
+ROUNDS = 2  # 每个视频的调用次数
+
+
+async def main():
+    urls = sys.argv[1:] or DEFAULT_URLS
+    fetcher = BilibilitFetcher()
+
+    for url in urls:
+        print(f"\n视频: {url}")
+        for round_index in range(1, ROUNDS + 1):
+            start = time.perf_counter()
+            video_info = await fetcher.get_video_info(url)
+            elapsed = time.perf_counter() - start
+            if not video_info:
+                print(f"  [第{round_index}次] 获取失败，耗时 {elapsed:.2f}s")
+                continue
+            print(
+                f"  [第{round_index}次] 耗时 {elapsed:.2f}s | 标题: {video_info.title} | "
+                f"字幕长度: {len(video_info.description or '')}"
+            )
+
+    print(f"\n各主机请求数: {FetchClient.stats()}")
+    await FetchClient.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+"""
+B站字幕选择测试（不访问网络）
+
+将 BilibilitFetcher._download_subtitle 替换为按语言返回预设延迟和结果的模拟下载，
+对 _download_best_subtitle 依次验证：
+1. 中文字幕排在非中文字幕之前，同类保持接口返回的顺序
+2. 排名靠前的字幕下载较慢时，等待它完成，不使用先完成的低排名字幕
+3. 选出字幕后取消其余仍在进行的下载
+4. 排名靠前的字幕下载失败或质量不合格时，依次使用后面的字幕
+5. 中文字幕都不可用时使用非中文字幕
+6. 都不合格时使用排名最靠前的非空字幕；全部失败时返回空字符串
+
+用法:
+    python test_subtitle_selection.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+from typing import Dict, List, Tuple, Union
+
+from dotenv import load_dotenv
+
+# 添加backend到sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+# 加载环境变量
+env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../.env'))
+load_dotenv(env_path)
+
+from app.services.content_fetcher.bilibili import BilibilitFetcher
+
+# 接口返回的字幕列表（非中文在前，用于验证排序）
+SUBTITLES = [
+    {"lan": "en", "lan_doc": "English", "subtitle_url": "//example.com/en"},
+    {"lan": "zh-CN", "lan_doc": "中文（中国）", "subtitle_url": "//example.com/zh-CN"},
+    {"lan": "ai-zh", "lan_doc": "中文（自动生成）", "subtitle_url": "//example.com/ai-zh"},
+]
+
+GOOD_ZH = "人工字幕内容" * 30
+GOOD_AI_ZH = "自动生成字幕" * 30
+GOOD_EN = "english subtitle " * 10
+MUSIC = "♪" * 120
+SHORT_ZH = "短字幕"
+
+
+class FakeDownloads:
+    """按语言返回预设结果的模拟字幕下载，记录开始、完成和被取消的下载"""
+
+    def __init__(self, plan: Dict[str, Tuple[float, Union[str, Exception]]]):
+        # 语言 -> (延迟秒数, 返回的文本或抛出的异常)
+        self.plan = plan
+        self.started: List[str] = []
+        self.finished: List[str] = []
+        self.cancelled: List[str] = []
+
+    async def __call__(self, subtitle: Dict, headers: Dict[str, str]) -> str:
+        lan = subtitle["lan"]
+        delay, result = self.plan[lan]
+        self.started.append(lan)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(lan)
+            raise
+        self.finished.append(lan)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def check(name: str, condition: bool):
+    print(f"  [{'通过' if condition else '失败'}] {name}")
+    if not condition:
+        raise SystemExit(1)
+
+
+async def select(plan: Dict[str, Tuple[float, Union[str, Exception]]]) -> Tuple[str, FakeDownloads, float]:
+    fetcher = BilibilitFetcher()
+    downloads = FakeDownloads(plan)
+    fetcher._download_subtitle = downloads
+    start = time.perf_counter()
+    content = await fetcher._download_best_subtitle(SUBTITLES, {}, "BV_TEST")
+    return content, downloads, time.perf_counter() - start
+
+
+async def main():
+    print("功能验证:")
+    ranked = BilibilitFetcher()._rank_subtitles(SUBTITLES)
+    check("中文字幕优先，同类保持接口顺序", [s["lan"] for s in ranked] == ["zh-CN", "ai-zh", "en"])
+
+    content, downloads, elapsed = await select({
+        "zh-CN": (0.3, GOOD_ZH),
+        "ai-zh": (0.01, GOOD_AI_ZH),
+        "en": (0.01, GOOD_EN),
+    })
+    check("等待排名靠前但较慢的字幕", content == GOOD_ZH and elapsed >= 0.3)
+    check("所有字幕同时开始下载", sorted(downloads.started) == ["ai-zh", "en", "zh-CN"])
+
+    content, downloads, elapsed = await select({
+        "zh-CN": (0.01, GOOD_ZH),
+        "ai-zh": (5, GOOD_AI_ZH),
+        "en": (5, GOOD_EN),
+    })
+    check("选出字幕后立即返回", content == GOOD_ZH and elapsed < 1)
+    check("取消其余下载", sorted(downloads.cancelled) == ["ai-zh", "en"])
+
+    content, _, _ = await select({
+        "zh-CN": (0.05, Exception("HTTP 404")),
+        "ai-zh": (0.1, GOOD_AI_ZH),
+        "en": (0.01, GOOD_EN),
+    })
+    check("排名靠前的字幕下载失败时使用下一个", content == GOOD_AI_ZH)
+
+    content, _, _ = await select({
+        "zh-CN": (0.01, MUSIC),
+        "ai-zh": (0.01, ""),
+        "en": (0.05, GOOD_EN),
+    })
+    check("中文字幕都不合格时使用非中文字幕", content == GOOD_EN)
+
+    content, _, _ = await select({
+        "zh-CN": (0.01, ""),
+        "ai-zh": (0.01, SHORT_ZH),
+        "en": (0.01, Exception("timeout")),
+    })
+    check("都不合格时使用排名最靠前的非空字幕", content == SHORT_ZH)
+
+    content, _, _ = await select({
+        "zh-CN": (0.01, Exception("HTTP 500")),
+        "ai-zh": (0.01, Exception("HTTP 500")),
+        "en": (0.01, Exception("HTTP 500")),
+    })
+    check("全部失败时返回空字符串", content == "")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,150 @@
+"""
+内容抓取并发压测
+
+模拟多篇文章同时抓取页面，同时运行一个模拟对话流的协程，对比两种模式：
+- blocking: 在协程中直接调用阻塞的 requests.get（改造前的写法）
+- async:    通过 FetchClient 异步抓取（改造后的写法，按主机连接池和并发限制）
+
+对话流每隔 CHAT_TOKEN_INTERVAL 秒输出一个片段，统计片段之间的实际间隔；
+抓取阻塞事件循环时，对话流的间隔会明显变长。
+
+用法:
+    python load_test_fetch_client.py                 # 使用本地模拟服务器，无需网络
+    python load_test_fetch_client.py URL [URL ...]   # 抓取实际页面，每篇文章依次抓取给定的 URL
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from dotenv import load_dotenv
+
+# 添加backend到sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+# 加载环境变量
+env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../.env'))
+load_dotenv(env_path)
+
+from app.utils.fetch_client import FetchClient
+
+# 配置
+CONCURRENT_ARTICLES = 8  # 同时抓取的文章数
+SIMULATED_LATENCY = 0.3  # 模拟服务器每个页面的响应耗时（秒）
+SIMULATED_PAGE_BYTES = 200 * 1024  # 模拟页面大小
+CHAT_TOKEN_INTERVAL = 0.02  # 模拟对话流输出片段的间隔（秒）
+
+
+class SlowPageHandler(BaseHTTPRequestHandler):
+    """固定延迟返回页面的模拟服务器"""
+
+    body = b"<html><head><meta charset=\"utf-8\"></head><body>" + b"x" * SIMULATED_PAGE_BYTES + b"</body></html>"
+
+    def do_GET(self):
+        time.sleep(SIMULATED_LATENCY)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowPageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def article_urls(base_urls: list, index: int) -> list:
+    """每篇文章抓取的页面（模拟平台获取器依次请求视频信息、播放器、字幕等接口）"""
+    return [f"{url}{'&' if '?' in url else '?'}article={index}" for url in base_urls]
+
+
+async def fetch_article(mode: str, urls: list) -> int:
+    total = 0
+    for url in urls:
+        if mode == "blocking":
+            response = requests.get(url, timeout=30)
+            total += len(response.content)
+        else:
+            response = await FetchClient.get(url, timeout=30)
+            total += len(response.content)
+    return total
+
+
+async def chat_stream(stop: asyncio.Event, gaps: list):
+    """模拟对话流：按固定间隔输出片段，记录相邻片段的实际间隔"""
+    loop = asyncio.get_running_loop()
+    last = loop.time()
+    while not stop.is_set():
+        await asyncio.sleep(CHAT_TOKEN_INTERVAL)
+        now = loop.time()
+        gaps.append(now - last)
+        last = now
+
+
+async def measure(mode: str, base_urls: list) -> dict:
+    gaps = []
+    stop = asyncio.Event()
+    chat = asyncio.create_task(chat_stream(stop, gaps))
+
+    start = time.perf_counter()
+    sizes = await asyncio.gather(*(
+        fetch_article(mode, article_urls(base_urls, i)) for i in range(CONCURRENT_ARTICLES)
+    ))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await chat
+
+    gaps_ms = sorted(gap * 1000 for gap in gaps) or [0.0]
+    return {
+        "mode": mode,
+        "elapsed": elapsed,
+        "bytes": sum(sizes),
+        "chunks": len(gaps),
+        "p50": statistics.median(gaps_ms),
+        "p95": gaps_ms[int(len(gaps_ms) * 0.95) - 1] if len(gaps_ms) > 1 else gaps_ms[0],
+        "max": gaps_ms[-1],
+    }
+
+
+async def main():
+    server = None
+    base_urls = sys.argv[1:]
+    if not base_urls:
+        server = start_server()
+        port = server.server_address[1]
+        # 两个主机名指向同一个服务器，观察按主机的连接池和并发限制
+        base_urls = [
+            f"http://127.0.0.1:{port}/video-info",
+            f"http://localhost:{port}/player",
+            f"http://127.0.0.1:{port}/subtitle",
+        ]
+
+    print(f"并发文章: {CONCURRENT_ARTICLES}, 每篇页面: {len(base_urls)}, "
+          f"对话片段间隔: {CHAT_TOKEN_INTERVAL * 1000:.0f}ms")
+
+    for mode in ("blocking", "async"):
+        result = await measure(mode, base_urls)
+        print(
+            f"[{result['mode']:>8}] 总耗时 {result['elapsed']:.2f}s | 下载 {result['bytes'] / 1024:.0f}KB | "
+            f"对话片段 {result['chunks']} 个, 间隔 p50 {result['p50']:.1f}ms, "
+            f"p95 {result['p95']:.1f}ms, max {result['max']:.1f}ms"
+        )
+
+    print(f"各主机统计: {FetchClient.stats()}")
+    await FetchClient.shutdown()
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
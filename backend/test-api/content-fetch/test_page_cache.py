@@ -0,0 +1,171 @@
+"""
+网页磁盘缓存测试
+
+启动一个支持 ETag / Last-Modified 的本地模拟服务器，依次验证：
+1. 首次请求下载页面并写入缓存
+2. 有效期内重复请求直接返回缓存，不访问上游
+3. 过期后发出条件请求，上游返回 304 时续期并复用缓存
+4. 页面变化后上游返回 200，缓存被更新
+5. 上游 5xx 时返回过期的缓存
+6. 超出容量上限时按最近访问时间淘汰
+并统计上游请求数和下载字节数，对比不使用缓存时的流量和耗时。
+
+用法:
+    python test_page_cache.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dotenv import load_dotenv
+
+# 添加backend到sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+# 加载环境变量
+env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../.env'))
+load_dotenv(env_path)
+
+from app.utils.fetch_client import FetchClient
+from app.utils.page_cache import PageCache
+
+# 配置
+SIMULATED_LATENCY = 0.2  # 模拟服务器每个页面的响应耗时（秒）
+SIMULATED_PAGE_BYTES = 300 * 1024  # 模拟页面大小
+REPEAT_REQUESTS = 20  # 重复请求次数
+TTL = 1  # 测试用的有效期（秒）
+
+
+class VersionedPageHandler(BaseHTTPRequestHandler):
+    """按版本号返回页面，支持条件请求的模拟服务器"""
+
+    version = 1
+    fail = False
+    requests = 0
+    not_modified = 0
+    bytes_sent = 0
+    last_modified = formatdate(time.time(), usegmt=True)
+
+    @classmethod
+    def body(cls) -> bytes:
+        head = f"<html><head><meta charset=\"utf-8\"><title>v{cls.version}</title></head><body>".encode()
+        return head + "正文".encode() * (SIMULATED_PAGE_BYTES // 6) + b"</body></html>"
+
+    def do_GET(self):
+        cls = VersionedPageHandler
+        cls.requests += 1
+        time.sleep(SIMULATED_LATENCY)
+        if cls.fail:
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        etag = f'"{self.path}-v{cls.version}"'
+        if self.headers.get("If-None-Match") == etag:
+            cls.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        body = cls.body()
+        cls.bytes_sent += len(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", cls.last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), VersionedPageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def check(name: str, condition: bool):
+    print(f"  [{'通过' if condition else '失败'}] {name}")
+    if not condition:
+        raise SystemExit(1)
+
+
+async def timed_requests(cache: PageCache, url: str) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT_REQUESTS):
+        await cache.get_html(url)
+    return time.perf_counter() - start
+
+
+async def main():
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    handler = VersionedPageHandler
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PageCache(
+            db_path=os.path.join(tmp, "page_cache.db"),
+            max_bytes=4 * SIMULATED_PAGE_BYTES,
+            default_ttl=TTL
+        )
+        url = f"{base_url}/episode/1"
+
+        print("功能验证:")
+        html = await cache.get_html(url)
+        check("首次请求下载页面", "<title>v1</title>" in html and handler.requests == 1)
+
+        await cache.get_html(url)
+        check("有效期内不访问上游", handler.requests == 1 and cache.stats()["hits"] == 1)
+
+        await asyncio.sleep(TTL + 0.1)
+        html = await cache.get_html(url)
+        check("过期后条件请求返回 304 并复用缓存", handler.not_modified == 1 and "<title>v1</title>" in html)
+
+        await asyncio.sleep(TTL + 0.1)
+        handler.version = 2
+        html = await cache.get_html(url)
+        check("页面变化后更新缓存", "<title>v2</title>" in html)
+
+        await asyncio.sleep(TTL + 0.1)
+        handler.fail = True
+        html = await cache.get_html(url)
+        check("上游 5xx 时返回过期缓存", "<title>v2</title>" in html and cache.stats()["stale"] == 1)
+        handler.fail = False
+
+        for i in range(6):
+            await cache.get_html(f"{base_url}/podcast/{i}")
+        stats = cache.stats()
+        check("超出容量上限时按 LRU 淘汰", stats["evictions"] > 0 and stats["total_bytes"] <= stats["max_bytes"])
+        print(f"  缓存统计: {stats}")
+
+        print(f"\n重复请求 {REPEAT_REQUESTS} 次同一页面（模拟上游耗时 {SIMULATED_LATENCY * 1000:.0f}ms）:")
+        for name, enabled in (("无缓存", False), ("磁盘缓存", True)):
+            cache = PageCache(
+                db_path=os.path.join(tmp, f"compare_{name}.db"),
+                max_bytes=64 * SIMULATED_PAGE_BYTES,
+                default_ttl=600,
+                enabled=enabled
+            )
+            requests_before, bytes_before = handler.requests, handler.bytes_sent
+            elapsed = await timed_requests(cache, f"{base_url}/compare/{name}")
+            print(
+                f"  [{name}] 总耗时 {elapsed:.2f}s | 上游请求 {handler.requests - requests_before} 次 | "
+                f"下载 {(handler.bytes_sent - bytes_before) / 1024:.0f}KB"
+            )
+
+    await FetchClient.shutdown()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
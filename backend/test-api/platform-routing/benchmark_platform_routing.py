@@ -0,0 +1,158 @@
+"""
+平台路由微基准测试
+
+对比两种路由方式处理一篇文章所需的查找耗时：
+- legacy:   每个请求新建 8 个解析器和 7 个获取器，解析时依次调用 can_handle，
+            获取内容的 4 个操作（fetch_content / get_video_info / get_chapters / get_author_info）各自再遍历一次
+- registry: 进程内共享的 PlatformRegistry，按域名查表后用 can_handle 确认，获取器在服务实例内只查找一次
+
+同时检查两种方式在语料上的路由结果是否一致，不一致的 URL 会单独列出
+（按域名路由后，查询参数中包含平台域名的普通网页不再被误判为该平台）。
+
+用法:
+    python benchmark_platform_routing.py
+"""
+
+import os
+import sys
+import time
+from dotenv import load_dotenv
+
+# 添加backend到sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+# 加载环境变量
+env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../.env'))
+load_dotenv(env_path)
+
+from app.services.platform_registry import PlatformRegistry
+from app.services.platform_parser.github import GitHubParser
+from app.services.platform_parser.wechat import WeChatParser
+from app.services.platform_parser.bilibili import BilibiliParser
+from app.services.platform_parser.xiaoyuzhou import XiaoYuZhouParser
+from app.services.platform_parser.youtube import YouTubeParser
+from app.services.platform_parser.apple import ApplePodcastParser
+from app.services.platform_parser.spotify import SpotifyParser
+from app.services.platform_parser.webpage import WebPageParser
+from app.services.content_fetcher.file import FileFetcher
+from app.services.content_fetcher.wechat import WeChatFetcher
+from app.services.content_fetcher.bilibili import BilibilitFetcher
+from app.services.content_fetcher.youtube import YouTubeFetcher
+from app.services.content_fetcher.xiaoyuzhou import XiaoYuZhouFetcher
+from app.services.content_fetcher.apple import ApplePodcastFetcher
+from app.services.content_fetcher.webpage import WebPageFetcher
+
+# 配置
+ROUNDS = 2000  # 每个 URL 的重复次数
+FETCH_OPERATIONS = 4  # 每篇文章调用获取器的操作数
+
+# 实际提交过的链接类型
+CORPUS = [
+    "https://www.youtube.com/watch?v=g4jWb-0nj44",
+    "https://youtu.be/g4jWb-0nj44?si=Qx1bYtM3",
+    "https://m.youtube.com/watch?v=dQw4w9WgXcQ&feature=share",
+    "https://www.youtube.com/live/jfKfPfyJRdk",
+    "https://www.youtube.com/embed/M7lc1UVf-VE",
+    "https://www.youtube.com/@a16z",
+    "https://www.bilibili.com/video/BV1GJ411x7h7/?spm_id_from=333.788",
+    "https://m.bilibili.com/video/BV1uT4y1P7CX",
+    "https://b23.tv/Hk3pXbC",
+    "https://space.bilibili.com/946974",
+    "https://www.xiaoyuzhoufm.com/episode/6766be9b15a5fd520e8d6a42",
+    "https://www.xiaoyuzhoufm.com/podcast/626b46ea9cbbf0451cf5a962",
+    "https://podcasts.apple.com/us/podcast/the-a16z-podcast/id842818711?i=1000679346203",
+    "https://open.spotify.com/episode/4rOoJ6Egrf8K2IrywzwOMk",
+    "https://mp.weixin.qq.com/s/3Jd7lXjsA0nvYBcHCk4xVQ",
+    "https://github.com/langchain-ai/langgraph",
+    "https://github.com/openai/openai-python/tree/main/src",
+    "https://www.anthropic.com/news/claude-3-5-sonnet",
+    "https://a16z.com/ai-canon/",
+    "https://news.ycombinator.com/item?id=41224689",
+    "https://medium.com/@karpathy/software-2-0-a64152b37c35",
+    "https://36kr.com/p/2870093567765249",
+    "https://www.example.com/share?from=youtube.com",
+    "https://blog.example.com/post?ref=github.com",
+    "https://www.example.com/redirect?to=https://www.youtube.com/watch?v=g4jWb-0nj44",
+    "file:///uploads/transcript.txt",
+]
+
+
+class LegacyRouter:
+    """改造前的路由方式：每个请求新建实例，按顺序调用 can_handle"""
+
+    def __init__(self):
+        self.parsers = [
+            GitHubParser(), WeChatParser(), BilibiliParser(), XiaoYuZhouParser(),
+            YouTubeParser(), ApplePodcastParser(), SpotifyParser(), WebPageParser()
+        ]
+        self.fetchers = [
+            FileFetcher(), WeChatFetcher(), BilibilitFetcher(), YouTubeFetcher(),
+            XiaoYuZhouFetcher(), ApplePodcastFetcher(), WebPageFetcher()
+        ]
+
+    def parser(self, url):
+        return next((parser for parser in self.parsers if parser.can_handle(url)), None)
+
+    def fetcher(self, url):
+        return next((fetcher for fetcher in self.fetchers if fetcher.can_handle(url)), None)
+
+
+def route_legacy(url: str):
+    router = LegacyRouter()
+    parser = router.parser(url)
+    fetcher = None
+    for _ in range(FETCH_OPERATIONS):
+        fetcher = router.fetcher(url)
+    return parser, fetcher
+
+
+def route_registry(registry: PlatformRegistry, url: str):
+    routes = registry.parser_routes(url)
+    bound = {}
+    for _ in range(FETCH_OPERATIONS):
+        if url not in bound:
+            bound[url] = registry.fetcher_route(url)
+    route = bound[url]
+    return (routes[0].parser if routes else None), (route.fetcher if route else None)
+
+
+def bench(name: str, func) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for url in CORPUS:
+            func(url)
+    elapsed = time.perf_counter() - start
+    per_article = elapsed / (ROUNDS * len(CORPUS)) * 1e6
+    print(f"[{name:>15}] 总耗时 {elapsed:.3f}s | 每篇文章 {per_article:.2f}µs")
+    return per_article
+
+
+def main():
+    registry = PlatformRegistry.default()
+    print(f"语料: {len(CORPUS)} 个 URL, 每个重复 {ROUNDS} 次, 每篇文章 {FETCH_OPERATIONS} 次获取操作")
+
+    # 路由结果一致性
+    mismatches = []
+    for url in CORPUS:
+        legacy_parser, legacy_fetcher = route_legacy(url)
+        new_parser, new_fetcher = route_registry(registry, url)
+        if type(legacy_parser) is not type(new_parser) or type(legacy_fetcher) is not type(new_fetcher):
+            mismatches.append((url, legacy_parser, legacy_fetcher, new_parser, new_fetcher))
+    print(f"路由结果一致: {len(CORPUS) - len(mismatches)}/{len(CORPUS)}")
+    for url, lp, lf, np, nf in mismatches:
+        print(f"  {url}\n    legacy:   {type(lp).__name__} / {type(lf).__name__}\n"
+              f"    registry: {type(np).__name__} / {type(nf).__name__}")
+
+    legacy = bench("legacy", route_legacy)
+
+    def cold(url):
+        registry._lookup.cache_clear()
+        return route_registry(registry, url)
+
+    cold_cost = bench("registry(冷)", cold)
+    warm = bench("registry(缓存)", lambda url: route_registry(registry, url))
+    print(f"加速比: 冷查找 {legacy / cold_cost:.1f}x, 缓存命中 {legacy / warm:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
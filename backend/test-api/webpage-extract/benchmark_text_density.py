@@ -0,0 +1,181 @@
+"""
+网页正文提取一致性检查与基准测试
+
+对比两种正文提取方式：
+- legacy:  改造前的实现（BeautifulSoup html.parser，对每个容器调用 get_text() 和 str(element)），完整保留在本脚本中
+- single:  TextDensityExtractor（lxml 解析，自底向上单次遍历计算文本长度和标记长度）
+
+1. 一致性：对 fixtures/ 下的每个 HTML 文件比较两种方式的输出
+2. 基准：生成约 PAGE_BYTES 大小、嵌套 NESTING_DEPTH 层容器的页面，比较提取耗时
+
+用法:
+    python benchmark_text_density.py               # 使用 fixtures/ 和生成的大页面
+    python benchmark_text_density.py page.html ... # 额外检查给定的 HTML 文件
+"""
+
+import glob
+import os
+import sys
+import time
+from dotenv import load_dotenv
+from bs4 import BeautifulSoup
+
+# 添加backend到sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+# 加载环境变量
+env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../.env'))
+load_dotenv(env_path)
+
+from app.services.content_fetcher.webpage import WebPageFetcher
+from app.services.content_fetcher.text_density import TextDensityExtractor
+
+# 配置
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+PAGE_BYTES = 1024 * 1024  # 生成页面的大小
+NESTING_DEPTH = 12  # 生成页面中容器的嵌套层数
+ROUNDS = 3  # 每种方式的重复次数，取最快一次
+
+
+class LegacyExtractor:
+    """改造前 WebPageFetcher 的正文提取实现"""
+
+    def __init__(self, clean_text):
+        self.clean_text = clean_text
+
+    def is_valid_content(self, element):
+        if not element:
+            return False
+        style = element.get('style', '').lower()
+        if 'display: none' in style or 'visibility: hidden' in style:
+            return False
+        invalid_patterns = [
+            'nav', 'footer', 'header', 'menu', 'sidebar', 'ad',
+            'comment', 'social', 'related', 'share', 'cookie',
+            'popup', 'banner', 'copyright', 'tracking', 'search',
+            'newsletter', 'subscribe'
+        ]
+        for attr in ['class', 'id']:
+            if element.get(attr):
+                attr_value = ' '.join(element[attr] if isinstance(element[attr], list) else [element[attr]])
+                attr_value = attr_value.lower()
+                if any(pattern in attr_value for pattern in invalid_patterns):
+                    return False
+        text = element.get_text(strip=True)
+        if not text or len(text) < 20:
+            return False
+        return True
+
+    def calculate_text_density(self, element):
+        text_length = len(element.get_text(strip=True))
+        html_length = len(str(element))
+        if html_length == 0:
+            return 0
+        return text_length / html_length
+
+    def extract_main_content(self, soup):
+        main_content = []
+        text_blocks = []
+        for element in soup.find_all(['div', 'article', 'section', 'main']):
+            if not self.is_valid_content(element):
+                continue
+            density = self.calculate_text_density(element)
+            text_length = len(element.get_text(strip=True))
+            if text_length > 100:
+                text_blocks.append({'element': element, 'density': density, 'length': text_length})
+        text_blocks.sort(key=lambda x: (x['density'], x['length']), reverse=True)
+        if text_blocks:
+            main_element = text_blocks[0]['element']
+            for element in main_element.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
+                text = self.clean_text(element.get_text())
+                if text and len(text) > 20:
+                    if element.name.startswith('h'):
+                        main_content.append(f"\n### {text}\n")
+                    else:
+                        main_content.append(text)
+        if len(main_content) < 3:
+            paragraphs = soup.find_all('p')
+            valid_paragraphs = []
+            for p in paragraphs:
+                text = self.clean_text(p.get_text())
+                if len(text) > 50:
+                    valid_paragraphs.append((text, len(text)))
+            valid_paragraphs.sort(key=lambda x: x[1], reverse=True)
+            for text, _ in valid_paragraphs[:10]:
+                if text not in main_content:
+                    main_content.append(text)
+        return "\n\n".join(main_content)
+
+    def extract(self, html):
+        soup = BeautifulSoup(html, 'html.parser')
+        for script in soup(['script', 'style']):
+            script.decompose()
+        return self.extract_main_content(soup)
+
+
+def build_large_page(fixture_html: list) -> str:
+    """拼接 fixture 的 body，按 NESTING_DEPTH 层嵌套容器重复，直到达到 PAGE_BYTES"""
+    bodies = []
+    for html in fixture_html:
+        soup = BeautifulSoup(html, 'html.parser')
+        if soup.body:
+            bodies.append(soup.body.decode_contents())
+    block = "\n".join(bodies)
+
+    sections = []
+    size = 0
+    index = 0
+    while size < PAGE_BYTES:
+        opening = "".join(f'<div class="level-{depth}"><section id="s{index}-{depth}">' for depth in range(NESTING_DEPTH))
+        closing = "</section></div>" * NESTING_DEPTH
+        section = f"{opening}\n{block}\n{closing}"
+        sections.append(section)
+        size += len(section.encode('utf-8'))
+        index += 1
+    return f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>large</title></head><body>{''.join(sections)}</body></html>"
+
+
+def timed(func, html: str):
+    best = None
+    result = None
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = func(html)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    clean_text = WebPageFetcher().clean_text
+    legacy = LegacyExtractor(clean_text)
+    single = TextDensityExtractor(clean_text)
+
+    paths = sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html'))) + sys.argv[1:]
+    fixture_html = []
+    matched = 0
+    print("一致性检查:")
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        fixture_html.append(html)
+        expected = legacy.extract(html)
+        actual = single.extract(html)
+        same = expected == actual
+        matched += same
+        print(f"  [{'一致' if same else '不一致'}] {os.path.basename(path)} ({len(expected)} 字符)")
+        if not same:
+            print(f"    legacy: {expected[:200]!r}\n    single: {actual[:200]!r}")
+    print(f"一致: {matched}/{len(paths)}")
+
+    page = build_large_page(fixture_html)
+    print(f"\n基准页面: {len(page.encode('utf-8')) / 1024:.0f}KB, 容器嵌套 {NESTING_DEPTH} 层")
+    expected, legacy_time = timed(legacy.extract, page)
+    actual, single_time = timed(single.extract, page)
+    print(f"  legacy: {legacy_time * 1000:.0f}ms")
+    print(f"  single: {single_time * 1000:.0f}ms")
+    print(f"  加速比: {legacy_time / single_time:.1f}x, 输出{'一致' if expected == actual else '不一致'}")
+
+
+if __name__ == "__main__":
+    main()